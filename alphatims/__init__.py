@@ -43,4 +43,6 @@ __requirements__ = {
     "plotting": "requirements/requirements_plotting.txt",
     "development": "requirements/requirements_development.txt",
     "legacy": "requirements/requirements_legacy.txt",
+    "arrow": "requirements/requirements_arrow.txt",
+    "zstd": "requirements/requirements_zstd.txt",
 }
@@ -9,6 +9,7 @@ import os
 import sys
 import contextlib
 import logging
+import collections
 # external
 import numpy as np
 import pandas as pd
@@ -40,6 +41,35 @@ else:
     logging.info("")
     BRUKER_DLL_FILE_NAME = ""
 
+FRAME_BATCH_SIZE = 64
+MIN_PARALLEL_FRAME_COUNT = 16
+MIN_PARALLEL_RAW_INDEX_COUNT = 2**16
+ARROW_COLUMNS = (
+    "frame_indices",
+    "scan_indices",
+    "tof_indices",
+    "intensity_values",
+    "rt_values",
+)
+# NOTE: Detector events and arrays derived from them are stored in the
+# ARROW_COLUMNS and not in the schema metadata
+ARROW_EXCLUDED_KEYS = (
+    "_push_indptr",
+    "_tof_indices",
+    "_intensity_values",
+    "_quad_indptr",
+    "_push_tof_offsets",
+    "_tof_deltas",
+    "_tof_delta_overflow_indices",
+    "_tof_delta_overflow_values",
+    "_tof_index_indptr",
+    "_tof_index_raw_indices",
+    "_intensity_pyramids",
+)
+MAX_TOF_DELTA = 2**16 - 1
+CACHE_DIRECTORY = None
+MAX_CACHE_SIZE_IN_GB = 50
+
 
 def init_bruker_dll(bruker_dll_file_name: str = BRUKER_DLL_FILE_NAME):
     """Open a bruker.dll in Python.
@@ -140,10 +170,138 @@ def open_bruker_d_folder(
         bruker_dll.tims_close(bruker_d_folder_handle)
 
 
+def read_sql_table(
+    sql_database_connection,
+    table_name: str,
+) -> dict:
+    """Read an SQL table as a dict of columns.
+
+    Rows are directly parsed into a structured np.ndarray,
+    without intermediate Python lists or pd.DataFrames.
+
+    Parameters
+    ----------
+    sql_database_connection : sqlite3.Connection
+        An open connection to an SQL database.
+    table_name : str
+        The name of the table to read.
+
+    Returns
+    -------
+    : dict
+        A dict with (column_name: np.ndarray) items.
+        Columns are typed according to their declared SQL type.
+        INTEGER columns are np.int64 and REAL columns are np.float64,
+        unless they contain NULL values, in which case they are np.float64
+        with np.nan for NULL.
+        All other columns, including those that are entirely NULL,
+        are arrays with dtype=object.
+    """
+    columns = [
+        (column_info[1], column_info[2].upper()) for (
+            column_info
+        ) in sql_database_connection.execute(
+            f"PRAGMA table_info({table_name})"
+        )
+    ]
+    row_count, *non_null_counts = sql_database_connection.execute(
+        "SELECT COUNT(*)" + "".join(
+            f', COUNT("{column_name}")' for column_name, _ in columns
+        ) + f" FROM {table_name}"
+    ).fetchone()
+    dtype = []
+    for (column_name, column_type), non_null_count in zip(
+        columns,
+        non_null_counts
+    ):
+        if (non_null_count == 0) and (row_count > 0):
+            column_dtype = object
+        elif "INT" in column_type:
+            if non_null_count == row_count:
+                column_dtype = np.int64
+            else:
+                column_dtype = np.float64
+        elif any(
+            real_type in column_type for real_type in ["REAL", "FLOA", "DOUB"]
+        ):
+            column_dtype = np.float64
+        else:
+            column_dtype = object
+        dtype.append((column_name, column_dtype))
+    table = np.fromiter(
+        sql_database_connection.execute(f"SELECT * FROM {table_name}"),
+        dtype=dtype,
+        count=row_count,
+    )
+    return {
+        column_name: table[column_name].copy() for column_name, _ in dtype
+    }
+
+
+def merge_sql_tables(
+    left_table: dict,
+    right_table: dict,
+    column_name: str,
+) -> dict:
+    """Merge two tables on a column, keeping the order of the left table.
+
+    Parameters
+    ----------
+    left_table : dict
+        A dict with (column_name: np.ndarray) items.
+    right_table : dict
+        A dict with (column_name: np.ndarray) items.
+    column_name : str
+        The column present in both tables on which they are merged.
+
+    Returns
+    -------
+    : dict
+        A dict with (column_name: np.ndarray) items.
+        Each row of the left table is repeated for every matching row of
+        the right table.
+        Rows without a match are kept once and their columns from the
+        right table are filled with NaN, as with pd.merge(how="left").
+    """
+    order = np.argsort(right_table[column_name], kind="stable")
+    sorted_values = right_table[column_name][order]
+    starts = np.searchsorted(sorted_values, left_table[column_name], "left")
+    ends = np.searchsorted(sorted_values, left_table[column_name], "right")
+    match_counts = ends - starts
+    counts = np.maximum(match_counts, 1)
+    left_indices = np.repeat(np.arange(len(counts)), counts)
+    matched = np.repeat(match_counts > 0, counts)
+    right_indices = order[
+        (
+            np.arange(np.sum(counts)) + np.repeat(
+                starts - np.cumsum(counts) + counts,
+                counts
+            )
+        )[matched]
+    ]
+    result = {
+        key: values[left_indices] for key, values in left_table.items()
+    }
+    for key, values in right_table.items():
+        if key in result:
+            continue
+        if np.all(matched):
+            result[key] = values[right_indices]
+            continue
+        if values.dtype.kind in "biuf":
+            column = np.full(len(matched), np.nan, dtype=np.float64)
+        else:
+            column = np.full(len(matched), np.nan, dtype=object)
+        column[matched] = values[right_indices]
+        result[key] = column
+    return result
+
+
 def read_bruker_sql(
     bruker_d_folder_name: str,
     add_zeroth_frame: bool = True,
     drop_polarity: bool = True,
+    as_dataframes: bool = True,
 ) -> tuple:
     """Read metadata, (fragment) frames and precursors from a Bruker .d folder.
 
@@ -165,6 +323,11 @@ def read_bruker_sql(
         If False, this column is kept, resulting in a pd.DataFrame with
         dtype=object.
         Default is True.
+    as_dataframes : bool
+        If True, all tables are returned as pd.DataFrame.
+        If False, all tables are returned as dicts with
+        (column_name: np.ndarray) items, which avoids the overhead of pandas.
+        Default is True.
 
     Returns
     -------
@@ -173,125 +336,194 @@ def read_bruker_sql(
         The acquisition_mode, global_meta_data, frames, fragment_frames
         and precursors.
         For diaPASEF, precursors is None.
+        If as_dataframes is False, all tables are dicts instead.
     """
     import sqlite3
     logging.info(f"Reading frame metadata for {bruker_d_folder_name}")
     with sqlite3.connect(
         os.path.join(bruker_d_folder_name, "analysis.tdf")
     ) as sql_database_connection:
-        global_meta_data = pd.read_sql_query(
-            "SELECT * from GlobalMetaData",
-            sql_database_connection
+        global_meta_data = read_sql_table(
+            sql_database_connection,
+            "GlobalMetaData"
         )
-        frames = pd.read_sql_query(
-            "SELECT * FROM Frames",
-            sql_database_connection
-        )
-        if 9 in frames.MsMsType.values:
+        frames = read_sql_table(sql_database_connection, "Frames")
+        if 9 in frames["MsMsType"]:
             acquisition_mode = "diaPASEF"
-            fragment_frames = pd.read_sql_query(
-                "SELECT * FROM DiaFrameMsMsInfo",
-                sql_database_connection
-            )
-            fragment_frame_groups = pd.read_sql_query(
-                "SELECT * from DiaFrameMsMsWindows",
-                sql_database_connection
-            )
-            fragment_frames = fragment_frames.merge(
-                fragment_frame_groups,
-                how="left"
-            )
-            fragment_frames.rename(
-                columns={"WindowGroup": "Precursor"},
-                inplace=True
+            fragment_frames = merge_sql_tables(
+                read_sql_table(sql_database_connection, "DiaFrameMsMsInfo"),
+                read_sql_table(
+                    sql_database_connection,
+                    "DiaFrameMsMsWindows"
+                ),
+                "WindowGroup",
             )
+            fragment_frames = {
+                (
+                    "Precursor" if key == "WindowGroup" else key
+                ): values for key, values in fragment_frames.items()
+            }
             precursors = None
-        elif 8 in frames.MsMsType.values:
+        elif 8 in frames["MsMsType"]:
             acquisition_mode = "ddaPASEF"
-            fragment_frames = pd.read_sql_query(
-                "SELECT * from PasefFrameMsMsInfo",
-                sql_database_connection
+            fragment_frames = read_sql_table(
+                sql_database_connection,
+                "PasefFrameMsMsInfo"
             )
-            precursors = pd.read_sql_query(
-                "SELECT * from Precursors",
-                sql_database_connection
+            precursors = read_sql_table(
+                sql_database_connection,
+                "Precursors"
             )
         else:
             acquisition_mode = "noPASEF"
-            fragment_frames = pd.DataFrame(
-                {
-                    "Frame": np.array([0]),
-                    "ScanNumBegin": np.array([0]),
-                    "ScanNumEnd": np.array([0]),
-                    "IsolationWidth": np.array([0]),
-                    "IsolationMz": np.array([0]),
-                    "Precursor": np.array([0]),
-                }
-            )
+            fragment_frames = {
+                "Frame": np.array([0]),
+                "ScanNumBegin": np.array([0]),
+                "ScanNumEnd": np.array([0]),
+                "IsolationWidth": np.array([0]),
+                "IsolationMz": np.array([0]),
+                "Precursor": np.array([0]),
+            }
             precursors = None
             # raise ValueError("Scan mode is not ddaPASEF or diaPASEF")
-        if add_zeroth_frame:
-            frames = pd.concat(
-                [
-                    pd.DataFrame(frames.iloc[0]).T,
-                    frames,
-                ],
-                ignore_index=True
-            )
-            frames.Id[0] = 0
-            frames.Time[0] = 0
-            frames.MaxIntensity[0] = 0
-            frames.SummedIntensities[0] = 0
-            frames.NumPeaks[0] = 0
-        frames = pd.DataFrame(
-            {
-                col: pd.to_numeric(
-                    frames[col]
-                ) for col in frames if col != "Polarity"
-            }
-        )
-        return (
-            acquisition_mode,
-            global_meta_data,
-            frames,
-            fragment_frames,
-            precursors
-        )
+    # NOTE: Runs that are still being acquired can contain fragment
+    # frames whose frame is not yet available in the frames table
+    if len(frames["Id"]) > 0:
+        selection = fragment_frames["Frame"] <= np.max(frames["Id"])
+        fragment_frames = {
+            key: values[selection] for key, values in fragment_frames.items()
+        }
+    for key, values in frames.items():
+        if (key != "Polarity") and (values.dtype == object):
+            frames[key] = np.array(values, dtype=np.float64)
+    if drop_polarity:
+        frames.pop("Polarity", None)
+    if add_zeroth_frame:
+        frames = {
+            key: np.concatenate([values[:1], values]) for (
+                key,
+                values
+            ) in frames.items()
+        }
+        for key in [
+            "Id",
+            "Time",
+            "MaxIntensity",
+            "SummedIntensities",
+            "NumPeaks"
+        ]:
+            frames[key][0] = 0
+    if as_dataframes:
+        global_meta_data = pd.DataFrame(global_meta_data)
+        frames = pd.DataFrame(frames)
+        fragment_frames = pd.DataFrame(fragment_frames)
+        if precursors is not None:
+            precursors = pd.DataFrame(precursors)
+    return (
+        acquisition_mode,
+        global_meta_data,
+        frames,
+        fragment_frames,
+        precursors
+    )
 
 
 @alphatims.utils.njit(nogil=True)
-def parse_decompressed_bruker_binary_type2(decompressed_bytes: bytes) -> tuple:
-    """Parse a Bruker binary frame buffer into scans, tofs and intensities.
+def transposed_uint32(
+    buffer: np.ndarray,
+    block_size: int,
+    index: int,
+) -> np.uint32:
+    """Read a single uint32 from a buffer with byte-transposed blocks.
 
     Parameters
     ----------
-    decompressed_bytes : bytes
-        A Bruker frame binary buffer that is already decompressed with pyzstd.
+    buffer : np.ndarray
+        A uint8 buffer with four consecutive blocks of size block_size,
+        containing the first, second, third and fourth byte of each value.
+    block_size : int
+        The number of uint32 values in the buffer.
+    index : int
+        The index of the value to read.
 
     Returns
     -------
-    : tuple (np.uint32[:], np.uint32[:], np.uint32[:]).
-        The scan_indices, tof_indices and intensities present in this binary
-        array
-    """
-    temp = np.frombuffer(decompressed_bytes, dtype=np.uint8)
-    buffer = np.frombuffer(temp.reshape(4, -1).T.flatten(), dtype=np.uint32)
-    scan_count = buffer[0]
-    scan_indices = buffer[:scan_count].copy() // 2
-    scan_indices[0] = 0
-    tof_indices = buffer[scan_count::2].copy()
+    np.uint32
+        The (little-endian) uint32 value at the given index.
+    """
+    return np.uint32(buffer[index]) | (
+        np.uint32(buffer[index + block_size]) << 8
+    ) | (
+        np.uint32(buffer[index + 2 * block_size]) << 16
+    ) | (
+        np.uint32(buffer[index + 3 * block_size]) << 24
+    )
+
+
+@alphatims.utils.njit(nogil=True)
+def parse_decompressed_bruker_binary_type2(
+    decompressed_bytes: bytes,
+    scan_indices_: np.ndarray,
+    tof_indices_: np.ndarray,
+    intensities_: np.ndarray,
+) -> None:
+    """Parse a Bruker binary frame buffer into scans, tofs and intensities.
+
+    Values are de-interleaved directly from the byte-transposed buffer
+    while the cumulative tof indices per scan are being calculated,
+    avoiding any intermediate copy of the buffer.
+
+    Parameters
+    ----------
+    decompressed_bytes : bytes
+        A Bruker frame binary buffer that is already decompressed with pyzstd.
+    scan_indices_ : np.ndarray
+        The buffer array to store the number of peaks per scan.
+        Its size needs to be equal to the number of scans in this frame.
+    tof_indices_ : np.ndarray
+        The buffer array to store the tof indices.
+        Its size needs to be equal to the number of peaks in this frame.
+    intensities_ : np.ndarray
+        The buffer array to store the intensities.
+        Its size needs to be equal to the number of peaks in this frame.
+    """
+    buffer = np.frombuffer(decompressed_bytes, dtype=np.uint8)
+    block_size = len(buffer) // 4
+    scan_count = np.int64(transposed_uint32(buffer, block_size, 0))
+    peak_count = len(intensities_)
     index = 0
-    for size in scan_indices:
-        current_sum = 0
+    value_index = scan_count
+    for scan_index in range(scan_count - 1):
+        size = np.int64(
+            transposed_uint32(buffer, block_size, scan_index + 1)
+        ) // 2
+        scan_indices_[scan_index] = size
+        current_sum = np.uint32(0)
         for i in range(size):
-            current_sum += tof_indices[index]
-            tof_indices[index] = current_sum
+            current_sum += transposed_uint32(buffer, block_size, value_index)
+            tof_indices_[index] = current_sum
+            intensities_[index] = transposed_uint32(
+                buffer,
+                block_size,
+                value_index + 1
+            )
+            value_index += 2
             index += 1
-    intensities = buffer[scan_count + 1::2]
-    last_scan = len(intensities) - np.sum(scan_indices[1:])
-    scan_indices[:-1] = scan_indices[1:]
-    scan_indices[-1] = last_scan
-    return scan_indices, tof_indices, intensities
+    if scan_count > 0:
+        scan_indices_[scan_count - 1] = peak_count - index
+    # NOTE: tof indices of the last scan are stored as is (not cumulative)
+    for index in range(index, peak_count):
+        tof_indices_[index] = transposed_uint32(
+            buffer,
+            block_size,
+            value_index
+        )
+        intensities_[index] = transposed_uint32(
+            buffer,
+            block_size,
+            value_index + 1
+        )
+        value_index += 2
 
 
 @alphatims.utils.njit(nogil=True)
@@ -345,9 +577,123 @@ def parse_decompressed_bruker_binary_type1(
     return scan_size
 
 
+@alphatims.utils.njit(nogil=True)
+def lzf_decompress(
+    compressed_bytes: np.ndarray,
+    decompressed_bytes: np.ndarray,
+) -> int:
+    """Decompress an LZF compressed buffer.
+
+    This is a GIL-free reimplementation of liblzf's lzf_decompress,
+    allowing to decompress in parallel threads.
+
+    Parameters
+    ----------
+    compressed_bytes : np.uint8[:]
+        An LZF compressed buffer.
+    decompressed_bytes : np.uint8[:]
+        A buffer that is large enough to store the decompressed data.
+
+    Returns
+    -------
+    : int
+        The number of decompressed bytes.
+
+    Raises
+    ------
+    ValueError
+        When the compressed data is corrupt or the buffer is too small.
+    """
+    input_index = 0
+    output_index = 0
+    input_size = len(compressed_bytes)
+    output_size = len(decompressed_bytes)
+    while input_index < input_size:
+        control = np.int64(compressed_bytes[input_index])
+        input_index += 1
+        if control < 32:
+            length = control + 1
+            if output_index + length > output_size:
+                raise ValueError("LZF decompression buffer is too small")
+            if input_index + length > input_size:
+                raise ValueError("LZF compressed data is corrupt")
+            decompressed_bytes[
+                output_index: output_index + length
+            ] = compressed_bytes[input_index: input_index + length]
+            input_index += length
+            output_index += length
+        else:
+            length = control >> 5
+            reference = output_index - ((control & 0x1f) << 8) - 1
+            if length == 7:
+                length += np.int64(compressed_bytes[input_index])
+                input_index += 1
+            reference -= np.int64(compressed_bytes[input_index])
+            input_index += 1
+            length += 2
+            if output_index + length > output_size:
+                raise ValueError("LZF decompression buffer is too small")
+            if reference < 0:
+                raise ValueError("LZF compressed data is corrupt")
+            for i in range(length):
+                decompressed_bytes[output_index + i] = decompressed_bytes[
+                    reference + i
+                ]
+            output_index += length
+    return output_index
+
+
+@alphatims.utils.njit(nogil=True)
+def decompress_bruker_binary_type1(
+    compressed_data: np.ndarray,
+    scan_offsets: np.ndarray,
+    scan_indices_: np.ndarray,
+    tof_indices_: np.ndarray,
+    intensities_: np.ndarray,
+    max_peak_count: int,
+) -> None:
+    """Decompress and parse all LZF compressed scans of a Bruker frame.
+
+    Parameters
+    ----------
+    compressed_data : np.uint8[:]
+        The compressed scans of a frame.
+    scan_offsets : np.int32[:]
+        The start of each scan in compressed_data.
+        The last element indicates the end of the last scan.
+    scan_indices_ : np.ndarray
+        The scan_indices_ buffer array.
+    tof_indices_ : np.ndarray
+        The tof_indices_ buffer array.
+    intensities_ : np.ndarray
+        The intensities_ buffer array.
+    max_peak_count : int
+        The maximum number of peaks a single scan can have.
+    """
+    decompressed_bytes = np.empty(max_peak_count * 4 * 2, dtype=np.uint8)
+    scan_start = 0
+    for scan_index in range(len(scan_offsets) - 1):
+        start = scan_offsets[scan_index]
+        end = scan_offsets[scan_index + 1]
+        if start == end:
+            continue
+        decompressed_size = lzf_decompress(
+            compressed_data[start: end],
+            decompressed_bytes,
+        )
+        scan_start += parse_decompressed_bruker_binary_type1(
+            decompressed_bytes[:decompressed_size],
+            scan_indices_,
+            tof_indices_,
+            intensities_,
+            scan_start,
+            scan_index,
+        )
+
+
 def process_frame(
     frame_id: int,
-    tdf_bin_file_name: str,
+    tdf_bin: np.ndarray,
     tims_offset_values: np.ndarray,
     scan_indptr: np.ndarray,
     intensities: np.ndarray,
@@ -365,9 +711,9 @@ def process_frame(
         The frame number that should be processed.
         Note that this is interpreted as 1-indixed instead of 0-indexed,
         so that it is compatible with Bruker.
-    tdf_bin_file_name : str
-        The full file name of the SQL database "analysis.tdf_bin" in a Bruker
-        .d folder.
+    tdf_bin : np.uint8[:]
+        The memory-mapped binary "analysis.tdf_bin" in a Bruker .d folder.
+        See alphatims.bruker.open_bruker_binary.
     tims_offset_values : np.int64[:]
         The offsets that indicate the starting indices of each frame in the
         binary.
@@ -403,69 +749,109 @@ def process_frame(
         The maximum number of peaks per scan.
         Should be treieved from the global metadata.
     """
-    with open(tdf_bin_file_name, "rb") as infile:
-        frame_start = frame_indptr[frame_id]
-        frame_end = frame_indptr[frame_id + 1]
-        if frame_start != frame_end:
-            offset = tims_offset_values[frame_id]
-            infile.seek(offset)
-            bin_size = int.from_bytes(infile.read(4), "little")
-            scan_count = int.from_bytes(infile.read(4), "little")
-            max_peak_count = min(
-                max_peaks_per_scan,
-                frame_end - frame_start
-            )
-            if compression_type == 1:
-                import lzf
-                compression_offset = 8 + (scan_count + 1) * 4
-                scan_offsets = np.frombuffer(
-                    infile.read((scan_count + 1) * 4),
-                    dtype=np.int32
-                ) - compression_offset
-                compressed_data = infile.read(bin_size - compression_offset)
-                scan_indices_ = np.zeros(scan_count, dtype=np.int64)
-                tof_indices_ = np.empty(
-                    frame_end - frame_start,
-                    dtype=np.uint32
-                )
-                intensities_ = np.empty(
-                    frame_end - frame_start,
-                    dtype=np.uint16
-                )
-                scan_start = 0
-                for scan_index in range(scan_count):
-                    start = scan_offsets[scan_index]
-                    end = scan_offsets[scan_index + 1]
-                    if start == end:
-                        continue
-                    decompressed_bytes = lzf.decompress(
-                        compressed_data[start: end],
-                        max_peak_count * 4 * 2
-                    )
-                    scan_start += parse_decompressed_bruker_binary_type1(
-                        decompressed_bytes,
-                        scan_indices_,
-                        tof_indices_,
-                        intensities_,
-                        scan_start,
-                        scan_index,
-                    )
-            elif compression_type == 2:
-                import pyzstd
-                compressed_data = infile.read(bin_size - 8)
-                decompressed_bytes = pyzstd.decompress(compressed_data)
-                (
-                    scan_indices_,
-                    tof_indices_,
-                    intensities_
-                ) = parse_decompressed_bruker_binary_type2(decompressed_bytes)
-            else:
-                raise ValueError("TimsCompressionType is not 1 or 2.")
-            scan_start = frame_id * max_scan_count
-            scan_end = scan_start + scan_count
-            scan_indptr[scan_start: scan_end] = scan_indices_
-            tof_indices[frame_start: frame_end] = tof_indices_
-            intensities[frame_start: frame_end] = intensities_
+    frame_start = frame_indptr[frame_id]
+    frame_end = frame_indptr[frame_id + 1]
+    if frame_start != frame_end:
+        offset = tims_offset_values[frame_id]
+        bin_size = int.from_bytes(tdf_bin[offset: offset + 4], "little")
+        scan_count = int.from_bytes(tdf_bin[offset + 4: offset + 8], "little")
+        max_peak_count = min(
+            max_peaks_per_scan,
+            frame_end - frame_start
+        )
+        scan_start = frame_id * max_scan_count
+        scan_end = scan_start + scan_count
+        if compression_type == 1:
+            compression_offset = 8 + (scan_count + 1) * 4
+            scan_offsets = np.frombuffer(
+                tdf_bin[offset + 8: offset + compression_offset],
+                dtype=np.int32
+            ) - compression_offset
+            decompress_bruker_binary_type1(
+                tdf_bin[offset + compression_offset: offset + bin_size],
+                scan_offsets,
+                scan_indptr[scan_start: scan_end],
+                tof_indices[frame_start: frame_end],
+                intensities[frame_start: frame_end],
+                max_peak_count,
+            )
+        elif compression_type == 2:
+            import pyzstd
+            decompressed_bytes = pyzstd.decompress(
+                tdf_bin[offset + 8: offset + bin_size]
+            )
+            parse_decompressed_bruker_binary_type2(
+                decompressed_bytes,
+                scan_indptr[scan_start: scan_end],
+                tof_indices[frame_start: frame_end],
+                intensities[frame_start: frame_end],
+            )
+        else:
+            raise ValueError("TimsCompressionType is not 1 or 2.")
+
+
+def process_frame_batch(
+    frame_batch: range,
+    *args,
+) -> None:
+    """Read and parse a batch of consecutive frames from a Bruker .d folder.
+
+    Parameters
+    ----------
+    frame_batch : range
+        The frame numbers that should be processed.
+    *args
+        The remaining arguments of alphatims.bruker.process_frame.
+    """
+    for frame_id in frame_batch:
+        process_frame(frame_id, *args)
+
+
+def create_frame_batches(
+    frame_ids: range,
+    batch_size: int = FRAME_BATCH_SIZE,
+) -> list:
+    """Split frames in batches of consecutive frames.
+
+    Parameters
+    ----------
+    frame_ids : range
+        The frame numbers that need to be split.
+    batch_size : int
+        The number of frames per batch.
+        Default is alphatims.bruker.FRAME_BATCH_SIZE.
+
+    Returns
+    -------
+    : list
+        A list of ranges with consecutive frame numbers.
+    """
+    return [
+        frame_ids[i: i + batch_size] for i in range(
+            0,
+            len(frame_ids),
+            batch_size
+        )
+    ]
+
+
+def open_bruker_binary(bruker_d_folder_name: str) -> np.ndarray:
+    """Memory-map the "analysis.tdf_bin" of a Bruker .d folder.
+
+    Parameters
+    ----------
+    bruker_d_folder_name : str
+        The full path to a Bruker .d folder.
+
+    Returns
+    -------
+    : np.uint8[:]
+        A read-only array with all bytes of "analysis.tdf_bin".
+    """
+    tdf_bin_file_name = os.path.join(bruker_d_folder_name, "analysis.tdf_bin")
+    if os.path.getsize(tdf_bin_file_name) == 0:
+        return np.empty(0, dtype=np.uint8)
+    return np.memmap(tdf_bin_file_name, dtype=np.uint8, mode="r")
 
 
 def read_bruker_binary(
@@ -473,6 +859,7 @@ def read_bruker_binary(
     bruker_d_folder_name: str,
     compression_type: int,
     max_peaks_per_scan: int,
+    mmap_detector_events: bool = False,
 ) -> tuple:
     """Read all data from an "analysis.tdf_bin" of a Bruker .d folder.
 
@@ -488,36 +875,42 @@ def read_bruker_binary(
     max_peaks_per_scan : int
         The maximum number of peaks per scan.
         Should be treieved from the global metadata.
+    mmap_detector_events : bool
+        If True, the scan_indptr, tof_indices and intensities are stored in
+        temporary memory-mapped files (see alphatims.utils.empty_mmap)
+        instead of in memory.
+        Default is False.
 
     Returns
     -------
     : tuple (np.int64[:], np.uint32[:], np.uint16[:]).
         The scan_indptr, tof_indices and intensities.
     """
-    frame_indptr = np.empty(frames.shape[0] + 1, dtype=np.int64)
+    num_peaks = np.asarray(frames["NumPeaks"])
+    frame_indptr = np.empty(len(num_peaks) + 1, dtype=np.int64)
     frame_indptr[0] = 0
-    frame_indptr[1:] = np.cumsum(frames.NumPeaks.values)
-    max_scan_count = frames.NumScans.max() + 1
-    scan_count = max_scan_count * frames.shape[0]
-    scan_indptr = np.zeros(scan_count + 1, dtype=np.int64)
-    intensities = np.empty(frame_indptr[-1], dtype=np.uint16)
-    tof_indices = np.empty(frame_indptr[-1], dtype=np.uint32)
-    tdf_bin_file_name = os.path.join(bruker_d_folder_name, "analysis.tdf_bin")
-    tims_offset_values = frames.TimsId.values
+    frame_indptr[1:] = np.cumsum(num_peaks)
+    max_scan_count = int(np.max(frames["NumScans"])) + 1
+    scan_count = max_scan_count * len(num_peaks)
+    if mmap_detector_events:
+        scan_indptr = alphatims.utils.empty_mmap(scan_count + 1, np.int64)
+        scan_indptr[:] = 0
+        intensities = alphatims.utils.empty_mmap(frame_indptr[-1], np.uint16)
+        tof_indices = alphatims.utils.empty_mmap(frame_indptr[-1], np.uint32)
+    else:
+        scan_indptr = np.zeros(scan_count + 1, dtype=np.int64)
+        intensities = np.empty(frame_indptr[-1], dtype=np.uint16)
+        tof_indices = np.empty(frame_indptr[-1], dtype=np.uint32)
+    tdf_bin = open_bruker_binary(bruker_d_folder_name)
+    tims_offset_values = np.asarray(frames["TimsId"])
     logging.info(
         f"Reading {frame_indptr.size - 2:,} frames with "
         f"{frame_indptr[-1]:,} detector events for {bruker_d_folder_name}"
     )
-    if compression_type == 1:
-        process_frame_func = alphatims.utils.threadpool(
-            process_frame,
-            thread_count=1
-        )
-    else:
-        process_frame_func = alphatims.utils.threadpool(process_frame)
+    process_frame_func = alphatims.utils.threadpool(process_frame_batch)
     process_frame_func(
-        range(1, len(frames)),
-        tdf_bin_file_name,
+        create_frame_batches(range(1, len(num_peaks))),
+        tdf_bin,
         tims_offset_values,
         scan_indptr,
         intensities,
@@ -532,55 +925,407 @@ def read_bruker_binary(
     return scan_indptr, tof_indices, intensities
 
 
-class TimsTOF(object):
-    """A class that stores Bruker TimsTOF data in memory for fast access.
+def read_bruker_frames(
+    frame_ids: np.ndarray,
+    frames: pd.DataFrame,
+    bruker_d_folder_name: str,
+    compression_type: int,
+    max_peaks_per_scan: int,
+) -> tuple:
+    """Read a selection of frames from an "analysis.tdf_bin".
 
-    Data can be read directly from a Bruker .d folder.
-    All OS's are supported,
-    but reading mz_values and mobility_values from a .d folder
-    requires Windows or Linux due to availability of Bruker libraries.
-    On MacOS, they are estimated based on metadata,
-    but these values are not guaranteed to be correct.
-    Often they fall within 0.02 Th, but errors up to 6 Th have already
-    been observed!
+    In contrast to alphatims.bruker.read_bruker_binary, the resulting arrays
+    only contain the selected frames, which are stored consecutively.
 
-    A TimsTOF object can also be exported to HDF for subsequent access.
-    This file format is portable to all OS's.
-    As such, initial reading on Windows with correct mz_values and
-    mobility_values can be done and the resulting HDF file can
-    safely be read on MacOS.
-    This HDF file also provides improved accession times for subsequent use.
+    Parameters
+    ----------
+    frame_ids : np.int64[:]
+        The (1-indexed) frame numbers that should be read.
+    frames : pd.DataFrame
+        The frames from the "analysis.tdf" SQL database of a Bruker .d folder.
+        These can be acquired with e.g. alphatims.bruker.read_bruker_sql.
+    bruker_d_folder_name : str
+        The full path to a Bruker .d folder.
+    compression_type : int
+        The compression type. This must be either 1 or 2.
+    max_peaks_per_scan : int
+        The maximum number of peaks per scan.
+        Should be treieved from the global metadata.
 
-    After reading, data can be accessed with traditional Python slices.
-    As TimsTOF data is 5-dimensional, the data can be sliced in 5 dimensions
-    as well. These dimensions follows the design of the TimsTOF Pro:
+    Returns
+    -------
+    : tuple (np.int64[:], np.int64[:], np.uint32[:], np.uint16[:]).
+        The frame_indptr, scan_indptr, tof_indices and intensities.
+        The frame_indptr has len(frame_ids) + 1 elements and
+        the scan_indptr has len(frame_ids) * (frames.NumScans.max() + 1) + 1
+        elements.
+    """
+    frame_ids = np.asarray(frame_ids, dtype=np.int64)
+    frame_indptr = np.empty(len(frame_ids) + 1, dtype=np.int64)
+    frame_indptr[0] = 0
+    frame_indptr[1:] = np.cumsum(np.asarray(frames["NumPeaks"])[frame_ids])
+    max_scan_count = int(np.max(frames["NumScans"])) + 1
+    scan_indptr = np.zeros(
+        max_scan_count * len(frame_ids) + 1,
+        dtype=np.int64
+    )
+    intensities = np.empty(frame_indptr[-1], dtype=np.uint16)
+    tof_indices = np.empty(frame_indptr[-1], dtype=np.uint32)
+    tdf_bin = open_bruker_binary(bruker_d_folder_name)
+    tims_offset_values = np.asarray(frames["TimsId"])[frame_ids]
+    process_frame_func = alphatims.utils.threadpool(
+        process_frame_batch,
+        include_progress_callback=False,
+    )
+    process_frame_func(
+        create_frame_batches(range(len(frame_ids))),
+        tdf_bin,
+        tims_offset_values,
+        scan_indptr,
+        intensities,
+        tof_indices,
+        frame_indptr,
+        max_scan_count,
+        compression_type,
+        max_peaks_per_scan,
+    )
+    scan_indptr[1:] = np.cumsum(scan_indptr[:-1])
+    scan_indptr[0] = 0
+    return frame_indptr, scan_indptr, tof_indices, intensities
 
-        1 LC: rt_values, frame_indices
-            The first dimension allows to slice retention_time values
-            or frames indices. These values and indices
-            have a one-to-one relationship.
-        2 TIMS: mobility_values, scan_indices
-            The second dimension allows to slice mobility values or
-            scan indices (i.e. a single push).
-            These values and indices have a one-to-one relationship.
-        3 QUAD: quad_mz_values, precursor_indices
-            The third dimension focusses on the quadrupole and indirectly
-            on the collision cell. It allows to slice lower and upper
-            quadrupole mz values (e.g. the m/z of
-            unfragmented ions / precursors). If set to -1, the quadrupole and
-            collision cell are assumed to be inactive, i.e. precursor ions
-            are detected instead of fragments.
-            Equally, this dimension allows to slice precursor indices.
-            Precursor index 0 defaults to all precusors (i.e. quad mz values
-            equal to -1). In DDA, precursor indices larger than 0 point
-            to ddaPASEF MSMS spectra.
-            In DIA, precursor indices larger than 0 point to windows,
-            i.e. all scans in a frame with equal quadrupole and collision
-            settings that is repeated once per full cycle.
-            Note that these values do not have a one-to-one relationship.
-        4 TOF: mz_values, tof_indices
-            The fourth dimension allows to slice (fragment) mz_values
-            or tof indices. Note that the quadrupole dimension determines
+
+def read_hdf_frames(
+    frame_ids: np.ndarray,
+    push_indptr: np.ndarray,
+    scan_max_index: int,
+    tof_indices: h5py.Dataset,
+    intensity_values: h5py.Dataset,
+    push_tof_offsets: np.ndarray = None,
+    tof_delta_overflow_indices: np.ndarray = None,
+    tof_delta_overflow_values: np.ndarray = None,
+) -> tuple:
+    """Read a selection of frames from an HDF file exported by AlphaTims.
+
+    Consecutive frames are read with a single read per array.
+    HDF files of compact TimsTOF objects are supported as well,
+    in which case only the tof deltas of the selected frames are read
+    and decoded (see alphatims.bruker.TimsTOF.compact_tof_indices).
+
+    Parameters
+    ----------
+    frame_ids : np.int64[:]
+        The sorted frame indices that should be read.
+    push_indptr : np.int64[:]
+        The push indptr of the full TimsTOF object.
+    scan_max_index : int
+        The number of scans (pushes) per frame.
+    tof_indices : h5py.Dataset
+        The (open) HDF dataset with the tof indices,
+        or with the tof deltas if push_tof_offsets is not None.
+    intensity_values : h5py.Dataset
+        The (open) HDF dataset with the intensity values.
+    push_tof_offsets : np.uint32[:], None
+        The first tof index of each push of a compact TimsTOF object.
+        If None, tof_indices are not compact.
+        Default is None.
+    tof_delta_overflow_indices : np.int64[:], None
+        The raw indices whose delta did not fit in a uint16.
+        Ignored if push_tof_offsets is None.
+        Default is None.
+    tof_delta_overflow_values : np.uint32[:], None
+        The deltas that did not fit in a uint16.
+        Ignored if push_tof_offsets is None.
+        Default is None.
+
+    Returns
+    -------
+    : tuple (np.int64[:], np.int64[:], np.uint32[:], np.uint16[:]).
+        The frame_indptr, scan_indptr, tof_indices and intensities,
+        with the same layout as alphatims.bruker.read_bruker_frames.
+    """
+    frame_ids = np.asarray(frame_ids, dtype=np.int64)
+    frame_push_indptr = push_indptr[
+        frame_ids.reshape(-1, 1) * scan_max_index + np.arange(
+            scan_max_index + 1
+        )
+    ]
+    frame_starts = frame_push_indptr[:, 0]
+    frame_ends = frame_push_indptr[:, -1]
+    frame_indptr = np.empty(len(frame_ids) + 1, dtype=np.int64)
+    frame_indptr[0] = 0
+    frame_indptr[1:] = np.cumsum(frame_ends - frame_starts)
+    scan_indptr = np.empty(len(frame_ids) * scan_max_index + 1, np.int64)
+    scan_indptr[0] = 0
+    scan_indptr[1:] = np.cumsum(np.diff(frame_push_indptr, axis=1))
+    frame_tof_indices = np.empty(frame_indptr[-1], dtype=tof_indices.dtype)
+    frame_intensity_values = np.empty(
+        frame_indptr[-1],
+        dtype=intensity_values.dtype
+    )
+    run_breaks = np.flatnonzero(frame_starts[1:] != frame_ends[:-1]) + 1
+    run_starts = np.concatenate([[0], run_breaks])
+    run_ends = np.concatenate([run_breaks, [len(frame_ids)]])
+    for run_start, run_end in zip(run_starts, run_ends):
+        start = frame_starts[run_start]
+        end = frame_ends[run_end - 1]
+        if start == end:
+            continue
+        source_selection = np.s_[start: end]
+        target_selection = np.s_[
+            frame_indptr[run_start]: frame_indptr[run_end]
+        ]
+        tof_indices.read_direct(
+            frame_tof_indices,
+            source_selection,
+            target_selection,
+        )
+        intensity_values.read_direct(
+            frame_intensity_values,
+            source_selection,
+            target_selection,
+        )
+    if push_tof_offsets is not None:
+        overflow_starts = np.searchsorted(
+            tof_delta_overflow_indices,
+            frame_starts
+        )
+        overflow_ends = np.searchsorted(tof_delta_overflow_indices, frame_ends)
+        overflow_counts = overflow_ends - overflow_starts
+        overflow_selection = np.arange(np.sum(overflow_counts)) + np.repeat(
+            overflow_starts - np.cumsum(overflow_counts) + overflow_counts,
+            overflow_counts
+        )
+        frame_tof_indices = decode_tof_deltas(
+            scan_indptr,
+            push_tof_offsets[
+                (
+                    frame_ids.reshape(-1, 1) * scan_max_index + np.arange(
+                        scan_max_index
+                    )
+                ).ravel()
+            ],
+            frame_tof_indices,
+            tof_delta_overflow_indices[overflow_selection] - np.repeat(
+                frame_starts - frame_indptr[:-1],
+                overflow_counts
+            ),
+            tof_delta_overflow_values[overflow_selection],
+        )
+    return frame_indptr, scan_indptr, frame_tof_indices, frame_intensity_values
+
+
+def iter_frames(
+    bruker_d_folder_name: str,
+    frame_slice: slice = slice(None),
+    batch_size: int = FRAME_BATCH_SIZE,
+):
+    """Iterate over batches of decoded frames from a Bruker .d folder.
+
+    Only a single batch of frames is decoded at any time,
+    meaning memory usage is bounded by the batch size rather than
+    by the size of the full acquisition.
+
+    Parameters
+    ----------
+    bruker_d_folder_name : str
+        The full path to a Bruker .d folder.
+    frame_slice : slice, np.int64[:]
+        The (1-indexed) frames that should be read.
+        The zeroth (dummy) frame is always skipped.
+        Default is slice(None), meaning all frames are read.
+    batch_size : int
+        The maximum number of frames per batch.
+        Default is alphatims.bruker.FRAME_BATCH_SIZE.
+
+    Yields
+    ------
+    : tuple (np.int64[:], np.int64[:], np.uint32[:], np.uint16[:]).
+        The frame_ids, scan_indptr, tof_indices and intensities of a batch.
+        The scan_indptr contains scan_max_index = frames.NumScans.max() + 1
+        entries per frame, i.e. the scan (push) j of the i-th frame of
+        this batch is defined by
+        scan_indptr[i * scan_max_index + j: i * scan_max_index + j + 2].
+    """
+    (
+        acquisition_mode,
+        global_meta_data,
+        frames,
+        fragment_frames,
+        precursors,
+    ) = read_bruker_sql(bruker_d_folder_name, as_dataframes=False)
+    meta_data = dict(
+        zip(global_meta_data["Key"], global_meta_data["Value"])
+    )
+    frame_ids = np.arange(len(frames["Id"]))[frame_slice]
+    frame_ids = frame_ids[frame_ids > 0]
+    for batch_start in range(0, len(frame_ids), batch_size):
+        batch_frame_ids = frame_ids[batch_start: batch_start + batch_size]
+        (
+            frame_indptr,
+            scan_indptr,
+            tof_indices,
+            intensities,
+        ) = read_bruker_frames(
+            batch_frame_ids,
+            frames,
+            bruker_d_folder_name,
+            int(meta_data["TimsCompressionType"]),
+            int(meta_data["MaxNumPeaksPerScan"]),
+        )
+        yield batch_frame_ids, scan_indptr, tof_indices, intensities
+
+
+def set_cache(
+    cache_directory: str = None,
+    max_cache_size_in_gb: float = MAX_CACHE_SIZE_IN_GB,
+) -> None:
+    """Set the (global) cache for Bruker .d folders.
+
+    When a cache directory is set, a TimsTOF object that is created from
+    a .d folder is saved as an uncompressed HDF file in this directory.
+    Subsequent creations of a TimsTOF object from the same .d folder
+    memory-map all arrays from this HDF file instead of decoding the
+    .d folder again.
+
+    Parameters
+    ----------
+    cache_directory : str, None
+        The directory where cached files are stored.
+        If None, no cache is used.
+        Default is None.
+    max_cache_size_in_gb : float
+        The maximum total size of all cached files.
+        When exceeded, least recently used files are removed.
+        Default is alphatims.bruker.MAX_CACHE_SIZE_IN_GB.
+    """
+    global CACHE_DIRECTORY
+    global MAX_CACHE_SIZE_IN_GB
+    if cache_directory is not None:
+        cache_directory = os.path.abspath(cache_directory)
+        if not os.path.exists(cache_directory):
+            os.makedirs(cache_directory)
+    CACHE_DIRECTORY = cache_directory
+    MAX_CACHE_SIZE_IN_GB = max_cache_size_in_gb
+    trim_cache()
+
+
+def get_cache_file_name(bruker_d_folder_name: str, *args) -> str:
+    """Get the name of the cached file for a Bruker .d folder.
+
+    Parameters
+    ----------
+    bruker_d_folder_name : str
+        The full path to a Bruker .d folder.
+    args : type
+        Additional values that are included in the cache key,
+        e.g. parameters that influence the result.
+
+    Returns
+    -------
+    : str, None
+        The full name of the cached file, which might not exist yet.
+        This is unique for the size and modification time of the
+        "analysis.tdf" and "analysis.tdf_bin",
+        as well as the version of AlphaTims.
+        None if no cache directory is set (see alphatims.bruker.set_cache).
+    """
+    import hashlib
+    if CACHE_DIRECTORY is None:
+        return None
+    bruker_d_folder_name = os.path.abspath(bruker_d_folder_name)
+    cache_key = [bruker_d_folder_name, alphatims.__version__]
+    for file_name in ["analysis.tdf", "analysis.tdf_bin"]:
+        file_stats = os.stat(os.path.join(bruker_d_folder_name, file_name))
+        cache_key += [file_stats.st_size, file_stats.st_mtime_ns]
+    cache_key += args
+    cache_hash = hashlib.sha1(str(cache_key).encode("utf-8")).hexdigest()
+    file_name = os.path.splitext(os.path.basename(bruker_d_folder_name))[0]
+    return os.path.join(CACHE_DIRECTORY, f"{file_name}.{cache_hash[:16]}.hdf")
+
+
+def trim_cache(keep_file_name: str = None) -> None:
+    """Remove least recently used files until the cache is small enough.
+
+    Parameters
+    ----------
+    keep_file_name : str, None
+        A cached file that should never be removed.
+        Default is None.
+    """
+    if CACHE_DIRECTORY is None:
+        return
+    cached_files = []
+    for file_name in os.listdir(CACHE_DIRECTORY):
+        if not file_name.endswith(".hdf"):
+            continue
+        full_file_name = os.path.join(CACHE_DIRECTORY, file_name)
+        file_stats = os.stat(full_file_name)
+        cached_files.append(
+            (file_stats.st_mtime, file_stats.st_size, full_file_name)
+        )
+    cache_size = sum(file_size for _, file_size, _ in cached_files)
+    max_cache_size = MAX_CACHE_SIZE_IN_GB * 1024**3
+    for _, file_size, full_file_name in sorted(cached_files):
+        if cache_size <= max_cache_size:
+            break
+        if full_file_name == keep_file_name:
+            continue
+        logging.info(f"Removing {full_file_name} from cache")
+        # NOTE: Removing a file that is still in use fails on Windows
+        with contextlib.suppress(OSError):
+            os.remove(full_file_name)
+            cache_size -= file_size
+
+
+class TimsTOF(object):
+    """A class that stores Bruker TimsTOF data in memory for fast access.
+
+    Data can be read directly from a Bruker .d folder.
+    All OS's are supported,
+    but reading mz_values and mobility_values from a .d folder
+    requires Windows or Linux due to availability of Bruker libraries.
+    On MacOS, they are estimated based on metadata,
+    but these values are not guaranteed to be correct.
+    Often they fall within 0.02 Th, but errors up to 6 Th have already
+    been observed!
+
+    A TimsTOF object can also be exported to HDF for subsequent access.
+    This file format is portable to all OS's.
+    As such, initial reading on Windows with correct mz_values and
+    mobility_values can be done and the resulting HDF file can
+    safely be read on MacOS.
+    This HDF file also provides improved accession times for subsequent use.
+
+    After reading, data can be accessed with traditional Python slices.
+    As TimsTOF data is 5-dimensional, the data can be sliced in 5 dimensions
+    as well. These dimensions follows the design of the TimsTOF Pro:
+
+        1 LC: rt_values, frame_indices
+            The first dimension allows to slice retention_time values
+            or frames indices. These values and indices
+            have a one-to-one relationship.
+        2 TIMS: mobility_values, scan_indices
+            The second dimension allows to slice mobility values or
+            scan indices (i.e. a single push).
+            These values and indices have a one-to-one relationship.
+        3 QUAD: quad_mz_values, precursor_indices
+            The third dimension focusses on the quadrupole and indirectly
+            on the collision cell. It allows to slice lower and upper
+            quadrupole mz values (e.g. the m/z of
+            unfragmented ions / precursors). If set to -1, the quadrupole and
+            collision cell are assumed to be inactive, i.e. precursor ions
+            are detected instead of fragments.
+            Equally, this dimension allows to slice precursor indices.
+            Precursor index 0 defaults to all precusors (i.e. quad mz values
+            equal to -1). In DDA, precursor indices larger than 0 point
+            to ddaPASEF MSMS spectra.
+            In DIA, precursor indices larger than 0 point to windows,
+            i.e. all scans in a frame with equal quadrupole and collision
+            settings that is repeated once per full cycle.
+            Note that these values do not have a one-to-one relationship.
+        4 TOF: mz_values, tof_indices
+            The fourth dimension allows to slice (fragment) mz_values
+            or tof indices. Note that the quadrupole dimension determines
             if precursors are detected or fragments.
             These values and indices have a one-to-one relationship.
         5 DETECTOR: intensity_values
@@ -647,6 +1392,12 @@ class TimsTOF(object):
 
     Instead of returning a pd.DataFrame, raw indices can be returned by
     setting the last slice element to "raw".
+    Setting it to "ranges" returns a np.int64[:, 2] array with
+    (start, end) ranges of raw indices instead,
+    which is far smaller for contiguous selections.
+    These ranges can be used directly by
+    alphatims.bruker.TimsTOF.convert_from_indices, as_dataframe and
+    bin_intensities.
 
     Examples
     --------
@@ -688,6 +1439,9 @@ class TimsTOF(object):
 
     >>> data[:, :, 999, "raw"]
     # Return the raw indices of datapoints from precursor 999
+
+    >>> data[:, :, 999, "ranges"]
+    # Return the raw index ranges of datapoints from precursor 999
     """
 
     @property
@@ -829,26 +1583,57 @@ class TimsTOF(object):
         """: float : The maximum intensity value."""
         return self._intensity_max_value
 
+    def _convert_sql_tables(self) -> None:
+        # NOTE: HDF readers expect these tables as groups with an
+        # is_pd_dataframe attribute, so they need to be pd.DataFrames
+        for table_name in ["frames", "fragment_frames", "precursors"]:
+            getattr(self, table_name)
+
     @property
     def frames(self):
         """: pd.DataFrame : The frames table of the analysis.tdf SQL."""
+        if isinstance(self._frames, dict):
+            self._frames = pd.DataFrame(self._frames)
         return self._frames
 
     @property
     def fragment_frames(self):
         """: pd.DataFrame : The fragment frames table."""
+        if isinstance(self._fragment_frames, dict):
+            self._fragment_frames = pd.DataFrame(self._fragment_frames)
         return self._fragment_frames
 
     @property
     def precursors(self):
-        """: pd.DataFrame : The precursor table."""
-        return self._precursors
+        """: pd.DataFrame : The precursor table (None for diaPASEF)."""
+        # NOTE: None values are not stored in HDF files
+        precursors = getattr(self, "_precursors", None)
+        if isinstance(precursors, dict):
+            self._precursors = precursors = pd.DataFrame(precursors)
+        return precursors
 
     @property
     def tof_indices(self):
-        """: np.ndarray : np.uint32[:] : The tof indices."""
+        """: np.ndarray : np.uint32[:] : The tof indices.
+
+        If the tof indices are compact, they are fully decoded upon each
+        access of this property.
+        """
+        if self.is_compact:
+            return decode_tof_deltas(
+                self.push_indptr,
+                self._push_tof_offsets,
+                self._tof_deltas,
+                self._tof_delta_overflow_indices,
+                self._tof_delta_overflow_values,
+            )
         return self._tof_indices
 
+    @property
+    def is_compact(self):
+        """: bool : If the tof indices are stored as uint16 deltas."""
+        return getattr(self, "_tof_deltas", None) is not None
+
     @property
     def push_indptr(self):
         """: np.ndarray : np.int64[:] : The tof indptr."""
@@ -891,7 +1676,10 @@ class TimsTOF(object):
         mz_estimation_from_frame: int = 1,
         mobility_estimation_from_frame: int = 1,
         slice_as_dataframe: bool = True,
-        use_calibrated_mz_values_as_default: int = 0
+        use_calibrated_mz_values_as_default: int = 0,
+        mmap_detector_events: bool = False,
+        compact_tof_indices: bool = False,
+        max_cached_result_bytes: int = 0,
     ):
         """Create a Bruker TimsTOF object that contains all data in-memory.
 
@@ -899,8 +1687,8 @@ class TimsTOF(object):
         ----------
         bruker_d_folder_name : str
             The full file name to a Bruker .d folder.
-            Alternatively, the full file name of an already exported .hdf
-            can be provided as well.
+            Alternatively, the full file name of an already exported .hdf,
+            .parquet or .arrow file can be provided as well.
         mz_estimation_from_frame : int
             If larger than 0, mz_values from this frame are read as
             default mz_values with the Bruker library.
@@ -927,20 +1715,52 @@ class TimsTOF(object):
             calibrated_mz_values.
             If 1, calibration at the MS1 level is performed.
             If 2, calibration at the MS2 level is performed.
+        mmap_detector_events : bool
+            If True, the push_indptr, tof_indices (or tof deltas of a
+            compact object) and intensity_values
+            are not loaded in memory, but memory-mapped from disk instead.
+            For .d folders, these arrays are decoded into temporary files
+            (see alphatims.utils.empty_mmap).
+            For .hdf files, these arrays are directly mapped from the
+            HDF file, which needs to be saved without compression.
+            Note that .d folders that are available in the cache
+            (see alphatims.bruker.set_cache) are always memory-mapped.
+            Default is False.
+        compact_tof_indices : bool
+            If True, tof_indices are stored as uint16 deltas within each push
+            (see alphatims.bruker.TimsTOF.compact_tof_indices).
+            Default is False.
+        max_cached_result_bytes : int
+            The maximum memory (in bytes) of slicing results that are kept
+            in a least-recently-used cache
+            (see alphatims.bruker.TimsTOF.set_max_cached_result_bytes).
+            Default is 0, meaning no results are cached.
         """
         self.bruker_d_folder_name = os.path.abspath(bruker_d_folder_name)
         logging.info(f"Importing data from {bruker_d_folder_name}")
         if bruker_d_folder_name.endswith(".d"):
-            self._import_data_from_d_folder(
+            cache_file_name = self._get_cache_file_name(
                 bruker_d_folder_name,
                 mz_estimation_from_frame,
                 mobility_estimation_from_frame,
             )
+            if not self._import_data_from_cache(cache_file_name):
+                self._import_data_from_d_folder(
+                    bruker_d_folder_name,
+                    mz_estimation_from_frame,
+                    mobility_estimation_from_frame,
+                    mmap_detector_events,
+                )
+                self._save_to_cache(cache_file_name)
         elif bruker_d_folder_name.endswith(".hdf"):
             self._import_data_from_hdf_file(
                 bruker_d_folder_name,
+                mmap_detector_events,
             )
             self.bruker_d_folder_name = os.path.abspath(bruker_d_folder_name)
+        elif bruker_d_folder_name.endswith((".parquet", ".arrow")):
+            self._import_data_from_arrow_file(bruker_d_folder_name)
+            self.bruker_d_folder_name = os.path.abspath(bruker_d_folder_name)
         if not hasattr(self, "version"):
             self._version = "none"
         if self.version != alphatims.__version__:
@@ -951,9 +1771,12 @@ class TimsTOF(object):
                 f"AlphaTims is {alphatims.__version__}."
             )
         self.slice_as_dataframe = slice_as_dataframe
+        self.set_max_cached_result_bytes(max_cached_result_bytes)
         self.use_calibrated_mz_values_as_default(
             use_calibrated_mz_values_as_default
         )
+        if compact_tof_indices:
+            self.compact_tof_indices()
         # Precompile
         self[0, "raw"]
         logging.info(f"Succesfully imported data from {bruker_d_folder_name}")
@@ -964,11 +1787,55 @@ class TimsTOF(object):
     def __hash__(self):
         return hash(self.bruker_d_folder_name)
 
+    def _get_cache_file_name(
+        self,
+        bruker_d_folder_name: str,
+        mz_estimation_from_frame: int,
+        mobility_estimation_from_frame: int,
+    ) -> str:
+        return get_cache_file_name(
+            bruker_d_folder_name,
+            mz_estimation_from_frame,
+            mobility_estimation_from_frame,
+            BRUKER_DLL_FILE_NAME != "",
+        )
+
+    def _import_data_from_cache(self, cache_file_name: str) -> bool:
+        if (cache_file_name is None) or not os.path.exists(cache_file_name):
+            return False
+        logging.info(f"Importing data from cache {cache_file_name}")
+        try:
+            self._import_data_from_hdf_file(
+                cache_file_name,
+                mmap_detector_events=True,
+            )
+        except (OSError, KeyError) as error:
+            logging.info(f"Cache {cache_file_name} is not valid: {error}")
+            return False
+        # NOTE: The modification time is used to remove least recently used
+        # files from the cache
+        with contextlib.suppress(OSError):
+            os.utime(cache_file_name)
+        return True
+
+    def _save_to_cache(self, cache_file_name: str) -> None:
+        if cache_file_name is None:
+            return
+        temp_file_name = f"{cache_file_name}.{os.getpid()}.tmp"
+        self.save_as_hdf(
+            os.path.dirname(temp_file_name),
+            os.path.basename(temp_file_name),
+            overwrite=True,
+        )
+        os.replace(temp_file_name, cache_file_name)
+        trim_cache(keep_file_name=cache_file_name)
+
     def _import_data_from_d_folder(
         self,
         bruker_d_folder_name: str,
         mz_estimation_from_frame: int,
         mobility_estimation_from_frame: int,
+        mmap_detector_events: bool = False,
     ):
         self._version = alphatims.__version__
         self._zeroth_frame = True
@@ -978,26 +1845,24 @@ class TimsTOF(object):
             self._frames,
             self._fragment_frames,
             self._precursors,
-        ) = read_bruker_sql(bruker_d_folder_name, self._zeroth_frame)
+        ) = read_bruker_sql(
+            bruker_d_folder_name,
+            self._zeroth_frame,
+            as_dataframes=False,
+        )
         self._meta_data = dict(
-            zip(global_meta_data.Key, global_meta_data.Value)
+            zip(global_meta_data["Key"], global_meta_data["Value"])
         )
-        (
-            self._push_indptr,
-            self._tof_indices,
-            self._intensity_values,
-        ) = read_bruker_binary(
-            self.frames,
+        self._import_detector_events_from_d_folder(
             bruker_d_folder_name,
-            int(self._meta_data["TimsCompressionType"]),
-            int(self._meta_data["MaxNumPeaksPerScan"]),
+            mmap_detector_events,
         )
         logging.info(f"Indexing {bruker_d_folder_name}...")
         self._use_calibrated_mz_values_as_default = False
-        self._frame_max_index = self.frames.shape[0]
-        self._scan_max_index = int(self.frames.NumScans.max()) + 1
+        self._frame_max_index = len(self._frames["Id"])
+        self._scan_max_index = int(np.max(self._frames["NumScans"])) + 1
         self._tof_max_index = int(self.meta_data["DigitizerNumSamples"]) + 1
-        self._rt_values = self.frames.Time.values.astype(np.float64)
+        self._rt_values = np.array(self._frames["Time"], dtype=np.float64)
         self._mobility_min_value = float(
             self.meta_data["OneOverK0AcqRangeLower"]
         )
@@ -1070,9 +1935,240 @@ class TimsTOF(object):
                 tof_intercept + tof_slope * np.arange(self.tof_max_index)
             )**2
         self._parse_quad_indptr()
+        self._index_detector_events()
+
+    def _import_detector_events_from_d_folder(
+        self,
+        bruker_d_folder_name: str,
+        mmap_detector_events: bool = False,
+    ):
+        (
+            self._push_indptr,
+            self._tof_indices,
+            self._intensity_values,
+        ) = read_bruker_binary(
+            self._frames,
+            bruker_d_folder_name,
+            int(self._meta_data["TimsCompressionType"]),
+            int(self._meta_data["MaxNumPeaksPerScan"]),
+            mmap_detector_events,
+        )
+
+    def _index_detector_events(self) -> None:
+        self._quad_indptr = self.push_indptr[self._raw_quad_indptr]
+        self._max_push_size = None
         self._intensity_min_value = int(np.min(self.intensity_values))
         self._intensity_max_value = int(np.max(self.intensity_values))
 
+    def refresh(self) -> int:
+        """Load all frames that were acquired since the last (re)load.
+
+        This allows to follow a .d folder that is still being acquired.
+        Only new frames are decoded, after which they are appended to
+        the existing arrays with amortized growth
+        (see alphatims.utils.append_to_array).
+
+        Returns
+        -------
+        : int
+            The number of frames that were added.
+        """
+        if not self.bruker_d_folder_name.endswith(".d"):
+            raise ValueError(
+                f"Cannot refresh {self.bruker_d_folder_name}, "
+                "only .d folders can be refreshed."
+            )
+        (
+            acquisition_mode,
+            global_meta_data,
+            frames,
+            fragment_frames,
+            precursors,
+        ) = read_bruker_sql(
+            self.bruker_d_folder_name,
+            self.zeroth_frame,
+            as_dataframes=False,
+        )
+        frame_ids = np.arange(self.frame_max_index, len(frames["Id"]))
+        if len(frame_ids) == 0:
+            logging.info(f"No new frames in {self.bruker_d_folder_name}")
+            return 0
+        if int(np.max(frames["NumScans"])) + 1 != self.scan_max_index:
+            raise ValueError(
+                "Number of scans per frame changed, "
+                f"{self.bruker_d_folder_name} needs to be reloaded."
+            )
+        logging.info(
+            f"Appending {len(frame_ids)} frames from "
+            f"{self.bruker_d_folder_name}"
+        )
+        self._acquisition_mode = acquisition_mode
+        self._frames = frames
+        self._fragment_frames = fragment_frames
+        self._precursors = precursors
+        self._frame_max_index = len(frames["Id"])
+        self._rt_values = alphatims.utils.append_to_array(
+            self.rt_values,
+            np.array(frames["Time"][frame_ids], dtype=np.float64)
+        )
+        self._parse_quad_indptr()
+        self._append_detector_events_from_d_folder(frame_ids)
+        self.clear_result_cache()
+        return len(frame_ids)
+
+    def _append_detector_events_from_d_folder(
+        self,
+        frame_ids: np.ndarray,
+    ) -> None:
+        (
+            frame_indptr,
+            scan_indptr,
+            tof_indices,
+            intensity_values,
+        ) = read_bruker_frames(
+            frame_ids,
+            self._frames,
+            self.bruker_d_folder_name,
+            int(self.meta_data["TimsCompressionType"]),
+            int(self.meta_data["MaxNumPeaksPerScan"]),
+        )
+        self._push_indptr = alphatims.utils.append_to_array(
+            self.push_indptr,
+            scan_indptr[1:] + self.push_indptr[-1]
+        )
+        if self.is_compact:
+            (
+                push_tof_offsets,
+                tof_deltas,
+                tof_delta_overflow_indices,
+                tof_delta_overflow_values,
+            ) = encode_tof_deltas(scan_indptr, tof_indices)
+            self._tof_delta_overflow_indices = alphatims.utils.append_to_array(
+                self._tof_delta_overflow_indices,
+                tof_delta_overflow_indices + len(self._tof_deltas)
+            )
+            self._tof_delta_overflow_values = alphatims.utils.append_to_array(
+                self._tof_delta_overflow_values,
+                tof_delta_overflow_values
+            )
+            self._push_tof_offsets = alphatims.utils.append_to_array(
+                self._push_tof_offsets,
+                push_tof_offsets
+            )
+            self._tof_deltas = alphatims.utils.append_to_array(
+                self._tof_deltas,
+                tof_deltas
+            )
+        else:
+            self._tof_indices = alphatims.utils.append_to_array(
+                self.tof_indices,
+                tof_indices
+            )
+        self._intensity_values = alphatims.utils.append_to_array(
+            self.intensity_values,
+            intensity_values
+        )
+        self._quad_indptr = self.push_indptr[self._raw_quad_indptr]
+        self._max_push_size = None
+        if self.has_tof_index:
+            logging.info("Discarding outdated tof index")
+            self._tof_index_indptr = None
+            self._tof_index_raw_indices = None
+        if self.has_intensity_pyramids:
+            logging.info("Discarding outdated intensity pyramids")
+            self._intensity_pyramids = None
+        if len(intensity_values) > 0:
+            self._intensity_min_value = min(
+                self.intensity_min_value,
+                int(np.min(intensity_values))
+            )
+            self._intensity_max_value = max(
+                self.intensity_max_value,
+                int(np.max(intensity_values))
+            )
+
+    @property
+    def has_tof_index(self):
+        """: bool : If an inverted tof index is available."""
+        return getattr(self, "_tof_index_indptr", None) is not None
+
+    def build_tof_index(self) -> None:
+        """Build an inverted index with all raw indices sorted by tof index.
+
+        Once available, slicing automatically uses this index for queries
+        where the tof slices select fewer detector events than the
+        number of pushes that would need to be visited otherwise,
+        e.g. for narrow mz_values over the full gradient.
+        The index requires (4 or 8 bytes) memory per detector event and is
+        built in parallel with alphatims.utils.MAX_THREADS.
+        """
+        logging.info(f"Building tof index of {self.bruker_d_folder_name}")
+        tof_indices = self.tof_indices
+        tof_count = self.tof_max_index
+        if len(tof_indices) > 0:
+            tof_count = max(tof_count, int(np.max(tof_indices)) + 1)
+        # NOTE: Each chunk needs a counter per tof index, so chunks are
+        # capped to never use more memory than the index itself
+        chunk_count = max(
+            1,
+            min(alphatims.utils.MAX_THREADS, len(tof_indices) // tof_count)
+        )
+        chunk_indptr = np.linspace(
+            0,
+            len(tof_indices),
+            chunk_count + 1
+        ).astype(np.int64)
+        chunk_offsets = np.zeros((chunk_count, tof_count), dtype=np.int64)
+        count_tof_index_chunk(
+            range(chunk_count),
+            chunk_indptr,
+            tof_indices,
+            chunk_offsets,
+        )
+        tof_index_indptr = np.zeros(tof_count + 1, dtype=np.int64)
+        np.sum(chunk_offsets, axis=0, out=tof_index_indptr[1:])
+        np.cumsum(tof_index_indptr, out=tof_index_indptr)
+        offsets = tof_index_indptr[:-1].copy()
+        for chunk_counts in chunk_offsets:
+            offsets += chunk_counts
+            chunk_counts[:] = offsets - chunk_counts
+        if len(tof_indices) < 2**32:
+            raw_index_dtype = np.uint32
+        else:
+            raw_index_dtype = np.int64
+        tof_index_raw_indices = np.empty(
+            len(tof_indices),
+            dtype=raw_index_dtype
+        )
+        fill_tof_index_chunk(
+            range(chunk_count),
+            chunk_indptr,
+            tof_indices,
+            chunk_offsets,
+            tof_index_raw_indices,
+        )
+        self._tof_index_indptr = tof_index_indptr
+        self._tof_index_raw_indices = tof_index_raw_indices
+
+    def compact_tof_indices(self) -> None:
+        """Store the tof_indices as uint16 deltas within each push.
+
+        Since tof_indices are sorted within each push, this (roughly) halves
+        the memory of the largest array.
+        Slicing and conversion decode the deltas on the fly, while the
+        tof_indices property fully decodes them upon each access.
+        """
+        if self.is_compact:
+            return
+        logging.info(f"Compacting tof indices of {self.bruker_d_folder_name}")
+        (
+            self._push_tof_offsets,
+            self._tof_deltas,
+            self._tof_delta_overflow_indices,
+            self._tof_delta_overflow_values,
+        ) = encode_tof_deltas(self.push_indptr, self.tof_indices)
+        self._tof_indices = None
+
     def save_as_hdf(
         self,
         directory: str,
@@ -1080,6 +2176,8 @@ class TimsTOF(object):
         overwrite: bool = False,
         compress: bool = False,
         return_as_bytes_io: bool = False,
+        codec: str = "lzf",
+        chunk_size: int = alphatims.utils.HDF_CHUNK_SIZE,
     ):
         """Save the TimsTOF object as an hdf file.
 
@@ -1108,6 +2206,16 @@ class TimsTOF(object):
             as a bytes stream.
             If False, the file is written to disk.
             Default is False.
+        codec : str
+            The compression codec, ignored if compress is False.
+            If "lzf", compression is done by HDF itself with a single thread.
+            If "gzip" or "zstd", chunks are compressed in parallel.
+            Writing and reading "zstd" compressed files requires the
+            optional hdf5plugin package (pip install "alphatims[zstd]").
+            Default is "lzf".
+        chunk_size : int
+            The size in bytes of chunks that are compressed in parallel.
+            Default is alphatims.utils.HDF_CHUNK_SIZE.
 
         Returns
         -------
@@ -1129,15 +2237,34 @@ class TimsTOF(object):
         logging.info(
             f"Writing TimsTOF data to {full_file_name}."
         )
+        import time
+        if compress:
+            alphatims.utils.check_hdf_codec(codec)
         self._compressed = compress
+        self._convert_sql_tables()
+        start_time = time.time()
         with h5py.File(full_file_name, hdf_mode) as hdf_root:
             # hdf_root.swmr_mode = True
             alphatims.utils.create_hdf_group_from_dict(
                 hdf_root.create_group("raw"),
-                self.__dict__,
+                self._get_serializable_dict(),
                 overwrite=overwrite,
                 compress=compress,
+                codec=codec,
+                chunk_size=chunk_size,
+            )
+        duration = time.time() - start_time
+        data_size_in_mb = sum(
+            value.nbytes for value in self.__dict__.values() if isinstance(
+                value,
+                np.ndarray
             )
+        ) / 1024**2
+        logging.info(
+            f"Wrote {data_size_in_mb:,.1f} MB of arrays in "
+            f"{duration:.2f} seconds "
+            f"({data_size_in_mb / max(duration, 1e-9):,.1f} MB/s)."
+        )
         if return_as_bytes_io:
             full_file_name.seek(0)
         else:
@@ -1149,41 +2276,300 @@ class TimsTOF(object):
     def _import_data_from_hdf_file(
         self,
         bruker_d_folder_name: str,
+        mmap_detector_events: bool = False,
     ):
+        if mmap_detector_events:
+            mmap_arrays = [
+                "/raw/_push_indptr",
+                "/raw/_tof_indices",
+                "/raw/_intensity_values",
+                "/raw/_push_tof_offsets",
+                "/raw/_tof_deltas",
+            ]
+        else:
+            mmap_arrays = None
+        with contextlib.suppress(ImportError):
+            # NOTE: Registers additional compression filters such as zstd
+            import hdf5plugin
         with h5py.File(bruker_d_folder_name, "r") as hdf_root:
             self.__dict__ = alphatims.utils.create_dict_from_hdf_group(
-                hdf_root["raw"]
+                hdf_root["raw"],
+                mmap_arrays,
             )
 
-    def convert_from_indices(
+    def save_as_parquet(
         self,
-        raw_indices=None,
-        *,
-        frame_indices=None,
-        quad_indices=None,
-        scan_indices=None,
-        tof_indices=None,
-        return_raw_indices: bool = False,
-        return_frame_indices: bool = False,
-        return_scan_indices: bool = False,
-        return_quad_indices: bool = False,
-        return_tof_indices: bool = False,
-        return_precursor_indices: bool = False,
-        return_rt_values: bool = False,
-        return_rt_values_min: bool = False,
-        return_mobility_values: bool = False,
-        return_quad_mz_values: bool = False,
-        return_push_indices: bool = False,
-        return_mz_values: bool = False,
-        return_intensity_values: bool = False,
-        raw_indices_sorted: bool = True,
-    ) -> dict:
-        """Convert selected indices to a dict.
-
-        Parameters
+        directory: str,
+        file_name: str,
+        overwrite: bool = False,
+        row_group_size: int = 2**20,
+    ) -> str:
+        """Save the TimsTOF object as a parquet file.
+
+        Each detector event is a row with its frame_indices, scan_indices,
+        tof_indices, intensity_values and rt_values.
+        Row groups never split a frame, so that readers can skip
+        row groups based on frame or rt statistics.
+        All other (meta)data, such as the quad index, is stored in the
+        schema metadata.
+        This requires the optional pyarrow package,
+        which is installed with pip install "alphatims[arrow]".
+
+        Parameters
+        ----------
+        directory : str
+            The directory where to save the parquet file.
+        file_name : str
+            The file name of the parquet file.
+        overwrite : bool
+            If True, an existing file is overwritten.
+            If False, an error is raised if the file already exists.
+            Default is False.
+        row_group_size : int
+            The (approximate) number of detector events per row group.
+            Default is 2**20.
+
+        Returns
+        -------
+        str
+            The full file name.
+        """
+        import pyarrow.parquet
+        full_file_name = self._get_export_file_name(
+            directory,
+            file_name,
+            overwrite,
+        )
+        logging.info(f"Writing TimsTOF data to {full_file_name}.")
+        schema = self._create_arrow_schema()
+        with pyarrow.parquet.ParquetWriter(
+            full_file_name,
+            schema,
+        ) as parquet_writer:
+            for record_batch in self._create_arrow_record_batches(
+                schema,
+                row_group_size,
+            ):
+                parquet_writer.write_batch(
+                    record_batch,
+                    row_group_size=max(1, record_batch.num_rows),
+                )
+        logging.info(f"Succesfully wrote TimsTOF data to {full_file_name}.")
+        return full_file_name
+
+    def save_as_arrow(
+        self,
+        directory: str,
+        file_name: str,
+        overwrite: bool = False,
+    ) -> str:
+        """Save the TimsTOF object as an (uncompressed) Arrow IPC file.
+
+        The layout is identical to alphatims.bruker.TimsTOF.save_as_parquet,
+        but all detector events are written as a single record batch.
+        When this file is loaded again, the tof_indices and
+        intensity_values are memory-mapped without copying,
+        while the push_indptr is rebuilt in a single pass over the
+        frame_indices and scan_indices columns.
+        This requires the optional pyarrow package as well.
+
+        Parameters
+        ----------
+        directory : str
+            The directory where to save the arrow file.
+        file_name : str
+            The file name of the arrow file.
+        overwrite : bool
+            If True, an existing file is overwritten.
+            If False, an error is raised if the file already exists.
+            Default is False.
+
+        Returns
+        -------
+        str
+            The full file name.
+        """
+        import pyarrow
+        full_file_name = self._get_export_file_name(
+            directory,
+            file_name,
+            overwrite,
+        )
+        logging.info(f"Writing TimsTOF data to {full_file_name}.")
+        schema = self._create_arrow_schema()
+        with pyarrow.OSFile(full_file_name, "wb") as arrow_file:
+            with pyarrow.ipc.new_file(arrow_file, schema) as arrow_writer:
+                for record_batch in self._create_arrow_record_batches(
+                    schema,
+                    len(self),
+                ):
+                    arrow_writer.write_batch(record_batch)
+        logging.info(f"Succesfully wrote TimsTOF data to {full_file_name}.")
+        return full_file_name
+
+    def _get_export_file_name(
+        self,
+        directory: str,
+        file_name: str,
+        overwrite: bool,
+    ) -> str:
+        full_file_name = os.path.join(directory, file_name)
+        if os.path.exists(full_file_name) and not overwrite:
+            raise FileExistsError(
+                f"{full_file_name} already exists, use overwrite=True."
+            )
+        return full_file_name
+
+    def _get_serializable_dict(self, excluded_keys: tuple = ()) -> dict:
+        # NOTE: The result cache is never serialized
+        return {
+            key: value for key, value in self.__dict__.items() if (
+                not key.startswith("_result_cache")
+            ) and (
+                key not in excluded_keys
+            )
+        }
+
+    def _create_arrow_schema(self):
+        import io
+        import pyarrow
+        hdf_bytes = io.BytesIO()
+        self._convert_sql_tables()
+        with h5py.File(hdf_bytes, "w") as hdf_root:
+            alphatims.utils.create_hdf_group_from_dict(
+                hdf_root.create_group("raw"),
+                self._get_serializable_dict(ARROW_EXCLUDED_KEYS),
+                compress=True,
+                recursed=True,
+            )
+        return pyarrow.schema(
+            [
+                ("frame_indices", pyarrow.uint32()),
+                ("scan_indices", pyarrow.uint32()),
+                ("tof_indices", pyarrow.uint32()),
+                ("intensity_values", pyarrow.uint16()),
+                ("rt_values", pyarrow.float64()),
+            ],
+            metadata={"alphatims": hdf_bytes.getvalue()},
+        )
+
+    def _create_arrow_record_batches(self, schema, row_group_size: int):
+        import pyarrow
+        scan_max_index = self.scan_max_index
+        frame_indptr = self.push_indptr[::scan_max_index]
+        tof_indices = self.tof_indices
+        frame_start = 0
+        while frame_start < self.frame_max_index:
+            frame_end = max(
+                frame_start + 1,
+                np.searchsorted(
+                    frame_indptr,
+                    frame_indptr[frame_start] + row_group_size,
+                    "right"
+                ) - 1
+            )
+            frame_end = min(frame_end, self.frame_max_index)
+            push_start = frame_start * scan_max_index
+            push_end = frame_end * scan_max_index
+            start = self.push_indptr[push_start]
+            end = self.push_indptr[push_end]
+            frame_indices = np.empty(end - start, dtype=np.uint32)
+            scan_indices = np.empty(end - start, dtype=np.uint32)
+            fill_push_columns(
+                self.push_indptr,
+                push_start,
+                push_end,
+                scan_max_index,
+                frame_indices,
+                scan_indices,
+            )
+            yield pyarrow.record_batch(
+                [
+                    frame_indices,
+                    scan_indices,
+                    np.asarray(tof_indices[start: end]),
+                    np.asarray(self.intensity_values[start: end]),
+                    self.rt_values[frame_indices],
+                ],
+                schema=schema,
+            )
+            frame_start = frame_end
+
+    def _import_data_from_arrow_file(self, file_name: str) -> None:
+        import io
+        import pyarrow
+        import pyarrow.parquet
+        if file_name.endswith(".parquet"):
+            table = pyarrow.parquet.read_table(
+                file_name,
+                columns=list(ARROW_COLUMNS),
+                memory_map=True,
+            )
+        else:
+            table = pyarrow.ipc.open_file(
+                pyarrow.memory_map(file_name, "r")
+            ).read_all()
+        with h5py.File(
+            io.BytesIO(table.schema.metadata[b"alphatims"]),
+            "r"
+        ) as hdf_root:
+            self.__dict__ = alphatims.utils.create_dict_from_hdf_group(
+                hdf_root["raw"]
+            )
+        columns = {}
+        for column_name in ARROW_COLUMNS:
+            column = table.column(column_name)
+            if column.num_chunks == 1:
+                # NOTE: Zero-copy for uncompressed Arrow IPC files
+                columns[column_name] = column.chunk(0).to_numpy()
+            else:
+                columns[column_name] = column.to_numpy()
+        self._push_indptr = np.zeros(
+            self.frame_max_index * self.scan_max_index + 1,
+            dtype=np.int64
+        )
+        count_push_events(
+            columns["frame_indices"],
+            columns["scan_indices"],
+            self.scan_max_index,
+            self._push_indptr,
+        )
+        np.cumsum(self._push_indptr, out=self._push_indptr)
+        self._tof_indices = columns["tof_indices"]
+        self._intensity_values = columns["intensity_values"]
+        self._quad_indptr = self.push_indptr[self.raw_quad_indptr]
+
+    def convert_from_indices(
+        self,
+        raw_indices=None,
+        *,
+        frame_indices=None,
+        quad_indices=None,
+        scan_indices=None,
+        tof_indices=None,
+        return_raw_indices: bool = False,
+        return_frame_indices: bool = False,
+        return_scan_indices: bool = False,
+        return_quad_indices: bool = False,
+        return_tof_indices: bool = False,
+        return_precursor_indices: bool = False,
+        return_rt_values: bool = False,
+        return_rt_values_min: bool = False,
+        return_mobility_values: bool = False,
+        return_quad_mz_values: bool = False,
+        return_push_indices: bool = False,
+        return_mz_values: bool = False,
+        return_intensity_values: bool = False,
+        raw_indices_sorted: bool = True,
+    ) -> dict:
+        """Convert selected indices to a dict.
+
+        Parameters
         ----------
-        raw_indices : np.int64[:], None
+        raw_indices : np.int64[:], np.int64[:, 2], None
             The raw indices for which coordinates need to be retrieved.
+            Alternatively, (start, end) ranges of raw indices
+            (e.g. from data[..., "ranges"]) can be provided.
         frame_indices : np.int64[:], None
             The frame indices for which coordinates need to be retrieved.
         quad_indices : np.int64[:], None
@@ -1243,21 +2629,46 @@ class TimsTOF(object):
             A dict with all requested columns.
         """
         result = {}
+        if (raw_indices is not None) and (np.ndim(raw_indices) == 2):
+            raw_indices = expand_raw_ranges(raw_indices)
+            raw_indices_sorted = True
+        if (raw_indices is not None) and all(
+            indices is None for indices in (
+                frame_indices,
+                quad_indices,
+                scan_indices,
+                tof_indices,
+            )
+        ):
+            return self._convert_from_raw_indices(
+                raw_indices,
+                raw_indices_sorted=raw_indices_sorted,
+                return_raw_indices=return_raw_indices,
+                return_frame_indices=return_frame_indices,
+                return_scan_indices=return_scan_indices,
+                return_quad_indices=return_quad_indices,
+                return_precursor_indices=return_precursor_indices,
+                return_push_indices=return_push_indices,
+                return_tof_indices=return_tof_indices,
+                return_rt_values=return_rt_values,
+                return_rt_values_min=return_rt_values_min,
+                return_mobility_values=return_mobility_values,
+                return_quad_mz_values=return_quad_mz_values,
+                return_mz_values=return_mz_values,
+                return_intensity_values=return_intensity_values,
+            )
         if (raw_indices is not None) and any(
             [
                 return_frame_indices,
                 return_scan_indices,
-                return_quad_indices,
                 return_rt_values,
                 return_rt_values_min,
                 return_mobility_values,
-                return_quad_mz_values,
-                return_precursor_indices,
                 return_push_indices,
             ]
         ):
             if raw_indices_sorted:
-                push_indices = indptr_lookup(
+                push_indices = parallel_indptr_lookup(
                     self.push_indptr,
                     raw_indices,
                 )
@@ -1285,7 +2696,7 @@ class TimsTOF(object):
             quad_indices is None
         ):
             if raw_indices_sorted:
-                quad_indices = indptr_lookup(
+                quad_indices = parallel_indptr_lookup(
                     self.quad_indptr,
                     raw_indices,
                 )
@@ -1296,7 +2707,17 @@ class TimsTOF(object):
                     "right"
                 ) - 1
         if (return_tof_indices or return_mz_values) and (tof_indices is None):
-            tof_indices = self.tof_indices[raw_indices]
+            if self.is_compact:
+                tof_indices = decode_tof_deltas_at(
+                    np.asarray(raw_indices, dtype=np.int64),
+                    self.push_indptr,
+                    self._push_tof_offsets,
+                    self._tof_deltas,
+                    self._tof_delta_overflow_indices,
+                    self._tof_delta_overflow_values,
+                )
+            else:
+                tof_indices = self.tof_indices[raw_indices]
         if return_raw_indices:
             result["raw_indices"] = raw_indices
         if return_frame_indices:
@@ -1332,6 +2753,109 @@ class TimsTOF(object):
             result["intensity_values"] = self.intensity_values[raw_indices]
         return result
 
+    def _convert_from_raw_indices(
+        self,
+        raw_indices: np.ndarray,
+        *,
+        raw_indices_sorted: bool,
+        return_raw_indices: bool,
+        return_frame_indices: bool,
+        return_scan_indices: bool,
+        return_quad_indices: bool,
+        return_precursor_indices: bool,
+        return_push_indices: bool,
+        return_tof_indices: bool,
+        return_rt_values: bool,
+        return_rt_values_min: bool,
+        return_mobility_values: bool,
+        return_quad_mz_values: bool,
+        return_mz_values: bool,
+        return_intensity_values: bool,
+    ) -> dict:
+        raw_indices = np.asarray(raw_indices)
+        raw_index_count = len(raw_indices)
+        buffers = {}
+        requested_columns = []
+        for column, requested, dtype in [
+            ("frame_indices", return_frame_indices, np.int64),
+            ("scan_indices", return_scan_indices, np.int64),
+            ("quad_indices", return_quad_indices, np.int64),
+            (
+                "precursor_indices",
+                return_precursor_indices,
+                self.precursor_indices.dtype
+            ),
+            ("push_indices", return_push_indices, np.int64),
+            ("tof_indices", return_tof_indices, np.uint32),
+            ("rt_values", return_rt_values, np.float64),
+            ("rt_values_min", return_rt_values_min, np.float64),
+            ("mobility_values", return_mobility_values, np.float64),
+            ("quad_low_mz_values", return_quad_mz_values, np.float64),
+            ("quad_high_mz_values", return_quad_mz_values, np.float64),
+            ("mz_values", return_mz_values, np.float64),
+            (
+                "intensity_values",
+                return_intensity_values,
+                self.intensity_values.dtype
+            ),
+        ]:
+            buffers[column] = np.empty(
+                raw_index_count if requested else 0,
+                dtype=dtype
+            )
+            if requested:
+                requested_columns.append(column)
+        tof_arrays = self._get_tof_arrays()
+        args = (
+            raw_indices,
+            raw_indices_sorted,
+            self.scan_max_index,
+            self.push_indptr,
+            self.quad_indptr,
+            tof_arrays["tof_indices"],
+            tof_arrays["push_tof_offsets"],
+            tof_arrays["tof_deltas"],
+            tof_arrays["tof_delta_overflow_indices"],
+            tof_arrays["tof_delta_overflow_values"],
+            self.intensity_values,
+            self.precursor_indices,
+            self.rt_values,
+            self.mobility_values,
+            self.mz_values,
+            self.quad_mz_values,
+            buffers["push_indices"],
+            buffers["frame_indices"],
+            buffers["scan_indices"],
+            buffers["quad_indices"],
+            buffers["precursor_indices"],
+            buffers["tof_indices"],
+            buffers["rt_values"],
+            buffers["rt_values_min"],
+            buffers["mobility_values"],
+            buffers["quad_low_mz_values"],
+            buffers["quad_high_mz_values"],
+            buffers["mz_values"],
+            buffers["intensity_values"],
+        )
+        if (alphatims.utils.MAX_THREADS > 1) and (
+            raw_index_count >= MIN_PARALLEL_RAW_INDEX_COUNT
+        ):
+            chunk_count = alphatims.utils.MAX_THREADS
+            chunk_indptr = np.linspace(
+                0,
+                raw_index_count,
+                chunk_count + 1
+            ).astype(np.int64)
+            convert_raw_index_chunk(range(chunk_count), chunk_indptr, *args)
+        elif raw_index_count > 0:
+            convert_raw_index_range(0, raw_index_count, *args)
+        result = {}
+        if return_raw_indices:
+            result["raw_indices"] = raw_indices
+        for column in requested_columns:
+            result[column] = buffers[column]
+        return result
+
     def convert_to_indices(
         self,
         values: np.ndarray,
@@ -1420,13 +2944,170 @@ class TimsTOF(object):
                 as_dataframe = True
             elif keys[-1] == "raw":
                 as_dataframe = False
+            elif keys[-1] == "ranges":
+                return self._filter_cached_parsed_keys(
+                    parse_keys(self, keys[:-1]),
+                    as_ranges=True,
+                )
             else:
                 raise ValueError(f"Cannot use {keys[-1]} as a key")
             keys = keys[:-1]
         else:
             as_dataframe = self.slice_as_dataframe
         parsed_keys = parse_keys(self, keys)
-        raw_indices = filter_indices(
+        raw_indices = self._filter_cached_parsed_keys(parsed_keys)
+        if as_dataframe:
+            return self.as_dataframe(raw_indices)
+        else:
+            return raw_indices
+
+    def _filter_cached_parsed_keys(
+        self,
+        parsed_keys: dict,
+        as_ranges: bool = False,
+    ) -> np.ndarray:
+        if as_ranges:
+            filter_parsed_keys = self._filter_parsed_keys_as_ranges
+        else:
+            filter_parsed_keys = self._filter_parsed_keys
+        if self.max_cached_result_bytes == 0:
+            return filter_parsed_keys(parsed_keys)
+        cache_key = (as_ranges,) + tuple(
+            (
+                key,
+                parsed_keys[key].dtype.str,
+                parsed_keys[key].shape,
+                parsed_keys[key].tobytes(),
+            ) for key in sorted(parsed_keys)
+        )
+        if cache_key in self._result_cache:
+            self._result_cache_hits += 1
+            self._result_cache.move_to_end(cache_key)
+            return self._result_cache[cache_key]
+        self._result_cache_misses += 1
+        result = filter_parsed_keys(parsed_keys)
+        if result.nbytes <= self.max_cached_result_bytes:
+            result.flags.writeable = False
+            self._result_cache[cache_key] = result
+            self._result_cache_bytes += result.nbytes
+            self._trim_result_cache()
+        return result
+
+    def _trim_result_cache(self) -> None:
+        while self._result_cache and (
+            self._result_cache_bytes > self.max_cached_result_bytes
+        ):
+            self._result_cache_bytes -= self._result_cache.popitem(
+                last=False
+            )[1].nbytes
+
+    @property
+    def max_cached_result_bytes(self) -> int:
+        """: int : The maximum memory of cached slicing results."""
+        return getattr(self, "_result_cache_max_bytes", 0)
+
+    def set_max_cached_result_bytes(self, max_cached_result_bytes: int):
+        """Cache the results of slicing in a least-recently-used cache.
+
+        Results of data[...] (i.e. raw indices, or ranges for
+        data[..., "ranges"]) are cached for each unique key after it has
+        been parsed by alphatims.bruker.parse_keys.
+        Slicing the same data again thus returns the cached result,
+        which is read-only and should not be modified.
+        The least recently used results are discarded first when their
+        memory exceeds max_cached_result_bytes.
+
+        Parameters
+        ----------
+        max_cached_result_bytes : int
+            The maximum memory (in bytes) of all cached results.
+            If 0, no results are cached.
+
+        Raises
+        ------
+        ValueError
+            When max_cached_result_bytes is negative.
+        """
+        if max_cached_result_bytes < 0:
+            raise ValueError(
+                "max_cached_result_bytes cannot be negative, "
+                f"got {max_cached_result_bytes}"
+            )
+        self._result_cache_max_bytes = int(max_cached_result_bytes)
+        if not hasattr(self, "_result_cache"):
+            self._result_cache = collections.OrderedDict()
+            self._result_cache_bytes = 0
+            self._result_cache_hits = 0
+            self._result_cache_misses = 0
+        self._trim_result_cache()
+
+    def clear_result_cache(self) -> None:
+        """Discard all cached slicing results."""
+        if hasattr(self, "_result_cache"):
+            self._result_cache.clear()
+            self._result_cache_bytes = 0
+
+    @property
+    def result_cache_statistics(self) -> dict:
+        """: dict : The hits, misses, hit rate and memory of the cache."""
+        hits = getattr(self, "_result_cache_hits", 0)
+        misses = getattr(self, "_result_cache_misses", 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if (hits + misses) else 0.,
+            "cached_results": len(getattr(self, "_result_cache", ())),
+            "cached_bytes": getattr(self, "_result_cache_bytes", 0),
+            "max_cached_bytes": self.max_cached_result_bytes,
+        }
+
+    def _filter_parsed_keys(self, parsed_keys: dict) -> np.ndarray:
+        strategy = self._plan_parsed_keys(parsed_keys)["strategy"]
+        if strategy in ("frame_ranges", "push_ranges"):
+            return expand_raw_ranges(
+                self._filter_parsed_keys_as_ranges(parsed_keys)
+            )
+        if strategy == "tof_index":
+            return filter_tof_index(
+                frame_slices=parsed_keys["frame_indices"],
+                scan_slices=parsed_keys["scan_indices"],
+                precursor_slices=parsed_keys["precursor_indices"],
+                tof_slices=parsed_keys["tof_indices"],
+                quad_slices=parsed_keys["quad_values"],
+                intensity_slices=parsed_keys["intensity_values"],
+                scan_max_index=self.scan_max_index,
+                push_indptr=self.push_indptr,
+                precursor_indices=self.precursor_indices,
+                quad_mz_values=self.quad_mz_values,
+                quad_indptr=self.quad_indptr,
+                tof_index_indptr=self._tof_index_indptr,
+                tof_index_raw_indices=self._tof_index_raw_indices,
+                intensities=self.intensity_values,
+            )
+        if strategy == "quad_major":
+            segment_start, segment_end = self._get_quad_segment_span(
+                parsed_keys
+            )
+            return filter_quad_segment_indices(
+                segment_indices=filter_quad_segments(
+                    segment_start,
+                    segment_end,
+                    parsed_keys["quad_values"],
+                    parsed_keys["precursor_indices"],
+                    self.quad_mz_values,
+                    self.precursor_indices,
+                ),
+                frame_slices=np.maximum(parsed_keys["frame_indices"], 0),
+                scan_slices=np.maximum(parsed_keys["scan_indices"], 0),
+                tof_slices=parsed_keys["tof_indices"],
+                intensity_slices=parsed_keys["intensity_values"],
+                scan_max_index=self.scan_max_index,
+                raw_quad_indptr=self.raw_quad_indptr,
+                push_indptr=self.push_indptr,
+                intensities=self.intensity_values,
+                **self._get_tof_arrays(),
+            )
+        return filter_indices(
             frame_slices=parsed_keys["frame_indices"],
             scan_slices=parsed_keys["scan_indices"],
             precursor_slices=parsed_keys["precursor_indices"],
@@ -1439,13 +3120,277 @@ class TimsTOF(object):
             precursor_indices=self.precursor_indices,
             quad_mz_values=self.quad_mz_values,
             quad_indptr=self.quad_indptr,
-            tof_indices=self.tof_indices,
-            intensities=self.intensity_values
+            intensities=self.intensity_values,
+            **self._get_tof_arrays(),
         )
-        if as_dataframe:
-            return self.as_dataframe(raw_indices)
+
+    def explain(self, keys) -> dict:
+        """Report how data[keys] is filtered and what it is estimated to cost.
+
+        Parameters
+        ----------
+        keys : tuple
+            Any key that can be used to slice this object (see data[...]).
+
+        Returns
+        -------
+        dict
+            The chosen "strategy" and its "estimated_cost" (in number of
+            pushes and detector events that need to be visited),
+            the estimated "costs" of all applicable strategies,
+            the "push_count" and "quad_fraction" (the fraction of
+            pushes in valid quad segments) on which costs are based
+            and the "estimated_hit_count"
+            (see alphatims.bruker.TimsTOF.estimate_strike_count).
+            Possible strategies are:
+                - "frame_ranges": complete frames are selected.
+                - "push_ranges": complete pushes are selected.
+                - "push_major": all selected pushes are visited.
+                - "quad_major": only pushes of quad segments that satisfy
+                  quad and precursor slices are visited.
+                - "tof_index": only detector events within the tof
+                  slices are visited (see build_tof_index).
+        """
+        if not isinstance(keys, tuple):
+            keys = tuple([keys])
+        if isinstance(keys[-1], str):
+            keys = keys[:-1]
+        parsed_keys = parse_keys(self, keys)
+        plan = self._plan_parsed_keys(parsed_keys)
+        plan["estimated_hit_count"] = self.estimate_strike_count(
+            parsed_keys["frame_indices"],
+            parsed_keys["scan_indices"],
+            parsed_keys["precursor_indices"],
+            parsed_keys["tof_indices"],
+            parsed_keys["quad_values"],
+        )
+        return plan
+
+    def _plan_parsed_keys(self, parsed_keys: dict) -> dict:
+        """Estimate the cost of all strategies and select the cheapest.
+
+        Parameters
+        ----------
+        parsed_keys : dict
+            The parsed keys (see alphatims.bruker.parse_keys).
+
+        Returns
+        -------
+        dict
+            See alphatims.bruker.TimsTOF.explain.
+        """
+        counts = {}
+        for dimension, max_index in [
+            ("frame_indices", self.frame_max_index),
+            ("scan_indices", self.scan_max_index),
+        ]:
+            counts[dimension] = sum(
+                len(range(max(start, 0), min(stop, max_index), step)) for (
+                    start,
+                    stop,
+                    step,
+                ) in parsed_keys[dimension]
+            )
+        push_count = counts["frame_indices"] * counts["scan_indices"]
+        plan = {
+            "push_count": push_count,
+            "quad_fraction": 1.,
+        }
+        segment_start, segment_end = self._get_quad_segment_span(parsed_keys)
+        valid_segments = filter_quad_segments(
+            segment_start,
+            segment_end,
+            parsed_keys["quad_values"],
+            parsed_keys["precursor_indices"],
+            self.quad_mz_values,
+            self.precursor_indices,
+        )
+        raw_quad_indptr = self.raw_quad_indptr
+        span_push_count = (
+            raw_quad_indptr[segment_end] - raw_quad_indptr[segment_start]
+        )
+        if span_push_count > 0:
+            plan["quad_fraction"] = float(
+                np.sum(
+                    raw_quad_indptr[valid_segments + 1]
+                    - raw_quad_indptr[valid_segments]
+                ) / span_push_count
+            )
+        if self._is_frame_only_query(parsed_keys):
+            costs = {"frame_ranges": counts["frame_indices"]}
+        elif self._is_push_only_query(parsed_keys):
+            costs = {"push_ranges": push_count}
         else:
-            return raw_indices
+            # NOTE: Only metadata is used, so that a LazyTimsTOF can be
+            # planned without decoding any frame
+            events_per_push = len(self) / max(
+                self.frame_max_index * self.scan_max_index,
+                1
+            )
+            # NOTE: galloping over tof_indices only visits a few detector
+            # events per tof slice
+            push_cost = min(
+                events_per_push,
+                1 + 2 * len(parsed_keys["tof_indices"]) * np.log2(
+                    1 + events_per_push
+                )
+            )
+            valid_push_count = push_count * plan["quad_fraction"]
+            costs = {
+                "push_major": push_count + valid_push_count * push_cost,
+                "quad_major": (segment_end - segment_start) + (
+                    valid_push_count * (1 + push_cost)
+                ),
+            }
+            if self.has_tof_index:
+                costs["tof_index"] = self._count_tof_index_candidates(
+                    parsed_keys
+                )
+        strategy = min(costs, key=costs.get)
+        plan["strategy"] = strategy
+        plan["estimated_cost"] = costs[strategy]
+        plan["costs"] = costs
+        return plan
+
+    def _get_quad_segment_span(self, parsed_keys: dict) -> tuple:
+        frame_slices = parsed_keys["frame_indices"]
+        if len(frame_slices) == 0:
+            return 0, 0
+        first_frame = min(max(int(np.min(frame_slices[:, 0])), 0), (
+            self.frame_max_index
+        ))
+        last_frame = min(max(int(np.max(frame_slices[:, 1])), 0), (
+            self.frame_max_index
+        ))
+        raw_quad_indptr = self.raw_quad_indptr
+        segment_start = max(
+            np.searchsorted(
+                raw_quad_indptr,
+                first_frame * self.scan_max_index,
+                "right"
+            ) - 1,
+            0
+        )
+        segment_end = max(
+            np.searchsorted(
+                raw_quad_indptr,
+                last_frame * self.scan_max_index,
+                "left"
+            ),
+            segment_start
+        )
+        return int(segment_start), int(
+            min(segment_end, len(raw_quad_indptr) - 1)
+        )
+
+    def _get_tof_arrays(self) -> dict:
+        if self.is_compact:
+            return {
+                "tof_indices": np.empty(0, dtype=np.uint32),
+                "push_tof_offsets": self._push_tof_offsets,
+                "tof_deltas": self._tof_deltas,
+                "tof_delta_overflow_indices": self._tof_delta_overflow_indices,
+                "tof_delta_overflow_values": self._tof_delta_overflow_values,
+            }
+        return {
+            "tof_indices": self.tof_indices,
+            "push_tof_offsets": None,
+            "tof_deltas": None,
+            "tof_delta_overflow_indices": None,
+            "tof_delta_overflow_values": None,
+        }
+
+    def _filter_parsed_keys_as_ranges(self, parsed_keys: dict) -> np.ndarray:
+        if self._is_frame_only_query(parsed_keys):
+            return filter_frame_ranges(
+                parsed_keys["frame_indices"],
+                self.frame_max_index,
+                self.scan_max_index,
+                self.push_indptr,
+            )
+        if self._is_push_only_query(parsed_keys):
+            return filter_push_ranges(
+                frame_slices=parsed_keys["frame_indices"],
+                scan_slices=parsed_keys["scan_indices"],
+                precursor_slices=parsed_keys["precursor_indices"],
+                quad_slices=parsed_keys["quad_values"],
+                frame_max_index=self.frame_max_index,
+                scan_max_index=self.scan_max_index,
+                push_indptr=self.push_indptr,
+                precursor_indices=self.precursor_indices,
+                quad_mz_values=self.quad_mz_values,
+                quad_indptr=self.quad_indptr,
+            )
+        return compress_raw_indices(
+            np.asarray(self._filter_parsed_keys(parsed_keys), dtype=np.int64)
+        )
+
+    def _count_tof_index_candidates(self, parsed_keys: dict) -> int:
+        candidate_count = 0
+        tof_index_indptr = self._tof_index_indptr
+        for tof_start, tof_stop, tof_step in parsed_keys["tof_indices"]:
+            tof_start = min(max(tof_start, 0), len(tof_index_indptr) - 1)
+            tof_stop = min(max(tof_stop, 0), len(tof_index_indptr) - 1)
+            candidate_count += (
+                tof_index_indptr[tof_stop] - tof_index_indptr[tof_start]
+            ) // tof_step
+        return int(candidate_count)
+
+    def _is_push_only_query(self, parsed_keys: dict) -> bool:
+        """Check if the tof and intensity dimensions select everything.
+
+        Parameters
+        ----------
+        parsed_keys : dict
+            The parsed keys (see alphatims.bruker.parse_keys).
+
+        Returns
+        -------
+        bool
+            True if all detector events of the selected pushes are hits.
+        """
+        tof_slices = parsed_keys["tof_indices"]
+        if (len(tof_slices) != 1) or (tof_slices[0, 0] > 0) or (
+            tof_slices[0, 1] < self.tof_max_index
+        ) or (tof_slices[0, 2] != 1):
+            return False
+        intensity_slices = parsed_keys["intensity_values"]
+        if (len(intensity_slices) != 1) or (
+            intensity_slices[0, 0] > self.intensity_min_value
+        ) or (intensity_slices[0, 1] < self.intensity_max_value):
+            return False
+        return True
+
+    def _is_frame_only_query(self, parsed_keys: dict) -> bool:
+        """Check if all dimensions except frames select everything.
+
+        Parameters
+        ----------
+        parsed_keys : dict
+            The parsed keys (see alphatims.bruker.parse_keys).
+
+        Returns
+        -------
+        bool
+            True if all detector events of the selected frames are hits.
+        """
+        if not self._is_push_only_query(parsed_keys):
+            return False
+        for dimension, max_index in [
+            ("scan_indices", self.scan_max_index),
+            ("precursor_indices", self.precursor_max_index),
+        ]:
+            int_slices = parsed_keys[dimension]
+            if (len(int_slices) != 1) or (int_slices[0, 0] > 0) or (
+                int_slices[0, 1] < max_index
+            ) or (int_slices[0, 2] != 1):
+                return False
+        quad_slices = parsed_keys["quad_values"]
+        if (len(quad_slices) != 1) or (quad_slices[0, 0] != -np.inf) or (
+            quad_slices[0, 1] != np.inf
+        ):
+            return False
+        return True
 
     def estimate_strike_count(
         self,
@@ -1536,17 +3481,32 @@ class TimsTOF(object):
         estimated_count *= fragment_multiplier
         return int(estimated_count)
 
-    def bin_intensities(self, indices: np.ndarray, axis: tuple):
+    def bin_intensities(
+        self,
+        indices: np.ndarray,
+        axis: tuple,
+        tof_bin_size: int = 1,
+    ):
         """Sum and project the intensities of the indices along 1 or 2 axis.
 
         Parameters
         ----------
-        indices : np.int64[:]
+        indices : np.int64[:], np.int64[:, 2]
             The selected indices whose coordinates need to be summed along
             the selected axis.
+            Alternatively, (start, end) ranges of raw indices
+            (e.g. from data[..., "ranges"]) can be provided,
+            which are binned without expanding them to individual indices.
+            If these ranges only contain complete frames and intensity
+            pyramids are available (see build_intensity_pyramids),
+            the projection is directly retrieved from these pyramids.
         axis : tuple
             Must be length 1 or 2 and can only contain the elements
             "rt_values", "mobility_values" and "mz_values".
+        tof_bin_size : int
+            The number of consecutive tof indices that are summed in a
+            single "mz_values" bin.
+            Default is 1.
 
         Returns
         -------
@@ -1554,18 +3514,65 @@ class TimsTOF(object):
             An array or heatmap that express the summed intensity along
             the selected axis.
         """
-        intensities = self.intensity_values[indices].astype(np.float64)
+        tof_bin_count = -(-self.tof_max_index // tof_bin_size)
         max_index = {
             "rt_values": self.frame_max_index,
             "mobility_values": self.scan_max_index,
-            "mz_values": self.tof_max_index,
+            "mz_values": tof_bin_count,
         }
+        if np.ndim(indices) == 2:
+            indices = np.asarray(indices, dtype=np.int64)
+            if self.has_intensity_pyramids:
+                binned_intensities = self._bin_intensities_from_pyramids(
+                    indices,
+                    axis,
+                    tof_bin_size,
+                )
+                if binned_intensities is not None:
+                    return binned_intensities
+        if (np.ndim(indices) == 2) and isinstance(
+            self._tof_indices,
+            np.ndarray
+        ):
+            dimensions = {
+                "rt_values": 0,
+                "mobility_values": 1,
+                "mz_values": 2,
+            }
+            binned_intensities = np.zeros(
+                tuple([max_index[ax] for ax in axis])
+            )
+            bin_raw_ranges(
+                indices,
+                self.push_indptr,
+                self.scan_max_index,
+                self.tof_indices,
+                self.intensity_values,
+                np.array([dimensions[ax] for ax in axis], dtype=np.int64),
+                np.array(
+                    [
+                        self.frame_max_index,
+                        self.scan_max_index,
+                        tof_bin_count,
+                    ],
+                    dtype=np.int64
+                ),
+                binned_intensities.reshape(-1),
+                tof_bin_size,
+            )
+            return binned_intensities
         parsed_indices = self.convert_from_indices(
             indices,
             return_frame_indices="rt_values" in axis,
             return_scan_indices="mobility_values" in axis,
             return_tof_indices="mz_values" in axis,
+            return_intensity_values=True,
         )
+        if ("mz_values" in axis) and (tof_bin_size != 1):
+            parsed_indices["tof_indices"] = (
+                parsed_indices["tof_indices"] // tof_bin_size
+            )
+        intensities = parsed_indices["intensity_values"].astype(np.float64)
         binned_intensities = np.zeros(tuple([max_index[ax] for ax in axis]))
         parse_dict = {
             "rt_values": "frame_indices",
@@ -1573,7 +3580,7 @@ class TimsTOF(object):
             "mz_values": "tof_indices",
         }
         add_intensity_to_bin(
-            range(indices.size),
+            range(len(intensities)),
             intensities,
             tuple(
                 [
@@ -1584,16 +3591,280 @@ class TimsTOF(object):
         )
         return binned_intensities
 
-    def as_dataframe(
+    def _bin_intensities_from_pyramids(
         self,
-        indices: np.ndarray,
-        *,
-        raw_indices: bool = True,
-        frame_indices: bool = True,
-        scan_indices: bool = True,
-        quad_indices: bool = False,
-        tof_indices: bool = True,
-        precursor_indices: bool = True,
+        raw_ranges: np.ndarray,
+        axis: tuple,
+        tof_bin_size: int,
+    ):
+        frame_indptr = self.push_indptr[::self.scan_max_index]
+        range_starts = np.searchsorted(frame_indptr, raw_ranges[:, 0])
+        range_ends = np.searchsorted(frame_indptr, raw_ranges[:, 1])
+        if np.any(range_ends >= len(frame_indptr)) or not (
+            np.array_equal(frame_indptr[range_starts], raw_ranges[:, 0]) and
+            np.array_equal(frame_indptr[range_ends], raw_ranges[:, 1])
+        ):
+            return None
+        frame_selection = np.zeros(self.frame_max_index + 1, dtype=np.int64)
+        np.add.at(frame_selection, range_starts, 1)
+        np.add.at(frame_selection, range_ends, -1)
+        frame_selection = np.cumsum(frame_selection[:-1]) > 0
+        pyramids = self._intensity_pyramids
+        if "mz_values" in axis:
+            pyramid_tof_bin_sizes = [
+                pyramid_tof_bin_size for pyramid_tof_bin_size in (
+                    pyramids["tof_bin_sizes"]
+                ) if tof_bin_size % pyramid_tof_bin_size == 0
+            ]
+            if len(pyramid_tof_bin_sizes) == 0:
+                return None
+            pyramid_tof_bin_size = int(max(pyramid_tof_bin_sizes))
+            tof_bin_merge_count = tof_bin_size // pyramid_tof_bin_size
+            tof_bin_count = -(-self.tof_max_index // tof_bin_size)
+        if "mz_values" not in axis:
+            pyramid = pyramids["frame_scan"]
+            pyramid_axis = ("rt_values", "mobility_values")
+        elif "mobility_values" in axis:
+            frame_intensities = pyramids["frame_scan"].sum(axis=1)
+            if np.any(frame_intensities[~frame_selection] > 0):
+                return None
+            pyramid = pyramids[f"scan_tof_{pyramid_tof_bin_size}"]
+            pyramid_axis = ("mobility_values", "mz_values")
+        else:
+            pyramid = pyramids[f"frame_tof_{pyramid_tof_bin_size}"]
+            pyramid_axis = ("rt_values", "mz_values")
+        if pyramid_axis[0] == "rt_values":
+            pyramid = pyramid * frame_selection.reshape(-1, 1)
+        if "mz_values" in axis:
+            padded_pyramid = np.zeros(
+                (pyramid.shape[0], tof_bin_count * tof_bin_merge_count)
+            )
+            column_count = min(padded_pyramid.shape[1], pyramid.shape[1])
+            padded_pyramid[:, :column_count] = pyramid[:, :column_count]
+            pyramid = padded_pyramid.reshape(
+                pyramid.shape[0],
+                tof_bin_count,
+                tof_bin_merge_count,
+            ).sum(axis=2)
+        for summed_axis, pyramid_ax in enumerate(pyramid_axis):
+            if pyramid_ax not in axis:
+                return pyramid.sum(axis=summed_axis)
+        if axis[0] != pyramid_axis[0]:
+            return pyramid.T.copy()
+        return pyramid
+
+    @property
+    def has_intensity_pyramids(self):
+        """: bool : If precomputed intensity pyramids are available."""
+        return getattr(self, "_intensity_pyramids", None) is not None
+
+    def build_intensity_pyramids(
+        self,
+        tof_bin_sizes: tuple = (2**10, 2**12, 2**14),
+    ) -> None:
+        """Precompute summed intensities for fast coarse projections.
+
+        A frame x scan array and frame x tof bin and scan x tof bin arrays
+        for each tof bin size are stored.
+        Once available, bin_intensities directly uses these pyramids
+        for (start, end) ranges that only contain complete frames
+        (e.g. from data[rt_slice, "ranges"]) with a tof_bin_size that is a
+        multiple of a pyramid tof bin size.
+        The pyramids are included when saving as HDF.
+
+        Parameters
+        ----------
+        tof_bin_sizes : tuple
+            The number of consecutive tof indices in a single tof bin
+            for each level of the pyramid.
+            Each size needs to be a multiple of the smallest size.
+            Default is (2**10, 2**12, 2**14).
+        """
+        logging.info(
+            f"Building intensity pyramids of {self.bruker_d_folder_name}"
+        )
+        tof_bin_sizes = np.sort(np.array(tof_bin_sizes, dtype=np.int64))
+        base_tof_bin_size = int(tof_bin_sizes[0])
+        if np.any(tof_bin_sizes % base_tof_bin_size != 0):
+            raise ValueError(
+                f"Tof bin sizes {tof_bin_sizes} are not all a multiple of "
+                f"{base_tof_bin_size}."
+            )
+        tof_indices = self.tof_indices
+        tof_count = self.tof_max_index
+        if len(tof_indices) > 0:
+            tof_count = max(tof_count, int(np.max(tof_indices)) + 1)
+        tof_bin_count = -(-tof_count // base_tof_bin_size)
+        chunk_count = alphatims.utils.MAX_THREADS
+        chunk_indptr = np.linspace(
+            0,
+            self.frame_max_index,
+            chunk_count + 1
+        ).astype(np.int64)
+        frame_scan = np.zeros((self.frame_max_index, self.scan_max_index))
+        frame_tof = np.zeros((self.frame_max_index, tof_bin_count))
+        scan_tof_chunks = np.zeros(
+            (chunk_count, self.scan_max_index, tof_bin_count)
+        )
+        fill_intensity_pyramid_chunk(
+            range(chunk_count),
+            chunk_indptr,
+            self.scan_max_index,
+            self.push_indptr,
+            tof_indices,
+            self.intensity_values,
+            base_tof_bin_size,
+            frame_scan,
+            frame_tof,
+            scan_tof_chunks,
+        )
+        scan_tof = scan_tof_chunks.sum(axis=0)
+        del scan_tof_chunks
+        pyramids = {
+            "tof_bin_sizes": tof_bin_sizes,
+            "frame_scan": frame_scan,
+        }
+        for tof_bin_size in tof_bin_sizes:
+            merge_count = tof_bin_size // base_tof_bin_size
+            merged_bin_count = -(-tof_bin_count // merge_count)
+            for name, pyramid in (
+                ("frame_tof", frame_tof),
+                ("scan_tof", scan_tof),
+            ):
+                merged_pyramid = np.zeros(
+                    (pyramid.shape[0], merged_bin_count * merge_count)
+                )
+                merged_pyramid[:, :tof_bin_count] = pyramid
+                pyramids[f"{name}_{tof_bin_size}"] = merged_pyramid.reshape(
+                    pyramid.shape[0],
+                    merged_bin_count,
+                    merge_count
+                ).sum(axis=2)
+        self._intensity_pyramids = pyramids
+
+    def extract_batch(self, queries) -> np.ndarray:
+        """Extract summed intensity traces (XICs) of many query boxes.
+
+        All queries are converted to indices at once, sorted by frame and
+        tof index and extracted in parallel.
+        This avoids parsing keys and filtering raw indices for each query.
+
+        Parameters
+        ----------
+        queries : np.ndarray, pd.DataFrame, dict
+            A structured array (or dataframe or dict of arrays) with a query
+            box per row and the fields "rt_low", "rt_high",
+            "mobility_low", "mobility_high", "mz_low" and "mz_high".
+            Optionally, "quad_low" and "quad_high" can be provided
+            to only include pushes whose quad overlaps with these values
+            (e.g. -1 for both to only include MS1 pushes).
+            Boundaries are interpreted as data[rt_low: rt_high, ...].
+
+        Returns
+        -------
+        np.float64[:, :]
+            An array with a row per query and a column per frame,
+            containing the summed intensity of each query in each frame.
+        """
+        query_count = len(queries["rt_low"])
+        frame_slices = np.stack(
+            [
+                self.convert_to_indices(
+                    queries[bound],
+                    return_frame_indices=True,
+                ) for bound in ("rt_low", "rt_high")
+            ],
+            axis=1
+        ).astype(np.int64)
+        scan_slices = np.stack(
+            [
+                self.convert_to_indices(
+                    queries[bound],
+                    return_scan_indices=True,
+                ) for bound in ("mobility_high", "mobility_low")
+            ],
+            axis=1
+        ).astype(np.int64)
+        tof_slices = np.stack(
+            [
+                self.convert_to_indices(
+                    queries[bound],
+                    return_tof_indices=True,
+                ) for bound in ("mz_low", "mz_high")
+            ],
+            axis=1
+        ).astype(np.int64)
+        if isinstance(queries, np.ndarray):
+            field_names = queries.dtype.names
+        else:
+            field_names = queries.keys()
+        quad_slices = np.empty((query_count, 2), dtype=np.float64)
+        for i, (bound, default) in enumerate(
+            [("quad_low", -np.inf), ("quad_high", np.inf)]
+        ):
+            if bound in field_names:
+                quad_slices[:, i] = queries[bound]
+            else:
+                quad_slices[:, i] = default
+        return self._extract_query_slices(
+            frame_slices,
+            scan_slices,
+            tof_slices,
+            quad_slices,
+        )
+
+    def _extract_query_slices(
+        self,
+        frame_slices: np.ndarray,
+        scan_slices: np.ndarray,
+        tof_slices: np.ndarray,
+        quad_slices: np.ndarray,
+    ) -> np.ndarray:
+        xics = np.zeros((len(frame_slices), self.frame_max_index))
+        frame_slices = np.clip(frame_slices, 0, self.frame_max_index)
+        scan_slices = np.clip(scan_slices, 0, self.scan_max_index)
+        query_order = np.lexsort((tof_slices[:, 0], frame_slices[:, 0]))
+        tof_arrays = self._get_tof_arrays()
+        extract_query_intensities(
+            range(len(query_order)),
+            query_order,
+            frame_slices,
+            scan_slices,
+            tof_slices,
+            quad_slices,
+            self.scan_max_index,
+            self.push_indptr,
+            self.quad_mz_values,
+            self.quad_indptr,
+            tof_arrays["tof_indices"],
+            self.intensity_values,
+            tof_arrays["push_tof_offsets"],
+            tof_arrays["tof_deltas"],
+            tof_arrays["tof_delta_overflow_indices"],
+            tof_arrays["tof_delta_overflow_values"],
+            self._get_max_push_size(),
+            xics,
+        )
+        return xics
+
+    def _get_max_push_size(self) -> int:
+        # NOTE: Cached until new detector events are indexed
+        if getattr(self, "_max_push_size", None) is None:
+            self._max_push_size = int(
+                np.max(np.diff(self.push_indptr), initial=0)
+            )
+        return self._max_push_size
+
+    def as_dataframe(
+        self,
+        indices: np.ndarray,
+        *,
+        raw_indices: bool = True,
+        frame_indices: bool = True,
+        scan_indices: bool = True,
+        quad_indices: bool = False,
+        tof_indices: bool = True,
+        precursor_indices: bool = True,
         rt_values: bool = True,
         rt_values_min: bool = True,
         mobility_values: bool = True,
@@ -1602,13 +3873,17 @@ class TimsTOF(object):
         mz_values: bool = True,
         intensity_values: bool = True,
         raw_indices_sorted: bool = True,
+        columns: list = None,
+        lazy: bool = False,
     ):
         """Convert raw indices to a pd.DataFrame.
 
         Parameters
         ----------
-        indices : np.int64[:]
+        indices : np.int64[:], np.int64[:, 2]
             The raw indices for which coordinates need to be retrieved.
+            Alternatively, (start, end) ranges of raw indices
+            (e.g. from data[..., "ranges"]) can be provided.
         raw_indices : bool
             If True, include "raw_indices" in the dataframe.
             Default is True.
@@ -1653,45 +3928,67 @@ class TimsTOF(object):
             If True, raw_indices are assumed to be sorted,
             resulting in a faster conversion.
             Default is True.
+        columns : list
+            The names of the columns to include
+            (see alphatims.bruker.LazyDataFrame.COLUMNS).
+            If provided, all boolean column flags are ignored.
+            Default is None.
+        lazy : bool
+            If True, an alphatims.bruker.LazyDataFrame is returned,
+            which only converts columns when they are accessed.
+            Default is False.
 
         Returns
         -------
-        pd.DataFrame
+        pd.DataFrame, alphatims.bruker.LazyDataFrame
             A dataframe with all requested columns.
         """
-        return pd.DataFrame(
-           self.convert_from_indices(
-                indices,
-                return_raw_indices=raw_indices,
-                return_frame_indices=frame_indices,
-                return_scan_indices=scan_indices,
-                return_quad_indices=quad_indices,
-                return_precursor_indices=precursor_indices,
-                return_tof_indices=tof_indices,
-                return_rt_values=rt_values,
-                return_rt_values_min=rt_values_min,
-                return_mobility_values=mobility_values,
-                return_quad_mz_values=quad_mz_values,
-                return_push_indices=push_indices,
-                return_mz_values=mz_values,
-                return_intensity_values=intensity_values,
-                raw_indices_sorted=raw_indices_sorted,
-            )
+        if columns is None:
+            column_flags = {
+                "raw_indices": raw_indices,
+                "frame_indices": frame_indices,
+                "scan_indices": scan_indices,
+                "quad_indices": quad_indices,
+                "precursor_indices": precursor_indices,
+                "push_indices": push_indices,
+                "tof_indices": tof_indices,
+                "rt_values": rt_values,
+                "rt_values_min": rt_values_min,
+                "mobility_values": mobility_values,
+                "quad_low_mz_values": quad_mz_values,
+                "quad_high_mz_values": quad_mz_values,
+                "mz_values": mz_values,
+                "intensity_values": intensity_values,
+            }
+            columns = [
+                column for column, selected in column_flags.items() if (
+                    selected
+                )
+            ]
+        lazy_dataframe = LazyDataFrame(
+            self,
+            indices,
+            columns,
+            raw_indices_sorted=raw_indices_sorted,
         )
+        if lazy:
+            return lazy_dataframe
+        return lazy_dataframe.to_pandas()
 
     def _parse_quad_indptr(self) -> None:
         logging.info("Indexing quadrupole dimension")
-        frame_ids = self.fragment_frames.Frame.values + 1
-        scan_begins = self.fragment_frames.ScanNumBegin.values
-        scan_ends = self.fragment_frames.ScanNumEnd.values
-        isolation_mzs = self.fragment_frames.IsolationMz.values
-        isolation_widths = self.fragment_frames.IsolationWidth.values
-        precursors = self.fragment_frames.Precursor.values
+        fragment_frames = self._fragment_frames
+        frame_ids = np.asarray(fragment_frames["Frame"]) + 1
+        scan_begins = np.asarray(fragment_frames["ScanNumBegin"])
+        scan_ends = np.asarray(fragment_frames["ScanNumEnd"])
+        isolation_mzs = np.asarray(fragment_frames["IsolationMz"])
+        isolation_widths = np.asarray(fragment_frames["IsolationWidth"])
+        precursors = np.asarray(fragment_frames["Precursor"])
         if (precursors[0] is None):
             if self.zeroth_frame:
-                frame_groups = self.frames.MsMsType.values[1:]
+                frame_groups = np.asarray(self._frames["MsMsType"])[1:]
             else:
-                frame_groups = self.frames.MsMsType.values
+                frame_groups = np.asarray(self._frames["MsMsType"])
             precursor_frames = np.flatnonzero(frame_groups == 0)
             group_sizes = np.diff(precursor_frames)
             group_size = group_sizes[0]
@@ -1700,7 +3997,7 @@ class TimsTOF(object):
             precursors = (1 + frame_ids - frame_ids[0]) % group_size
             if self.zeroth_frame:
                 precursors[0] = 0
-            self.fragment_frames.Precursor = precursors
+            fragment_frames["Precursor"] = precursors
             self._acquisition_mode = "diaPASEF"
         scan_max_index = self.scan_max_index
         frame_max_index = self.frame_max_index
@@ -1745,7 +4042,6 @@ class TimsTOF(object):
         self._quad_mz_values = np.stack([quad_low_values, quad_high_values]).T
         self._precursor_indices = np.array(precursor_indices)
         self._raw_quad_indptr = np.array(quad_indptr)
-        self._quad_indptr = self.push_indptr[self._raw_quad_indptr]
         self._quad_max_mz_value = np.max(self.quad_mz_values[:, 1])
         self._quad_min_mz_value = np.min(
             self.quad_mz_values[
@@ -2040,15 +4336,16 @@ class TimsTOF(object):
         calibrant1_upper_mobility = calibrant1[1] + mobility_tolerance
         calibrant1_tof = np.argmax(
             np.bincount(
-                self.tof_indices[
+                self.convert_from_indices(
                     self[
                         :,
                         calibrant1_lower_mobility: calibrant1_upper_mobility,
                         calibrant1[2],
                         calibrant1_lower_mz: calibrant1_upper_mz,
                         "raw"
-                    ]
-                ]
+                    ],
+                    return_tof_indices=True,
+                )["tof_indices"]
             )
         )
         calibrant2_lower_mz = calibrant2[0] - mz_tolerance
@@ -2057,15 +4354,16 @@ class TimsTOF(object):
         calibrant2_upper_mobility = calibrant2[1] + mobility_tolerance
         calibrant2_tof = np.argmax(
             np.bincount(
-                self.tof_indices[
+                self.convert_from_indices(
                     self[
                         :,
                         calibrant2_lower_mobility: calibrant2_upper_mobility,
                         calibrant2[2],
                         calibrant2_lower_mz: calibrant2_upper_mz,
                         "raw"
-                    ]
-                ]
+                    ],
+                    return_tof_indices=True,
+                )["tof_indices"]
             )
         )
         tof_slope = (
@@ -2110,185 +4408,2165 @@ class TimsTOF(object):
                     calibrant2=(1221.990637, 1.3820, ms_level),
                     mz_tolerance=1
                 )
+        if use_calibrated_mz_values != getattr(
+            self,
+            "_use_calibrated_mz_values_as_default",
+            use_calibrated_mz_values
+        ):
+            self.clear_result_cache()
         self._use_calibrated_mz_values_as_default = use_calibrated_mz_values
 
 
-class PrecursorFloatError(TypeError):
-    """Used to indicate that a precursor value is not an int but a float."""
-    pass
-
+class LazyTimsTOF(TimsTOF):
+    """A TimsTOF object that only decodes frames when they are sliced.
 
-@alphatims.utils.pjit(
-    signature_or_function="void(i8,i8[:],i8[:],i8[:],u4[:],u2[:],u4[:],f8[:],i8[:],i8[:])"
-)
-def set_precursor(
-    precursor_index: int,
-    offset_order: np.ndarray,
-    precursor_offsets: np.ndarray,
-    quad_indptr: np.ndarray,
-    tof_indices: np.ndarray,
-    intensities: np.ndarray,
-    spectrum_tof_indices: np.ndarray,
-    spectrum_intensity_values: np.ndarray,
-    spectrum_indptr: np.ndarray,
-    spectrum_counts: np.ndarray,
-) -> None:
-    """Sum the intensities of all pushes belonging to a single precursor.
+    Upon creation, only the SQL metadata of a Bruker .d folder is read.
+    Frames are decoded from the "analysis.tdf_bin" when they are touched
+    by a slice or by alphatims.bruker.LazyTimsTOF.convert_from_indices.
+    Decoded frames are kept in a least-recently-used cache,
+    so that repeated slicing of the same frames does not require
+    decoding again.
 
-    IMPORTANT NOTE: This function is decorated with alphatims.utils.pjit.
-    The first argument is thus expected to be provided as an iterable
-    containing ints instead of a single int.
+    Slicing works identical as for a TimsTOF object and raw indices are
+    equal to those of a fully loaded TimsTOF object.
+    However, the push_indptr, quad_indptr, tof_indices and intensity_values
+    arrays are not available, as they are never fully decoded.
 
-    Parameters
-    ----------
-    precursor_index : int
-        The precursor index indicating which MS2 spectrum to determine.
-    offset_order : np.int64[:]
-        The order of self.precursor_indices, obtained with np.argsort.
-    precursor_offsets : np.int64[:]
-        An index pointer array for precursor offsets.
-    quad_indptr : np.int64[:]
-        The self.quad_indptr array of a TimsTOF object.
-    tof_indices : np.uint32[:]
-        The self.tof_indices array of a TimsTOF object.
-    intensities : np.uint16[:]
-        The self.intensity_values array of a TimsTOF object.
-    spectrum_tof_indices : np.uint32[:]
-        A buffer array to store tof indices of the new spectrum.
-    spectrum_intensity_values : np.float64[:]
-        A buffer array to store intensity values of the new spectrum.
-    spectrum_indptr : np.int64[:]
-        An index pointer array defining the original spectrum boundaries.
-    spectrum_counts : np. int64[:]
-        An buffer array defining how many distinct tof indices the new
-        spectrum has.
+    Alternatively, an .hdf file exported by AlphaTims can be used.
+    In this case, all metadata and index arrays such as the push_indptr
+    and quad_indptr are read upon creation, while the tof_indices (or tof
+    deltas of a compact TimsTOF object) and intensity_values remain
+    h5py.Datasets on disk from which only the frames that are touched
+    are read.
     """
-    offset = spectrum_indptr[precursor_index]
-    precursor_offset_lower = precursor_offsets[precursor_index]
-    precursor_offset_upper = precursor_offsets[precursor_index + 1]
-    selected_offsets = offset_order[
-        precursor_offset_lower: precursor_offset_upper
-    ]
-    starts = quad_indptr[selected_offsets]
-    ends = quad_indptr[selected_offsets + 1]
-    offset_index = offset
-    for start, end in zip(starts, ends):
-        spectrum_tof_indices[
-            offset_index: offset_index + end - start
-        ] = tof_indices[start: end]
-        spectrum_intensity_values[
-            offset_index: offset_index + end - start
-            ] = intensities[start: end]
-        offset_index += end - start
-    offset_end = spectrum_indptr[precursor_index + 1]
-    order = np.argsort(spectrum_tof_indices[offset: offset_end])
-    current_index = offset - 1
-    previous_tof_index = -1
-    for tof_index, intensity in zip(
-        spectrum_tof_indices[offset: offset_end][order],
-        spectrum_intensity_values[offset: offset_end][order],
+
+    def __init__(
+        self,
+        bruker_d_folder_name: str,
+        *,
+        mz_estimation_from_frame: int = 1,
+        mobility_estimation_from_frame: int = 1,
+        slice_as_dataframe: bool = True,
+        use_calibrated_mz_values_as_default: int = 0,
+        max_cached_frames: int = 1000,
+        max_cached_result_bytes: int = 0,
     ):
-        if tof_index != previous_tof_index:
-            current_index += 1
-            spectrum_tof_indices[current_index] = tof_index
-            spectrum_intensity_values[current_index] = intensity
-            previous_tof_index = tof_index
-        else:
-            spectrum_intensity_values[current_index] += intensity
-    spectrum_tof_indices[current_index + 1: offset_end] = 0
-    spectrum_intensity_values[current_index + 1: offset_end] = 0
-    spectrum_counts[precursor_index] = current_index + 1 - offset
+        """Create a Bruker LazyTimsTOF object that only reads metadata.
 
+        Parameters
+        ----------
+        bruker_d_folder_name : str
+            The full file name to a Bruker .d folder.
+            Alternatively, the full file name of an already exported .hdf
+            can be provided as well.
+        mz_estimation_from_frame : int
+            See alphatims.bruker.TimsTOF.
+            Default is 1.
+        mobility_estimation_from_frame : int
+            See alphatims.bruker.TimsTOF.
+            Default is 1.
+        slice_as_dataframe : bool
+            See alphatims.bruker.TimsTOF.
+            Default is True.
+        use_calibrated_mz_values_as_default : int
+            See alphatims.bruker.TimsTOF.
+            Note that calibration requires to decode all frames.
+            Default is 0.
+        max_cached_frames : int
+            The maximum number of decoded frames that are kept in memory.
+            Frames that were least recently used are discarded first.
+            Slices that touch a wider range of frames are decoded in
+            consecutive spans of at most max_cached_frames frames.
+            Default is 1000.
+        max_cached_result_bytes : int
+            See alphatims.bruker.TimsTOF.
+            Default is 0.
+        """
+        self._max_cached_frames = max_cached_frames
+        self._frame_cache = collections.OrderedDict()
+        super().__init__(
+            bruker_d_folder_name,
+            mz_estimation_from_frame=mz_estimation_from_frame,
+            mobility_estimation_from_frame=mobility_estimation_from_frame,
+            slice_as_dataframe=slice_as_dataframe,
+            use_calibrated_mz_values_as_default=(
+                use_calibrated_mz_values_as_default
+            ),
+            max_cached_result_bytes=max_cached_result_bytes,
+        )
 
-@alphatims.utils.pjit
-def centroid_spectra(
-    index: int,
-    spectrum_indptr: np.ndarray,
-    spectrum_counts: np.ndarray,
-    spectrum_tof_indices: np.ndarray,
-    spectrum_intensity_values: np.ndarray,
-    window_size: int,
-):
-    """Smoothen and centroid a profile spectrum (inplace operation).
+    def __len__(self):
+        return int(self._frame_indptr[-1])
 
-    IMPORTANT NOTE: This function will overwrite all input arrays.
+    @property
+    def max_cached_frames(self):
+        """: int : The maximum number of decoded frames kept in memory."""
+        return self._max_cached_frames
 
-    IMPORTANT NOTE: This function is decorated with alphatims.utils.pjit.
-    The first argument is thus expected to be provided as an iterable
-    containing ints instead of a single int.
+    @property
+    def cached_frame_count(self):
+        """: int : The number of decoded frames currently in memory."""
+        return len(self._frame_cache)
 
-    Parameters
-    ----------
-    index : int
-        The push index whose intensity_values and tof_indices will be
-        centroided.
-    spectrum_indptr : np.int64[:]
-        An index pointer array defining the (untrimmed) spectrum boundaries.
-    spectrum_counts : np. int64[:]
-        The original array defining how many distinct tof indices each
-        spectrum has.
-    spectrum_tof_indices : np.uint32[:]
-        The original array containing tof indices.
-    spectrum_intensity_values : np.float64[:]
-        The original array containing intensity values.
-    window_size : int
-        The window size to use for smoothing and centroiding peaks.
-    """
-    start = spectrum_indptr[index]
-    end = start + spectrum_counts[index]
-    if start == end:
-        return
-    mzs = spectrum_tof_indices[start: end]
-    ints = spectrum_intensity_values[start: end]
-    smooth_ints = ints.copy()
-    for i, self_mz in enumerate(mzs[:-1]):
-        for j in range(i + 1, len(mzs)):
-            other_mz = mzs[j]
-            diff = other_mz - self_mz + 1
-            if diff >= window_size:
-                break
-            smooth_ints[i] += ints[j] / diff
-            smooth_ints[j] += ints[i] / diff
-    pre_apex = True
-    maxima = [mzs[0]]
-    intensities = [ints[0]]
-    for i, self_mz in enumerate(mzs[1:], 1):
-        if self_mz > mzs[i - 1] + window_size:
-            maxima.append(mzs[i])
-            intensities.append(0)
-            pre_apex = True
-        elif pre_apex:
-            if smooth_ints[i] < smooth_ints[i - 1]:
-                pre_apex = False
-                maxima[-1] = mzs[i - 1]
-        elif smooth_ints[i] > smooth_ints[i - 1]:
-            maxima.append(mzs[i])
-            intensities.append(0)
-            pre_apex = True
-        intensities[-1] += ints[i]
-    spectrum_tof_indices[start: start + len(maxima)] = np.array(
-        maxima,
-        dtype=spectrum_tof_indices.dtype
-    )
-    spectrum_intensity_values[start: start + len(maxima)] = np.array(
-        intensities,
-        dtype=spectrum_intensity_values.dtype
+    def _import_data_from_hdf_file(
+        self,
+        bruker_d_folder_name: str,
+        mmap_detector_events: bool = False,
+    ):
+        with contextlib.suppress(ImportError):
+            # NOTE: Registers additional compression filters such as zstd
+            import hdf5plugin
+        # NOTE: The HDF file is closed once all its datasets are released
+        hdf_root = h5py.File(bruker_d_folder_name, "r")
+        self.__dict__.update(
+            alphatims.utils.create_dict_from_hdf_group(
+                hdf_root["raw"],
+                lazy_arrays=[
+                    "/raw/_tof_indices",
+                    "/raw/_intensity_values",
+                    "/raw/_tof_deltas",
+                ],
+            )
+        )
+        self._frame_indptr = self.push_indptr[::self.scan_max_index].copy()
+
+    def _get_cache_file_name(
+        self,
+        bruker_d_folder_name: str,
+        mz_estimation_from_frame: int,
+        mobility_estimation_from_frame: int,
+    ) -> str:
+        # NOTE: Detector events are never fully decoded and thus not cached
+        return None
+
+    def _import_detector_events_from_d_folder(
+        self,
+        bruker_d_folder_name: str,
+        mmap_detector_events: bool = False,
+    ):
+        num_peaks = np.asarray(self._frames["NumPeaks"])
+        self._frame_indptr = np.empty(len(num_peaks) + 1, np.int64)
+        self._frame_indptr[0] = 0
+        self._frame_indptr[1:] = np.cumsum(num_peaks)
+        self._push_indptr = None
+        self._tof_indices = None
+        self._intensity_values = None
+
+    def _index_detector_events(self) -> None:
+        self._quad_indptr = None
+        # NOTE: The minimum intensity is unknown without decoding all frames
+        self._intensity_min_value = 0
+        self._intensity_max_value = int(np.max(self._frames["MaxIntensity"]))
+
+    def _append_detector_events_from_d_folder(
+        self,
+        frame_ids: np.ndarray,
+    ) -> None:
+        self._frame_indptr = alphatims.utils.append_to_array(
+            self._frame_indptr,
+            np.cumsum(
+                np.asarray(self._frames["NumPeaks"])[frame_ids]
+            ) + self._frame_indptr[-1]
+        )
+        self._index_detector_events()
+
+    def _read_frames(self, frame_indices: np.ndarray) -> tuple:
+        if isinstance(self._intensity_values, h5py.Dataset):
+            if self.is_compact:
+                return read_hdf_frames(
+                    frame_indices,
+                    self.push_indptr,
+                    self.scan_max_index,
+                    self._tof_deltas,
+                    self._intensity_values,
+                    self._push_tof_offsets,
+                    self._tof_delta_overflow_indices,
+                    self._tof_delta_overflow_values,
+                )
+            return read_hdf_frames(
+                frame_indices,
+                self.push_indptr,
+                self.scan_max_index,
+                self._tof_indices,
+                self._intensity_values,
+            )
+        return read_bruker_frames(
+            frame_indices,
+            self._frames,
+            self.bruker_d_folder_name,
+            int(self.meta_data["TimsCompressionType"]),
+            int(self.meta_data["MaxNumPeaksPerScan"]),
+        )
+
+    def _cache_frames(self, frame_indices: np.ndarray) -> None:
+        missing_frames = np.array(
+            [
+                frame_index for frame_index in frame_indices if (
+                    frame_index not in self._frame_cache
+                )
+            ],
+            dtype=np.int64
+        )
+        for frame_index in frame_indices:
+            if frame_index in self._frame_cache:
+                self._frame_cache.move_to_end(frame_index)
+        if len(missing_frames) == 0:
+            return
+        logging.info(
+            f"Decoding {len(missing_frames):,} frames "
+            f"of {self.bruker_d_folder_name}"
+        )
+        (
+            frame_indptr,
+            scan_indptr,
+            tof_indices,
+            intensity_values,
+        ) = self._read_frames(missing_frames)
+        scan_counts = np.diff(scan_indptr).reshape(-1, self.scan_max_index)
+        for i, frame_index in enumerate(missing_frames):
+            start = frame_indptr[i]
+            end = frame_indptr[i + 1]
+            self._frame_cache[frame_index] = (
+                scan_counts[i].copy(),
+                tof_indices[start: end].copy(),
+                intensity_values[start: end].copy(),
+            )
+
+    def _trim_frame_cache(self) -> None:
+        while len(self._frame_cache) > self.max_cached_frames:
+            self._frame_cache.popitem(last=False)
+
+    def _load_frame_span(self, frame_indices: np.ndarray) -> TimsTOF:
+        """Create an in-memory TimsTOF object from a range of frames.
+
+        Parameters
+        ----------
+        frame_indices : np.int64[:]
+            The sorted and unique frame indices that need to be decoded.
+
+        Returns
+        -------
+        : alphatims.bruker.TimsTOF
+            A TimsTOF object whose frames are the frames from
+            frame_indices[0] to frame_indices[-1].
+            Frames that are not in frame_indices are empty.
+        """
+        self._cache_frames(frame_indices)
+        frame_offset = frame_indices[0]
+        frame_count = frame_indices[-1] + 1 - frame_offset
+        scan_max_index = self.scan_max_index
+        push_indptr = np.zeros(frame_count * scan_max_index + 1, np.int64)
+        push_counts = push_indptr[1:].reshape(frame_count, scan_max_index)
+        tof_indices = []
+        intensity_values = []
+        for frame_index in frame_indices:
+            (
+                scan_counts,
+                frame_tof_indices,
+                frame_intensity_values,
+            ) = self._frame_cache[frame_index]
+            push_counts[frame_index - frame_offset] = scan_counts
+            tof_indices.append(frame_tof_indices)
+            intensity_values.append(frame_intensity_values)
+        np.cumsum(push_indptr, out=push_indptr)
+        push_offset = frame_offset * scan_max_index
+        quad_start = np.searchsorted(
+            self.raw_quad_indptr,
+            push_offset,
+            "right"
+        ) - 1
+        quad_end = np.searchsorted(
+            self.raw_quad_indptr,
+            push_offset + frame_count * scan_max_index,
+            "left"
+        )
+        raw_quad_indptr = np.clip(
+            self.raw_quad_indptr[quad_start: quad_end + 1] - push_offset,
+            0,
+            frame_count * scan_max_index
+        )
+        frame_span = TimsTOF.__new__(TimsTOF)
+        frame_span.__dict__ = dict(self.__dict__)
+        frame_span._frame_max_index = frame_count
+        frame_span._rt_values = self.rt_values[
+            frame_offset: frame_offset + frame_count
+        ]
+        frame_span._push_indptr = push_indptr
+        frame_span._tof_indices = np.concatenate(tof_indices)
+        frame_span._intensity_values = np.concatenate(intensity_values)
+        # NOTE: frames are decoded, even if the HDF file was compact
+        frame_span._tof_deltas = None
+        frame_span._max_push_size = None
+        frame_span._raw_quad_indptr = raw_quad_indptr
+        frame_span._quad_indptr = push_indptr[raw_quad_indptr]
+        frame_span._quad_mz_values = self.quad_mz_values[quad_start: quad_end]
+        frame_span._precursor_indices = self.precursor_indices[
+            quad_start: quad_end
+        ]
+        frame_span._frame_offset = frame_offset
+        frame_span._quad_offset = quad_start
+        self._trim_frame_cache()
+        return frame_span
+
+    def _iter_frame_spans(self, frame_indices: np.ndarray):
+        """Create in-memory TimsTOF objects from bounded ranges of frames.
+
+        Parameters
+        ----------
+        frame_indices : np.int64[:]
+            The sorted and unique frame indices that need to be decoded.
+
+        Yields
+        ------
+        : alphatims.bruker.TimsTOF
+            TimsTOF objects (see alphatims.bruker.LazyTimsTOF.
+            _load_frame_span) that each span at most max_cached_frames
+            frames, so that sparse or wide selections never decode or
+            index more frames at once than the cache can hold.
+        """
+        max_frame_count = max(self.max_cached_frames, 1)
+        start = 0
+        while start < len(frame_indices):
+            end = np.searchsorted(
+                frame_indices,
+                frame_indices[start] + max_frame_count,
+                "left"
+            )
+            yield self._load_frame_span(frame_indices[start: end])
+            start = end
+
+    def _convert_raw_indices(
+        self,
+        frame_span: TimsTOF,
+        raw_indices: np.ndarray,
+        to_frame_span: bool,
+    ) -> np.ndarray:
+        frame_offset = frame_span._frame_offset
+        frame_span_indptr = frame_span.push_indptr[::self.scan_max_index]
+        if to_frame_span:
+            frame_indices = np.searchsorted(
+                self._frame_indptr,
+                raw_indices,
+                "right"
+            ) - 1
+            return raw_indices - self._frame_indptr[frame_indices] + (
+                frame_span_indptr[frame_indices - frame_offset]
+            )
+        else:
+            frame_indices = parallel_indptr_lookup(
+                frame_span_indptr,
+                raw_indices
+            )
+            return raw_indices - frame_span_indptr[frame_indices] + (
+                self._frame_indptr[frame_indices + frame_offset]
+            )
+
+    def _filter_parsed_keys(self, parsed_keys: dict) -> np.ndarray:
+        # NOTE: raw indices are returned in the order of the frame slices,
+        # so only consecutive slices with increasing frames can be merged
+        # into the same frame spans
+        frame_range_groups = []
+        last_frame = -1
+        for frame_start, frame_stop, frame_step in parsed_keys[
+            "frame_indices"
+        ]:
+            frame_range = range(
+                max(frame_start, 0),
+                min(frame_stop, self.frame_max_index),
+                frame_step
+            )
+            if len(frame_range) == 0:
+                continue
+            if (frame_range.start <= last_frame) or not frame_range_groups:
+                frame_range_groups.append([])
+            frame_range_groups[-1].append(frame_range)
+            last_frame = frame_range[-1]
+        raw_indices = [np.empty(0, dtype=np.int64)]
+        for frame_ranges in frame_range_groups:
+            frame_indices = np.unique(
+                np.concatenate(
+                    [
+                        np.arange(
+                            frame_range.start,
+                            frame_range.stop,
+                            frame_range.step
+                        ) for frame_range in frame_ranges
+                    ]
+                )
+            )
+            for frame_span in self._iter_frame_spans(frame_indices):
+                raw_indices.append(
+                    self._filter_frame_span(
+                        frame_span,
+                        frame_ranges,
+                        parsed_keys
+                    )
+                )
+        return np.concatenate(raw_indices)
+
+    def _filter_frame_span(
+        self,
+        frame_span: TimsTOF,
+        frame_ranges: list,
+        parsed_keys: dict,
+    ) -> np.ndarray:
+        frame_offset = frame_span._frame_offset
+        frame_end = frame_offset + frame_span.frame_max_index
+        frame_slices = []
+        for frame_range in frame_ranges:
+            # NOTE: skip the frames of this range before this span
+            skipped_frames = -((frame_range.start - frame_offset) // (
+                frame_range.step
+            ))
+            frame_range = frame_range[max(skipped_frames, 0):]
+            frame_stop = min(frame_range.stop, frame_end)
+            if frame_range.start < frame_stop:
+                frame_slices.append(
+                    [
+                        frame_range.start - frame_offset,
+                        frame_stop - frame_offset,
+                        frame_range.step,
+                    ]
+                )
+        if len(frame_slices) == 0:
+            return np.empty(0, dtype=np.int64)
+        frame_span_keys = dict(parsed_keys)
+        frame_span_keys["frame_indices"] = np.array(
+            frame_slices,
+            dtype=np.int64
+        )
+        return self._convert_raw_indices(
+            frame_span,
+            frame_span._filter_parsed_keys(frame_span_keys).astype(np.int64),
+            to_frame_span=False
+        )
+
+    def _filter_parsed_keys_as_ranges(self, parsed_keys: dict) -> np.ndarray:
+        if self._is_frame_only_query(parsed_keys):
+            # NOTE: frame_indptr is a push_indptr with a single scan per frame
+            return filter_frame_ranges(
+                parsed_keys["frame_indices"],
+                self.frame_max_index,
+                1,
+                self._frame_indptr,
+            )
+        return compress_raw_indices(self._filter_parsed_keys(parsed_keys))
+
+    def convert_from_indices(
+        self,
+        raw_indices,
+        **kwargs,
+    ) -> dict:
+        """Convert selected indices to a dict.
+
+        Frames containing any of the raw_indices are decoded if needed.
+
+        Parameters
+        ----------
+        raw_indices : np.int64[:], np.int64[:, 2]
+            The raw indices for which coordinates need to be retrieved.
+            Alternatively, (start, end) ranges of raw indices
+            (e.g. from data[..., "ranges"]) can be provided.
+        **kwargs
+            The return_* and raw_indices_sorted flags of
+            alphatims.bruker.TimsTOF.convert_from_indices.
+            Explicit frame_indices, quad_indices, scan_indices or
+            tof_indices cannot be provided.
+
+        Returns
+        -------
+        dict
+            A dict with all requested columns.
+        """
+        for key in kwargs:
+            if not (key.startswith("return_") or key == "raw_indices_sorted"):
+                raise KeyError(f"LazyTimsTOF cannot convert with '{key}'")
+        raw_indices = np.asarray(raw_indices, dtype=np.int64)
+        if raw_indices.ndim == 2:
+            raw_indices = expand_raw_ranges(raw_indices)
+        frame_indices = np.unique(
+            np.searchsorted(self._frame_indptr, raw_indices, "right") - 1
+        )
+        if len(frame_indices) == 0:
+            frame_indices = np.array([0], dtype=np.int64)
+        frame_spans = self._iter_frame_spans(frame_indices)
+        if frame_indices[-1] - frame_indices[0] < max(
+            self.max_cached_frames,
+            1
+        ):
+            return self._convert_frame_span_indices(
+                next(frame_spans),
+                raw_indices,
+                kwargs
+            )
+        raw_order = np.argsort(raw_indices, kind="stable")
+        sorted_raw_indices = raw_indices[raw_order]
+        result = {}
+        for frame_span in frame_spans:
+            frame_offset = frame_span._frame_offset
+            start, end = np.searchsorted(
+                sorted_raw_indices,
+                self._frame_indptr[
+                    [frame_offset, frame_offset + frame_span.frame_max_index]
+                ],
+                "left"
+            )
+            selection = raw_order[start: end]
+            frame_span_result = self._convert_frame_span_indices(
+                frame_span,
+                raw_indices[selection],
+                kwargs
+            )
+            for column, values in frame_span_result.items():
+                if column not in result:
+                    result[column] = np.empty(
+                        (len(raw_indices),) + values.shape[1:],
+                        dtype=values.dtype
+                    )
+                result[column][selection] = values
+        return result
+
+    def _convert_frame_span_indices(
+        self,
+        frame_span: TimsTOF,
+        raw_indices: np.ndarray,
+        kwargs: dict,
+    ) -> dict:
+        result = frame_span.convert_from_indices(
+            self._convert_raw_indices(
+                frame_span,
+                raw_indices,
+                to_frame_span=True
+            ),
+            **kwargs
+        )
+        if "raw_indices" in result:
+            result["raw_indices"] = raw_indices
+        if "frame_indices" in result:
+            result["frame_indices"] += frame_span._frame_offset
+        if "push_indices" in result:
+            result["push_indices"] += (
+                frame_span._frame_offset * self.scan_max_index
+            )
+        if "quad_indices" in result:
+            result["quad_indices"] += frame_span._quad_offset
+        return result
+
+    def _extract_query_slices(
+        self,
+        frame_slices: np.ndarray,
+        scan_slices: np.ndarray,
+        tof_slices: np.ndarray,
+        quad_slices: np.ndarray,
+    ) -> np.ndarray:
+        frame_slices = np.clip(frame_slices, 0, self.frame_max_index)
+        frame_counts = np.zeros(self.frame_max_index + 1, dtype=np.int64)
+        np.add.at(frame_counts, frame_slices[:, 0], 1)
+        np.add.at(frame_counts, frame_slices[:, 1], -1)
+        frame_indices = np.flatnonzero(np.cumsum(frame_counts[:-1]) > 0)
+        xics = np.zeros((len(frame_slices), self.frame_max_index))
+        for frame_span in self._iter_frame_spans(frame_indices):
+            frame_offset = frame_span._frame_offset
+            xics[
+                :,
+                frame_offset: frame_offset + frame_span.frame_max_index
+            ] = frame_span._extract_query_slices(
+                frame_slices - frame_offset,
+                scan_slices,
+                tof_slices,
+                quad_slices,
+            )
+        return xics
+
+    def save_as_hdf(self, *args, **kwargs):
+        raise NotImplementedError(
+            "A LazyTimsTOF cannot be saved as HDF, use a TimsTOF instead."
+        )
+
+    def build_tof_index(self):
+        raise NotImplementedError(
+            "A LazyTimsTOF cannot build a tof index, use a TimsTOF instead."
+        )
+
+    def build_intensity_pyramids(self, *args, **kwargs):
+        raise NotImplementedError(
+            "A LazyTimsTOF cannot build intensity pyramids, "
+            "use a TimsTOF instead."
+        )
+
+
+class LazyDataFrame(object):
+    """A dataframe of raw indices whose columns are converted upon access.
+
+    Columns are converted with the (cached) index columns they depend on,
+    e.g. "rt_values" only requires "frame_indices", which in turn only
+    require "push_indices" instead of all columns of
+    alphatims.bruker.TimsTOF.as_dataframe.
+    Converted columns are cached and a pd.DataFrame that shares memory with
+    these columns can be created with to_pandas.
+    """
+
+    COLUMNS = (
+        "raw_indices",
+        "frame_indices",
+        "scan_indices",
+        "quad_indices",
+        "precursor_indices",
+        "push_indices",
+        "tof_indices",
+        "rt_values",
+        "rt_values_min",
+        "mobility_values",
+        "quad_low_mz_values",
+        "quad_high_mz_values",
+        "mz_values",
+        "intensity_values",
     )
-    spectrum_counts[index] = len(maxima)
+    _INDEX_COLUMNS = {
+        "push_indices": "push_indices",
+        "quad_indices": "quad_indices",
+        "tof_indices": "tof_indices",
+        "intensity_values": "intensity_values",
+    }
+    _VALUE_COLUMNS = {
+        "precursor_indices": ("quad_indices", "precursor_indices"),
+        "rt_values": ("frame_indices", "rt_values"),
+        "rt_values_min": ("frame_indices", "rt_values_min"),
+        "mobility_values": ("scan_indices", "mobility_values"),
+        "quad_low_mz_values": ("quad_indices", "quad_mz_values"),
+        "quad_high_mz_values": ("quad_indices", "quad_mz_values"),
+        "mz_values": ("tof_indices", "mz_values"),
+    }
+    _RETURN_FLAGS = {
+        "quad_low_mz_values": "return_quad_mz_values",
+        "quad_high_mz_values": "return_quad_mz_values",
+    }
 
+    def __init__(
+        self,
+        timstof_data: TimsTOF,
+        indices: np.ndarray,
+        columns: list = COLUMNS,
+        *,
+        raw_indices_sorted: bool = True,
+    ):
+        """Create a dataframe without converting any column.
 
-@alphatims.utils.pjit
-def filter_spectra_by_abundant_peaks(
-    index: int,
-    spectrum_indptr: np.ndarray,
-    spectrum_counts: np.ndarray,
+        Parameters
+        ----------
+        timstof_data : alphatims.bruker.TimsTOF
+            The TimsTOF object to which the indices belong.
+        indices : np.int64[:], np.int64[:, 2]
+            The raw indices for which coordinates need to be retrieved.
+            Alternatively, (start, end) ranges of raw indices
+            (e.g. from data[..., "ranges"]) can be provided.
+        columns : list
+            The names of the columns, which need to be in
+            alphatims.bruker.LazyDataFrame.COLUMNS.
+            Default is all COLUMNS.
+        raw_indices_sorted : bool
+            If True, raw_indices are assumed to be sorted,
+            resulting in a faster conversion.
+            Default is True.
+
+        Raises
+        ------
+        KeyError
+            When a column is unknown.
+        """
+        for column in columns:
+            if column not in self.COLUMNS:
+                raise KeyError(f"Column '{column}' is unknown")
+        self._timstof_data = timstof_data
+        self._indices = indices
+        self._columns = list(columns)
+        self._raw_indices_sorted = raw_indices_sorted
+        self._cache = {}
+
+    @property
+    def columns(self) -> list:
+        """: list : The names of the columns."""
+        return list(self._columns)
+
+    @property
+    def shape(self) -> tuple:
+        """: tuple : The number of rows and columns."""
+        return (len(self), len(self._columns))
+
+    def __len__(self):
+        if np.ndim(self._indices) == 2:
+            indices = np.asarray(self._indices, dtype=np.int64)
+            return int(np.sum(indices[:, 1] - indices[:, 0]))
+        return len(self._indices)
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._columns
+
+    def __repr__(self):
+        return (
+            f"LazyDataFrame with {len(self):,} rows and columns "
+            f"{self._columns} ({len(self._cache)} converted)"
+        )
+
+    def keys(self) -> list:
+        return self.columns
+
+    def __getitem__(self, column):
+        if not isinstance(column, str):
+            return self.to_pandas(column)
+        if column not in self._columns:
+            raise KeyError(f"Column '{column}' is not in {self._columns}")
+        return self._get_column(column)
+
+    def _get_column(self, column: str) -> np.ndarray:
+        if column not in self._cache:
+            self._cache.update(self._convert_column(column))
+        return self._cache[column]
+
+    def _convert_column(self, column: str) -> dict:
+        timstof_data = self._timstof_data
+        if column == "raw_indices":
+            if np.ndim(self._indices) == 2:
+                return {
+                    column: expand_raw_ranges(
+                        np.asarray(self._indices, dtype=np.int64)
+                    )
+                }
+            return {column: self._indices}
+        if column in self._INDEX_COLUMNS:
+            return timstof_data.convert_from_indices(
+                self._get_column("raw_indices"),
+                raw_indices_sorted=self._raw_indices_sorted,
+                **{f"return_{self._INDEX_COLUMNS[column]}": True},
+            )
+        if column == "frame_indices":
+            return {
+                column: self._get_column("push_indices") // (
+                    timstof_data.scan_max_index
+                )
+            }
+        if column == "scan_indices":
+            return {
+                column: self._get_column("push_indices") % (
+                    timstof_data.scan_max_index
+                )
+            }
+        index_column, value_name = self._VALUE_COLUMNS[column]
+        # NOTE: Values only depend on metadata arrays, so converting them
+        # without raw indices works for a LazyTimsTOF as well.
+        return TimsTOF.convert_from_indices(
+            timstof_data,
+            **{
+                index_column: self._get_column(index_column),
+                f"return_{value_name}": True,
+            }
+        )
+
+    def _convert_columns(self, columns: list) -> None:
+        missing_columns = [
+            column for column in columns if column not in self._cache
+        ]
+        if len(missing_columns) == 0:
+            return
+        # NOTE: All missing columns are converted in a single pass
+        # (see alphatims.bruker.TimsTOF.convert_from_indices)
+        converted_columns = self._timstof_data.convert_from_indices(
+            self._cache.get("raw_indices", self._indices),
+            raw_indices_sorted=self._raw_indices_sorted,
+            **{
+                self._RETURN_FLAGS.get(
+                    column,
+                    f"return_{column}"
+                ): True for column in missing_columns
+            },
+        )
+        for column in missing_columns:
+            self._cache[column] = converted_columns[column]
+
+    def to_pandas(self, columns: list = None) -> pd.DataFrame:
+        """Convert (a selection of) the columns to a pd.DataFrame.
+
+        All columns that were not converted yet are converted at once,
+        which is faster than accessing them one by one.
+
+        Parameters
+        ----------
+        columns : list
+            The columns to include.
+            If None, all columns are included.
+            Default is None.
+
+        Returns
+        -------
+        pd.DataFrame
+            A dataframe with all requested columns, sharing memory with the
+            converted columns whenever possible.
+        """
+        if columns is None:
+            columns = self._columns
+        for column in columns:
+            if column not in self._columns:
+                raise KeyError(
+                    f"Column '{column}' is not in {self._columns}"
+                )
+        self._convert_columns(columns)
+        return pd.DataFrame(
+            {column: self._cache[column] for column in columns},
+            copy=False,
+        )
+
+
+class PrecursorFloatError(TypeError):
+    """Used to indicate that a precursor value is not an int but a float."""
+    pass
+
+
+@alphatims.utils.pjit(
+    signature_or_function="void(i8,i8[:],i8[:],i8[:],u4[:],u2[:],u4[:],f8[:],i8[:],i8[:])"
+)
+def set_precursor(
+    precursor_index: int,
+    offset_order: np.ndarray,
+    precursor_offsets: np.ndarray,
+    quad_indptr: np.ndarray,
+    tof_indices: np.ndarray,
+    intensities: np.ndarray,
     spectrum_tof_indices: np.ndarray,
     spectrum_intensity_values: np.ndarray,
-    keep_n_most_abundant_peaks: int,
-):
-    """Filter a spectrum to retain only the most abundant peaks.
+    spectrum_indptr: np.ndarray,
+    spectrum_counts: np.ndarray,
+) -> None:
+    """Sum the intensities of all pushes belonging to a single precursor.
 
-    IMPORTANT NOTE: This function will overwrite all input arrays.
+    IMPORTANT NOTE: This function is decorated with alphatims.utils.pjit.
+    The first argument is thus expected to be provided as an iterable
+    containing ints instead of a single int.
+
+    Parameters
+    ----------
+    precursor_index : int
+        The precursor index indicating which MS2 spectrum to determine.
+    offset_order : np.int64[:]
+        The order of self.precursor_indices, obtained with np.argsort.
+    precursor_offsets : np.int64[:]
+        An index pointer array for precursor offsets.
+    quad_indptr : np.int64[:]
+        The self.quad_indptr array of a TimsTOF object.
+    tof_indices : np.uint32[:]
+        The self.tof_indices array of a TimsTOF object.
+    intensities : np.uint16[:]
+        The self.intensity_values array of a TimsTOF object.
+    spectrum_tof_indices : np.uint32[:]
+        A buffer array to store tof indices of the new spectrum.
+    spectrum_intensity_values : np.float64[:]
+        A buffer array to store intensity values of the new spectrum.
+    spectrum_indptr : np.int64[:]
+        An index pointer array defining the original spectrum boundaries.
+    spectrum_counts : np. int64[:]
+        An buffer array defining how many distinct tof indices the new
+        spectrum has.
+    """
+    offset = spectrum_indptr[precursor_index]
+    precursor_offset_lower = precursor_offsets[precursor_index]
+    precursor_offset_upper = precursor_offsets[precursor_index + 1]
+    selected_offsets = offset_order[
+        precursor_offset_lower: precursor_offset_upper
+    ]
+    starts = quad_indptr[selected_offsets]
+    ends = quad_indptr[selected_offsets + 1]
+    offset_index = offset
+    for start, end in zip(starts, ends):
+        spectrum_tof_indices[
+            offset_index: offset_index + end - start
+        ] = tof_indices[start: end]
+        spectrum_intensity_values[
+            offset_index: offset_index + end - start
+            ] = intensities[start: end]
+        offset_index += end - start
+    offset_end = spectrum_indptr[precursor_index + 1]
+    order = np.argsort(spectrum_tof_indices[offset: offset_end])
+    current_index = offset - 1
+    previous_tof_index = -1
+    for tof_index, intensity in zip(
+        spectrum_tof_indices[offset: offset_end][order],
+        spectrum_intensity_values[offset: offset_end][order],
+    ):
+        if tof_index != previous_tof_index:
+            current_index += 1
+            spectrum_tof_indices[current_index] = tof_index
+            spectrum_intensity_values[current_index] = intensity
+            previous_tof_index = tof_index
+        else:
+            spectrum_intensity_values[current_index] += intensity
+    spectrum_tof_indices[current_index + 1: offset_end] = 0
+    spectrum_intensity_values[current_index + 1: offset_end] = 0
+    spectrum_counts[precursor_index] = current_index + 1 - offset
+
+
+@alphatims.utils.pjit
+def centroid_spectra(
+    index: int,
+    spectrum_indptr: np.ndarray,
+    spectrum_counts: np.ndarray,
+    spectrum_tof_indices: np.ndarray,
+    spectrum_intensity_values: np.ndarray,
+    window_size: int,
+):
+    """Smoothen and centroid a profile spectrum (inplace operation).
+
+    IMPORTANT NOTE: This function will overwrite all input arrays.
+
+    IMPORTANT NOTE: This function is decorated with alphatims.utils.pjit.
+    The first argument is thus expected to be provided as an iterable
+    containing ints instead of a single int.
+
+    Parameters
+    ----------
+    index : int
+        The push index whose intensity_values and tof_indices will be
+        centroided.
+    spectrum_indptr : np.int64[:]
+        An index pointer array defining the (untrimmed) spectrum boundaries.
+    spectrum_counts : np. int64[:]
+        The original array defining how many distinct tof indices each
+        spectrum has.
+    spectrum_tof_indices : np.uint32[:]
+        The original array containing tof indices.
+    spectrum_intensity_values : np.float64[:]
+        The original array containing intensity values.
+    window_size : int
+        The window size to use for smoothing and centroiding peaks.
+    """
+    start = spectrum_indptr[index]
+    end = start + spectrum_counts[index]
+    if start == end:
+        return
+    mzs = spectrum_tof_indices[start: end]
+    ints = spectrum_intensity_values[start: end]
+    smooth_ints = ints.copy()
+    for i, self_mz in enumerate(mzs[:-1]):
+        for j in range(i + 1, len(mzs)):
+            other_mz = mzs[j]
+            diff = other_mz - self_mz + 1
+            if diff >= window_size:
+                break
+            smooth_ints[i] += ints[j] / diff
+            smooth_ints[j] += ints[i] / diff
+    pre_apex = True
+    maxima = [mzs[0]]
+    intensities = [ints[0]]
+    for i, self_mz in enumerate(mzs[1:], 1):
+        if self_mz > mzs[i - 1] + window_size:
+            maxima.append(mzs[i])
+            intensities.append(0)
+            pre_apex = True
+        elif pre_apex:
+            if smooth_ints[i] < smooth_ints[i - 1]:
+                pre_apex = False
+                maxima[-1] = mzs[i - 1]
+        elif smooth_ints[i] > smooth_ints[i - 1]:
+            maxima.append(mzs[i])
+            intensities.append(0)
+            pre_apex = True
+        intensities[-1] += ints[i]
+    spectrum_tof_indices[start: start + len(maxima)] = np.array(
+        maxima,
+        dtype=spectrum_tof_indices.dtype
+    )
+    spectrum_intensity_values[start: start + len(maxima)] = np.array(
+        intensities,
+        dtype=spectrum_intensity_values.dtype
+    )
+    spectrum_counts[index] = len(maxima)
+
+
+@alphatims.utils.pjit
+def filter_spectra_by_abundant_peaks(
+    index: int,
+    spectrum_indptr: np.ndarray,
+    spectrum_counts: np.ndarray,
+    spectrum_tof_indices: np.ndarray,
+    spectrum_intensity_values: np.ndarray,
+    keep_n_most_abundant_peaks: int,
+):
+    """Filter a spectrum to retain only the most abundant peaks.
+
+    IMPORTANT NOTE: This function will overwrite all input arrays.
+
+    IMPORTANT NOTE: This function is decorated with alphatims.utils.pjit.
+    The first argument is thus expected to be provided as an iterable
+    containing ints instead of a single int.
+
+    Parameters
+    ----------
+    index : int
+        The push index whose intensity_values and tof_indices will be
+        centroided.
+    spectrum_indptr : np.int64[:]
+        An index pointer array defining the (untrimmed) spectrum boundaries.
+    spectrum_counts : np. int64[:]
+        The original array defining how many distinct tof indices each
+        spectrum has.
+    spectrum_tof_indices : np.uint32[:]
+        The original array containing tof indices.
+    spectrum_intensity_values : np.float64[:]
+        The original array containing intensity values.
+    keep_n_most_abundant_peaks : int
+        Keep only this many abundant peaks.
+    """
+    start = spectrum_indptr[index]
+    end = start + spectrum_counts[index]
+    if end - start <= keep_n_most_abundant_peaks:
+        return
+    mzs = spectrum_tof_indices[start: end]
+    ints = spectrum_intensity_values[start: end]
+    selected_indices = np.sort(
+        np.argsort(ints)[-keep_n_most_abundant_peaks:]
+    )
+    count = len(selected_indices)
+    spectrum_tof_indices[start: start + count] = mzs[selected_indices]
+    spectrum_intensity_values[start: start + count] = ints[selected_indices]
+    spectrum_counts[index] = count
+
+
+@alphatims.utils.pjit
+def trim_spectra(
+    index: int,
+    spectrum_tof_indices: np.ndarray,
+    spectrum_intensity_values: np.ndarray,
+    spectrum_indptr: np.ndarray,
+    trimmed_spectrum_tof_indices: np.ndarray,
+    trimmed_spectrum_intensity_values: np.ndarray,
+    new_spectrum_indptr: np.ndarray,
+) -> None:
+    """Trim remaining bytes after merging of multiple pushes.
+
+    IMPORTANT NOTE: This function is decorated with alphatims.utils.pjit.
+    The first argument is thus expected to be provided as an iterable
+    containing ints instead of a single int.
+
+    Parameters
+    ----------
+    index : int
+        The push index whose intensity_values and tof_indices will be trimmed.
+    spectrum_tof_indices : np.uint32[:]
+        The original array containing tof indices.
+    spectrum_intensity_values : np.float64[:]
+        The original array containing intensity values.
+    spectrum_indptr : np.int64[:]
+        An index pointer array defining the original spectrum boundaries.
+    trimmed_spectrum_tof_indices : np.uint32[:]
+        A buffer array to store new tof indices.
+    trimmed_spectrum_intensity_values : np.float64[:]
+        A buffer array to store new intensity values.
+    new_spectrum_indptr : np.int64[:]
+        An index pointer array defining the trimmed spectrum boundaries.
+    """
+    start = spectrum_indptr[index]
+    new_start = new_spectrum_indptr[index]
+    new_end = new_spectrum_indptr[index + 1]
+    trimmed_spectrum_tof_indices[new_start: new_end] = spectrum_tof_indices[
+        start: start + new_end - new_start
+    ]
+    trimmed_spectrum_intensity_values[
+        new_start: new_end
+    ] = spectrum_intensity_values[
+        start: start + new_end - new_start
+    ]
+
+
+def parse_keys(data: TimsTOF, keys) -> dict:
+    """Convert different keys to a key dict with defined types.
+
+    NOTE: Negative slicing is not supported and all indiviudal keys
+    are assumed to be sorted, disjunct and strictly increasing
+
+    Parameters
+    ----------
+    data : alphatims.bruker.TimsTOF
+        The TimsTOF objext for which to get slices.
+    keys : tuple
+        A tuple of at most 5 elemens, containing
+        slices, ints, floats, Nones, and/or iterables.
+        See `alphatims.bruker.convert_slice_key_to_int_array` and
+        `alphatims.bruker.convert_slice_key_to_float_array` for more details.
+
+    Returns
+    -------
+    : dict
+        The resulting dict always has the following items:
+            - "frame_indices": np.int64[:, 3]
+            - "scan_indices": np.int64[:, 3]
+            - "tof_indices": np.int64[:, 3]
+            - "precursor_indices": np.int64[:, 3]
+            - "quad_values": np.float64[:, 2]
+            - "intensity_values": np.float64[:, 2]
+    """
+    dimensions = [
+        "frame_indices",
+        "scan_indices",
+        "precursor_indices",
+        "tof_indices",
+    ]
+    dimension_slices = {}
+    if len(keys) > (len(dimensions) + 1):
+        raise KeyError(
+            "LC-IMS-MSMS data can be sliced in maximum 5 dimensions. "
+            "Integers are assumed to be indices, while "
+            "floats are assumed as values. Intensity is always casted "
+            "to integer values, regardless of input type."
+        )
+    if isinstance(keys[0], dict):
+        new_keys = []
+        dimension_translations = {
+            "frame_indices": "rt_values",
+            "scan_indices": "mobility_values",
+            "precursor_indices": "quad_mz_values",
+            "tof_indices": "mz_values",
+        }
+        for indices, values in dimension_translations.items():
+            if indices in keys[0]:
+                new_keys.append(keys[0][indices])
+            elif values in keys[0]:
+                new_keys.append(keys[0][values])
+            else:
+                new_keys.append(slice(None))
+        if "intensity_values" in keys[0]:
+            new_keys.append(keys[0]["intensity_values"])
+        keys = new_keys
+    for i, dimension in enumerate(dimensions):
+        try:
+            dimension_slices[
+                dimension
+            ] = convert_slice_key_to_int_array(
+                data,
+                keys[i] if (i < len(keys)) else slice(None),
+                dimension
+            )
+        except PrecursorFloatError:
+            dimension_slices[
+                "precursor_indices"
+            ] = convert_slice_key_to_int_array(
+                data,
+                slice(None),
+                "precursor_indices"
+            )
+            dimension_slices[
+                "quad_values"
+            ] = convert_slice_key_to_float_array(keys[i])
+    dimension_slices[
+        "intensity_values"
+    ] = convert_slice_key_to_float_array(
+        keys[-1] if (len(keys) > len(dimensions)) else slice(None)
+    )
+    if "quad_values" not in dimension_slices:
+        dimension_slices["quad_values"] = np.array(
+            [[-np.inf, np.inf]],
+            dtype=np.float64
+        )
+    return dimension_slices
+
+
+def convert_slice_key_to_float_array(key):
+    """Convert a key to a slice float array.
+
+    NOTE: This function should only be used for QUAD or DETECTOR dimensions.
+
+    Parameters
+    ----------
+    key : slice, int, float, None, iterable
+        The key that needs to be converted.
+
+    Returns
+    -------
+    : np.float64[:, 2]
+        Each row represent a a (start, stop) slice.
+
+    Raises
+    ------
+    ValueError
+        When the key is an np.ndarray with more than 2 columns.
+    """
+    try:
+        iter(key)
+    except TypeError:
+        if key is None:
+            key = slice(None)
+        if isinstance(key, slice):
+            start = key.start
+            if start is None:
+                start = -np.inf
+            stop = key.stop
+            if stop is None:
+                stop = np.inf
+        else:
+            start = key
+            stop = key
+        return np.array([[start, stop]], dtype=np.float64)
+    else:
+        if not isinstance(key, np.ndarray):
+            key = np.array(key, dtype=np.float64)
+        key = key.astype(np.float64)
+        if len(key.shape) == 1:
+            return np.array([key, key]).T
+        elif len(key.shape) == 2:
+            if key.shape[1] != 2:
+                raise ValueError
+            return key
+        else:
+            raise ValueError
+
+
+def convert_slice_key_to_int_array(data: TimsTOF, key, dimension: str):
+    """Convert a key of a data dimension to a slice integer array.
+
+    Parameters
+    ----------
+    data : alphatims.bruker.TimsTOF
+        The TimsTOF objext for which to get slices.
+    key : slice, int, float, None, iterable
+        The key that needs to be converted.
+    dimension : str
+        The dimension for which the key needs to be retrieved
+
+    Returns
+    -------
+    : np.int64[:, 3]
+        Each row represent a a (start, stop, step) slice.
+
+    Raises
+    ------
+    ValueError
+        When the key contains elements other than int or float.
+    PrecursorFloatError
+        When trying to convert a quad float to precursor index.
+    """
+    result = np.empty((0, 3), dtype=np.int64)
+    inverse_of_scans = False
+    try:
+        iter(key)
+    except TypeError:
+        if key is None:
+            key = slice(None)
+        if isinstance(key, slice):
+            if dimension == "scan_indices":
+                if isinstance(key.start, (np.inexact, float)) or isinstance(key.stop, (np.inexact, float)):
+                    key = slice(key.stop, key.start, key.step)
+            start = key.start
+            if not isinstance(start, (np.integer, int)):
+                if start is None:
+                    if dimension == "scan_indices":
+                        start = np.inf
+                    else:
+                        start = -np.inf
+                if not isinstance(start, (np.inexact, float)):
+                    raise ValueError
+                start = data.convert_to_indices(
+                    start,
+                    return_type=dimension
+                )
+            stop = key.stop
+            if not isinstance(stop, (np.integer, int)):
+                if stop is None:
+                    if dimension == "scan_indices":
+                        stop = -np.inf
+                    else:
+                        stop = np.inf
+                if not isinstance(stop, (np.inexact, float)):
+                    raise ValueError
+                stop = data.convert_to_indices(
+                    stop,
+                    return_type=dimension,
+                )
+            step = key.step
+            if not isinstance(step, (np.integer, int)):
+                if step is not None:
+                    raise ValueError
+                step = 1
+            result = np.array([[start, stop, step]])
+        elif isinstance(key, (np.integer, int)):
+            result = np.array([[key, key + 1, 1]])
+        elif isinstance(key, (np.inexact, float)):
+            key = data.convert_to_indices(key, return_type=dimension)
+            if dimension == "scan_indices":
+                result = np.array([[key - 1, key, 1]])
+            else:
+                result = np.array([[key, key + 1, 1]])
+        else:
+            raise ValueError
+    else:
+        if not isinstance(key, np.ndarray):
+            key = np.array(key)
+        step = 1
+        if not isinstance(key.ravel()[0], np.integer):
+            key = data.convert_to_indices(key, return_type=dimension)
+            if dimension == "scan_indices":
+                key -= 1
+        if len(key.shape) == 1:
+            result = np.array([key, key + 1, np.repeat(step, key.size)]).T
+        elif len(key.shape) == 2:
+            if key.shape[1] != 3:
+                raise ValueError
+            result = key
+        else:
+            raise ValueError
+    if inverse_of_scans:
+        return result[:, [1, 0, 2]]
+    else:
+        return result
+
+
+@alphatims.utils.njit
+def calculate_dia_cycle_mask(
+    dia_mz_cycle: np.ndarray,
+    quad_slices: np.ndarray,
+    dia_precursor_cycle: np.ndarray = None,
+    precursor_slices: np.ndarray = None,
+):
+    """Calculate a boolean mask for cyclic push indices satisfying queries.
+
+    Parameters
+    ----------
+    dia_mz_cycle : np.float64[:, 2]
+        An array with (upper, lower) mz values of a DIA cycle (per push).
+    quad_slices : np.float64[:, 2]
+        Each row of the array is assumed to be (lower_mz, upper_mz) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(quad_slices.ravel()) >= 0) = True).
+    dia_precursor_cycle : np.int64[:]
+        An array with precursor indices of a DIA cycle (per push).
+    precursor_slices : np.int64[:, 3]
+        Each row of the array is assumed to be a (start, stop, step) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(precursor_slices[:, :2].ravel()) >= 0) = True).
+
+    Returns
+    -------
+    : np.bool_[:]
+        A mask that determines if a cyclic push index is valid given the
+        requested slices.
+    """
+    mz_mask = np.zeros(len(dia_mz_cycle), dtype=np.bool_)
+    for i, (mz_start, mz_stop) in enumerate(dia_mz_cycle):
+        for quad_mz_start, quad_mz_stop in quad_slices:
+            if (quad_mz_start <= mz_stop) and (quad_mz_stop >= mz_start):
+                mz_mask[i] = True
+                break
+    if precursor_slices is not None:
+        precursor_mask = np.zeros(len(dia_mz_cycle), dtype=np.bool_)
+        for i, precursor_index in enumerate(dia_precursor_cycle):
+            for (start, stop, step) in precursor_slices:
+                if precursor_index in range(start, stop, step):
+                    precursor_mask[i] = True
+                    break
+        return mz_mask & precursor_mask
+    else:
+        return mz_mask
+
+
+@alphatims.utils.njit
+def valid_quad_mz_values(
+    low_mz_value: float,
+    high_mz_value: float,
+    quad_slices: np.ndarray,
+) -> bool:
+    """Check if the low and high quad mz values are included in the slices.
+
+    NOTE: Just a part of the quad range needs to overlap with a part
+    of a single slice.
+
+    Parameters
+    ----------
+    low_mz_value : float
+        The lower mz value of the current quad selection.
+    high_mz_value : float
+        The upper mz value of the current quad selection.
+    quad_slices : np.float64[:, 2]
+        Each row of the array is assumed to be (lower_mz, upper_mz) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(quad_slices.ravel()) >= 0) = True).
+
+    Returns
+    -------
+    : bool
+        True if some part of the quad overlaps with some part of some slice.
+        False if there is no overlap in the range.
+    """
+    slice_index = np.searchsorted(
+        quad_slices[:, 0].ravel(),
+        high_mz_value,
+        "right"
+    )
+    if slice_index == 0:
+        return False
+    if low_mz_value <= quad_slices[slice_index - 1, 1]:
+        return True
+    return False
+
+
+@alphatims.utils.njit
+def valid_precursor_index(
+    precursor_index: int,
+    precursor_slices: np.ndarray
+) -> bool:
+    """Check if a precursor index is included in the slices.
+
+    Parameters
+    ----------
+    precursor_index : int
+        The precursor index to validate.
+    precursor_slices : np.int64[:, 3]
+        Each row of the array is assumed to be a (start, stop, step) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(precursor_slices[:, :2].ravel()) >= 0) = True).
+
+    Returns
+    -------
+    : bool
+        True if the precursor index is present in any of the slices.
+        False otherwise.
+    """
+    slice_index = np.searchsorted(
+        precursor_slices[:, 0].ravel(),
+        precursor_index,
+        side="right"
+    )
+    if slice_index == 0:
+        return False
+    return precursor_index in range(
+        precursor_slices[slice_index - 1, 0],
+        precursor_slices[slice_index - 1, 1],
+        precursor_slices[slice_index - 1, 2],
+    )
+
+
+@alphatims.utils.njit(nogil=True)
+def encode_tof_deltas(
+    push_indptr: np.ndarray,
+    tof_indices: np.ndarray,
+) -> tuple:
+    """Encode tof_indices as uint16 deltas within each push.
+
+    The first tof index of each push is stored as a push offset.
+    Deltas that do not fit in a uint16 are replaced by MAX_TOF_DELTA
+    and stored separately as overflow values.
+
+    Parameters
+    ----------
+    push_indptr : np.int64[:]
+        The self.push_indptr array of a TimsTOF object.
+    tof_indices : np.uint32[:]
+        The self.tof_indices array of a TimsTOF object.
+
+    Returns
+    -------
+    : tuple
+        The push_tof_offsets (np.uint32[:]), tof_deltas (np.uint16[:]),
+        tof_delta_overflow_indices (np.int64[:]) and
+        tof_delta_overflow_values (np.uint32[:]).
+    """
+    push_tof_offsets = np.zeros(len(push_indptr) - 1, dtype=np.uint32)
+    tof_deltas = np.empty(len(tof_indices), dtype=np.uint16)
+    overflow_count = 0
+    for push_index in range(len(push_indptr) - 1):
+        start = push_indptr[push_index]
+        end = push_indptr[push_index + 1]
+        if start == end:
+            continue
+        push_tof_offsets[push_index] = tof_indices[start]
+        tof_deltas[start] = 0
+        for index in range(start + 1, end):
+            delta = np.int64(tof_indices[index]) - np.int64(
+                tof_indices[index - 1]
+            )
+            if delta >= MAX_TOF_DELTA:
+                tof_deltas[index] = MAX_TOF_DELTA
+                overflow_count += 1
+            else:
+                tof_deltas[index] = delta
+    overflow_indices = np.flatnonzero(tof_deltas == MAX_TOF_DELTA)
+    overflow_values = np.empty(overflow_count, dtype=np.uint32)
+    for i, index in enumerate(overflow_indices):
+        overflow_values[i] = tof_indices[index] - tof_indices[index - 1]
+    return push_tof_offsets, tof_deltas, overflow_indices, overflow_values
+
+
+@alphatims.utils.njit(nogil=True)
+def decode_push_tof_deltas(
+    start: int,
+    end: int,
+    push_tof_offset: int,
+    tof_deltas: np.ndarray,
+    tof_delta_overflow_indices: np.ndarray,
+    tof_delta_overflow_values: np.ndarray,
+    buffer: np.ndarray,
+    max_tof_index: int = 2**32,
+) -> int:
+    """Decode the tof_indices of a single push into a buffer.
+
+    Parameters
+    ----------
+    start : int
+        The first raw index of the push.
+    end : int
+        The last raw index (excluded) of the push.
+    push_tof_offset : int
+        The first tof index of the push.
+    tof_deltas : np.uint16[:]
+        The uint16 tof deltas (see alphatims.bruker.encode_tof_deltas).
+    tof_delta_overflow_indices : np.int64[:]
+        The raw indices whose delta did not fit in a uint16.
+    tof_delta_overflow_values : np.uint32[:]
+        The deltas that did not fit in a uint16.
+    buffer : np.uint32[:]
+        A buffer of at least length end - start.
+        The decoded tof_indices are stored at the start of this buffer.
+    max_tof_index : int
+        Decoding stops after the first tof index that is not smaller than
+        this value.
+        Default is 2**32.
+
+    Returns
+    -------
+    : int
+        The number of decoded tof_indices.
+    """
+    tof_index = np.int64(push_tof_offset)
+    for index in range(start, end):
+        if tof_index >= max_tof_index:
+            return index - start
+        delta = tof_deltas[index]
+        if delta == MAX_TOF_DELTA:
+            tof_index += np.int64(
+                tof_delta_overflow_values[
+                    np.searchsorted(tof_delta_overflow_indices, index)
+                ]
+            )
+        else:
+            tof_index += np.int64(delta)
+        buffer[index - start] = tof_index
+    return end - start
+
+
+@alphatims.utils.njit(nogil=True)
+def decode_tof_deltas(
+    push_indptr: np.ndarray,
+    push_tof_offsets: np.ndarray,
+    tof_deltas: np.ndarray,
+    tof_delta_overflow_indices: np.ndarray,
+    tof_delta_overflow_values: np.ndarray,
+) -> np.ndarray:
+    """Decode all tof_indices (see alphatims.bruker.encode_tof_deltas).
+
+    Parameters
+    ----------
+    push_indptr : np.int64[:]
+        The self.push_indptr array of a TimsTOF object.
+    push_tof_offsets : np.uint32[:]
+        The first tof index of each push.
+    tof_deltas : np.uint16[:]
+        The uint16 tof deltas.
+    tof_delta_overflow_indices : np.int64[:]
+        The raw indices whose delta did not fit in a uint16.
+    tof_delta_overflow_values : np.uint32[:]
+        The deltas that did not fit in a uint16.
+
+    Returns
+    -------
+    : np.uint32[:]
+        The decoded tof_indices.
+    """
+    tof_indices = np.empty(len(tof_deltas), dtype=np.uint32)
+    for push_index in range(len(push_indptr) - 1):
+        start = push_indptr[push_index]
+        decode_push_tof_deltas(
+            start,
+            push_indptr[push_index + 1],
+            push_tof_offsets[push_index],
+            tof_deltas,
+            tof_delta_overflow_indices,
+            tof_delta_overflow_values,
+            tof_indices[start:],
+        )
+    return tof_indices
+
+
+@alphatims.utils.njit(nogil=True)
+def decode_tof_deltas_at(
+    raw_indices: np.ndarray,
+    push_indptr: np.ndarray,
+    push_tof_offsets: np.ndarray,
+    tof_deltas: np.ndarray,
+    tof_delta_overflow_indices: np.ndarray,
+    tof_delta_overflow_values: np.ndarray,
+) -> np.ndarray:
+    """Decode the tof_indices of selected raw indices.
+
+    Consecutive raw indices within the same push are decoded incrementally,
+    so this is most efficient for sorted raw indices.
+
+    Parameters
+    ----------
+    raw_indices : np.int64[:]
+        The raw indices whose tof_indices need to be decoded.
+    push_indptr : np.int64[:]
+        The self.push_indptr array of a TimsTOF object.
+    push_tof_offsets : np.uint32[:]
+        The first tof index of each push.
+    tof_deltas : np.uint16[:]
+        The uint16 tof deltas.
+    tof_delta_overflow_indices : np.int64[:]
+        The raw indices whose delta did not fit in a uint16.
+    tof_delta_overflow_values : np.uint32[:]
+        The deltas that did not fit in a uint16.
+
+    Returns
+    -------
+    : np.uint32[:]
+        The decoded tof_indices.
+    """
+    tof_indices = np.empty(len(raw_indices), dtype=np.uint32)
+    push_end = -1
+    index = 0
+    tof_index = np.int64(0)
+    for i, raw_index in enumerate(raw_indices):
+        if (raw_index < index) or (raw_index >= push_end):
+            push_index = np.searchsorted(push_indptr, raw_index, "right") - 1
+            index = np.int64(push_indptr[push_index])
+            push_end = np.int64(push_indptr[push_index + 1])
+            tof_index = np.int64(push_tof_offsets[push_index])
+        while index <= raw_index:
+            delta = tof_deltas[index]
+            if delta == MAX_TOF_DELTA:
+                tof_index += np.int64(
+                    tof_delta_overflow_values[
+                        np.searchsorted(tof_delta_overflow_indices, index)
+                    ]
+                )
+            else:
+                tof_index += np.int64(delta)
+            index += 1
+        tof_indices[i] = tof_index
+    return tof_indices
+
+
+@alphatims.utils.njit(nogil=True)
+def filter_frame_ranges(
+    frame_slices: np.ndarray,
+    frame_max_index: int,
+    scan_max_index: int,
+    push_indptr: np.ndarray,
+) -> np.ndarray:
+    """Get the raw index ranges of all selected frames.
+
+    Frames that are adjacent are merged into a single range.
+
+    Parameters
+    ----------
+    frame_slices : np.int64[:, 3]
+        Each row of the array is assumed to be a (start, stop, step) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(frame_slices[:, :2].ravel()) >= 0) = True).
+    frame_max_index : int
+        The maximum frame index of a TimsTOF object.
+    scan_max_index : int
+        The maximum scan index of a TimsTOF object.
+    push_indptr : np.int64[:]
+        The self.push_indptr array of a TimsTOF object.
+
+    Returns
+    -------
+    : np.int64[:, 2]
+        Each row of the array is a (start, end) tuple of raw indices.
+    """
+    frame_count = 0
+    for frame_start, frame_stop, frame_step in frame_slices:
+        frame_count += len(
+            range(frame_start, min(frame_stop, frame_max_index), frame_step)
+        )
+    raw_ranges = np.empty((frame_count, 2), dtype=np.int64)
+    range_count = 0
+    for frame_start, frame_stop, frame_step in frame_slices:
+        for frame_index in range(
+            frame_start,
+            min(frame_stop, frame_max_index),
+            frame_step
+        ):
+            start = push_indptr[frame_index * scan_max_index]
+            end = push_indptr[(frame_index + 1) * scan_max_index]
+            if start == end:
+                continue
+            if (range_count > 0) and (raw_ranges[range_count - 1, 1] == start):
+                raw_ranges[range_count - 1, 1] = end
+            else:
+                raw_ranges[range_count, 0] = start
+                raw_ranges[range_count, 1] = end
+                range_count += 1
+    return raw_ranges[:range_count]
+
+
+@alphatims.utils.njit(nogil=True)
+def filter_push_ranges(
+    frame_slices: np.ndarray,
+    scan_slices: np.ndarray,
+    precursor_slices: np.ndarray,
+    quad_slices: np.ndarray,
+    frame_max_index: int,
+    scan_max_index: int,
+    push_indptr: np.ndarray,
+    precursor_indices: np.ndarray,
+    quad_mz_values: np.ndarray,
+    quad_indptr: np.ndarray,
+) -> np.ndarray:
+    """Get the raw index ranges of all selected pushes.
+
+    Pushes that are adjacent are merged into a single range.
+    This is equivalent to alphatims.bruker.filter_indices when the tof and
+    intensity slices select everything.
+
+    Parameters
+    ----------
+    frame_slices : np.int64[:, 3]
+        Each row of the array is assumed to be a (start, stop, step) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(frame_slices[:, :2].ravel()) >= 0) = True).
+    scan_slices : np.int64[:, 3]
+        Each row of the array is assumed to be a (start, stop, step) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(scan_slices[:, :2].ravel()) >= 0) = True).
+    precursor_slices : np.int64[:, 3]
+        Each row of the array is assumed to be a (start, stop, step) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(precursor_slices[:, :2].ravel()) >= 0) = True).
+    quad_slices : np.float64[:, 2]
+        Each row of the array is assumed to be (lower_mz, upper_mz) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(quad_slices.ravel()) >= 0) = True).
+    frame_max_index : int
+        The maximum frame index of a TimsTOF object.
+    scan_max_index : int
+        The maximum scan index of a TimsTOF object.
+    push_indptr : np.int64[:]
+        The self.push_indptr array of a TimsTOF object.
+    precursor_indices : np.int64[:]
+        The self.precursor_indices array of a TimsTOF object.
+    quad_mz_values : np.float64[:, 2]
+        The self.quad_mz_values array of a TimsTOF object.
+    quad_indptr : np.int64[:]
+        The self.quad_indptr array of a TimsTOF object.
+
+    Returns
+    -------
+    : np.int64[:, 2]
+        Each row of the array is a (start, end) tuple of raw indices.
+    """
+    raw_ranges = []
+    quad_index = -1
+    new_quad_index = -1
+    quad_end = -1
+    is_valid_quad_index = True
+    range_start = -1
+    range_end = -1
+    starts = push_indptr[:-1].reshape(
+        frame_max_index,
+        scan_max_index
+    )
+    ends = push_indptr[1:].reshape(
+        frame_max_index,
+        scan_max_index
+    )
+    for frame_start, frame_stop, frame_step in frame_slices:
+        for frame_start_slice, frame_end_slice in zip(
+            starts[slice(frame_start, frame_stop, frame_step)],
+            ends[slice(frame_start, frame_stop, frame_step)]
+        ):
+            for scan_start, scan_stop, scan_step in scan_slices:
+                for sparse_start, sparse_end in zip(
+                    frame_start_slice[slice(scan_start, scan_stop, scan_step)],
+                    frame_end_slice[slice(scan_start, scan_stop, scan_step)]
+                ):
+                    if (sparse_start == sparse_end):
+                        continue
+                    while quad_end < sparse_end:
+                        new_quad_index += 1
+                        quad_end = quad_indptr[new_quad_index + 1]
+                    if quad_index != new_quad_index:
+                        quad_index = new_quad_index
+                        if not valid_quad_mz_values(
+                            quad_mz_values[quad_index, 0],
+                            quad_mz_values[quad_index, 1],
+                            quad_slices
+                        ):
+                            is_valid_quad_index = False
+                        elif not valid_precursor_index(
+                            precursor_indices[quad_index],
+                            precursor_slices,
+                        ):
+                            is_valid_quad_index = False
+                        else:
+                            is_valid_quad_index = True
+                    if not is_valid_quad_index:
+                        continue
+                    if sparse_start == range_end:
+                        range_end = sparse_end
+                    else:
+                        if range_start != range_end:
+                            raw_ranges.append((range_start, range_end))
+                        range_start = sparse_start
+                        range_end = sparse_end
+    if range_start != range_end:
+        raw_ranges.append((range_start, range_end))
+    result = np.empty((len(raw_ranges), 2), dtype=np.int64)
+    for i, (start, end) in enumerate(raw_ranges):
+        result[i, 0] = start
+        result[i, 1] = end
+    return result
+
+
+@alphatims.utils.njit(nogil=True)
+def compress_raw_indices(raw_indices: np.ndarray) -> np.ndarray:
+    """Compress sorted raw indices to (start, end) ranges.
+
+    Parameters
+    ----------
+    raw_indices : np.int64[:]
+        Sorted raw indices without duplicates.
+
+    Returns
+    -------
+    : np.int64[:, 2]
+        Each row of the array is a (start, end) tuple of raw indices.
+    """
+    range_count = 0
+    for i in range(len(raw_indices)):
+        if (i == 0) or (raw_indices[i] != raw_indices[i - 1] + 1):
+            range_count += 1
+    raw_ranges = np.empty((range_count, 2), dtype=np.int64)
+    range_index = -1
+    for i in range(len(raw_indices)):
+        if (i == 0) or (raw_indices[i] != raw_indices[i - 1] + 1):
+            range_index += 1
+            raw_ranges[range_index, 0] = raw_indices[i]
+        raw_ranges[range_index, 1] = raw_indices[i] + 1
+    return raw_ranges
+
+
+@alphatims.utils.njit(nogil=True)
+def bin_raw_ranges(
+    raw_ranges: np.ndarray,
+    push_indptr: np.ndarray,
+    scan_max_index: int,
+    tof_indices: np.ndarray,
+    intensities: np.ndarray,
+    dimensions: np.ndarray,
+    dimension_sizes: np.ndarray,
+    intensity_bins: np.ndarray,
+    tof_bin_size: int = 1,
+) -> None:
+    """Add the intensities of all raw index ranges to their bins.
+
+    Parameters
+    ----------
+    raw_ranges : np.int64[:, 2]
+        Each row of the array is a (start, end) tuple of raw indices.
+    push_indptr : np.int64[:]
+        The self.push_indptr array of a TimsTOF object.
+    scan_max_index : int
+        The maximum scan index of a TimsTOF object.
+    tof_indices : np.uint32[:]
+        The self.tof_indices array of a TimsTOF object.
+    intensities : np.uint16[:]
+        The self.intensity_values array of a TimsTOF object.
+    dimensions : np.int64[:]
+        The dimensions to bin along,
+        with 0 for frames, 1 for scans and 2 for tofs.
+    dimension_sizes : np.int64[:]
+        The number of bins of each dimension.
+    intensity_bins : np.float64[:]
+        A flat buffer with intensity bins to which the intensities are added.
+    tof_bin_size : int
+        The number of consecutive tof indices that are summed in a single
+        bin.
+        Default is 1.
+    """
+    coordinates = np.empty(3, dtype=np.int64)
+    for start, end in raw_ranges:
+        push_index = np.searchsorted(push_indptr, start, "right") - 1
+        push_end = push_indptr[push_index + 1]
+        for raw_index in range(start, end):
+            while raw_index >= push_end:
+                push_index += 1
+                push_end = push_indptr[push_index + 1]
+            coordinates[0] = push_index // scan_max_index
+            coordinates[1] = push_index % scan_max_index
+            coordinates[2] = np.int64(tof_indices[raw_index]) // tof_bin_size
+            bin_index = 0
+            for dimension in dimensions:
+                bin_index *= dimension_sizes[dimension]
+                bin_index += coordinates[dimension]
+            intensity_bins[bin_index] += intensities[raw_index]
+
+
+@alphatims.utils.njit(nogil=True)
+def fill_push_columns(
+    push_indptr: np.ndarray,
+    push_start: int,
+    push_end: int,
+    scan_max_index: int,
+    frame_indices: np.ndarray,
+    scan_indices: np.ndarray,
+) -> None:
+    """Fill the frame and scan indices of all detector events in a push range.
+
+    Parameters
+    ----------
+    push_indptr : np.int64[:]
+        The self.push_indptr array of a TimsTOF object.
+    push_start : int
+        The first push of the range.
+    push_end : int
+        The push after the last push of the range.
+    scan_max_index : int
+        The maximum scan index of a TimsTOF object.
+    frame_indices : np.uint32[:]
+        A buffer with one element per detector event in the push range,
+        in which the frame index of each detector event is stored.
+    scan_indices : np.uint32[:]
+        A buffer with one element per detector event in the push range,
+        in which the scan index of each detector event is stored.
+    """
+    offset = push_indptr[push_start]
+    for push_index in range(push_start, push_end):
+        start = push_indptr[push_index] - offset
+        end = push_indptr[push_index + 1] - offset
+        frame_indices[start: end] = push_index // scan_max_index
+        scan_indices[start: end] = push_index % scan_max_index
+
+
+@alphatims.utils.njit(nogil=True)
+def count_push_events(
+    frame_indices: np.ndarray,
+    scan_indices: np.ndarray,
+    scan_max_index: int,
+    push_counts: np.ndarray,
+) -> None:
+    """Count the detector events of each push.
+
+    Parameters
+    ----------
+    frame_indices : np.uint32[:]
+        The frame index of each detector event.
+    scan_indices : np.uint32[:]
+        The scan index of each detector event.
+    scan_max_index : int
+        The maximum scan index of a TimsTOF object.
+    push_counts : np.int64[:]
+        A buffer with one element more than the number of pushes,
+        in which the number of detector events of each push p is added to
+        push_counts[p + 1], so that its cumulative sum is a push_indptr.
+    """
+    for index in range(len(frame_indices)):
+        push_index = np.int64(frame_indices[index]) * scan_max_index + (
+            np.int64(scan_indices[index])
+        )
+        push_counts[push_index + 1] += 1
+
+
+@alphatims.utils.njit(nogil=True)
+def expand_raw_ranges(raw_ranges: np.ndarray) -> np.ndarray:
+    """Expand (start, end) ranges of raw indices to individual raw indices.
+
+    Parameters
+    ----------
+    raw_ranges : np.int64[:, 2]
+        Each row of the array is a (start, end) tuple of raw indices.
+
+    Returns
+    -------
+    : np.int64[:]
+        The raw indices within all ranges.
+    """
+    raw_indices = np.empty(
+        np.sum(raw_ranges[:, 1] - raw_ranges[:, 0]),
+        dtype=np.int64
+    )
+    offset = 0
+    for start, end in raw_ranges:
+        for raw_index in range(start, end):
+            raw_indices[offset] = raw_index
+            offset += 1
+    return raw_indices
+
+
+def filter_indices(
+    frame_slices: np.ndarray,
+    scan_slices: np.ndarray,
+    precursor_slices: np.ndarray,
+    tof_slices: np.ndarray,
+    quad_slices: np.ndarray,
+    intensity_slices: np.ndarray,
+    frame_max_index: int,
+    scan_max_index: int,
+    push_indptr: np.ndarray,
+    precursor_indices: np.ndarray,
+    quad_mz_values: np.ndarray,
+    quad_indptr: np.ndarray,
+    tof_indices: np.ndarray,
+    intensities: np.ndarray,
+    push_tof_offsets: np.ndarray = None,
+    tof_deltas: np.ndarray = None,
+    tof_delta_overflow_indices: np.ndarray = None,
+    tof_delta_overflow_values: np.ndarray = None,
+):
+    """Filter raw indices by slices from all dimensions.
+
+    Frames are filtered in parallel with alphatims.utils.MAX_THREADS,
+    unless fewer than MIN_PARALLEL_FRAME_COUNT frames are selected.
+    A first pass counts the hits of each frame, after which a second pass
+    fills a preallocated array with all raw indices.
+
+    Parameters
+    ----------
+    frame_slices : np.int64[:, 3]
+        Each row of the array is assumed to be a (start, stop, step) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(frame_slices[:, :2].ravel()) >= 0) = True).
+    scan_slices : np.int64[:, 3]
+        Each row of the array is assumed to be a (start, stop, step) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(scan_slices[:, :2].ravel()) >= 0) = True).
+    precursor_slices : np.int64[:, 3]
+        Each row of the array is assumed to be a (start, stop, step) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(precursor_slices[:, :2].ravel()) >= 0) = True).
+    tof_slices : np.int64[:, 3]
+        Each row of the array is assumed to be a (start, stop, step) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(tof_slices[:, :2].ravel()) >= 0) = True).
+    quad_slices : np.float64[:, 2]
+        Each row of the array is assumed to be (lower_mz, upper_mz) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(quad_slices.ravel()) >= 0) = True).
+    intensity_slices : np.float64[:, 2]
+        Each row of the array is assumed to be (lower_mz, upper_mz) tuple.
+        This array is assumed to be sorted, disjunct and strictly increasing
+        (i.e. np.all(np.diff(intensity_slices.ravel()) >= 0) = True).
+    frame_max_index : int
+        The maximum frame index of a TimsTOF object.
+    scan_max_index : int
+        The maximum scan index of a TimsTOF object.
+    push_indptr : np.int64[:]
+        The self.push_indptr array of a TimsTOF object.
+    precursor_indices : np.int64[:]
+        The self.precursor_indices array of a TimsTOF object.
+    quad_mz_values : np.float64[:, 2]
+        The self.quad_mz_values array of a TimsTOF object.
+    quad_indptr : np.int64[:]
+        The self.quad_indptr array of a TimsTOF object.
+    tof_indices : np.uint32[:]
+        The self.tof_indices array of a TimsTOF object.
+    intensities : np.uint16[:]
+        The self.intensity_values array of a TimsTOF object.
+    push_tof_offsets : np.uint32[:], None
+        If not None, tof_indices are ignored and decoded on the fly from
+        push_tof_offsets, tof_deltas, tof_delta_overflow_indices and
+        tof_delta_overflow_values instead
+        (see alphatims.bruker.encode_tof_deltas).
+        Default is None.
+    tof_deltas : np.uint16[:], None
+        The uint16 tof deltas.
+        Default is None.
+    tof_delta_overflow_indices : np.int64[:], None
+        The raw indices whose delta did not fit in a uint16.
+        Default is None.
+    tof_delta_overflow_values : np.uint32[:], None
+        The deltas that did not fit in a uint16.
+        Default is None.
+
+    Returns
+    -------
+    : np.int64[:]
+        The raw indices that satisfy all the slices.
+    """
+    frame_indices = np.concatenate(
+        [np.empty(0, dtype=np.int64)] + [
+            np.arange(
+                max(frame_start, 0),
+                min(frame_stop, frame_max_index),
+                frame_step,
+                dtype=np.int64,
+            ) for frame_start, frame_stop, frame_step in frame_slices
+        ]
+    )
+    hit_counts = np.zeros(len(frame_indices), dtype=np.int64)
+    hit_offsets = np.zeros(len(frame_indices) + 1, dtype=np.int64)
+    result = np.empty(0, dtype=np.int64)
+    if (alphatims.utils.MAX_THREADS > 1) and (
+        len(frame_indices) >= MIN_PARALLEL_FRAME_COUNT
+    ):
+        filter_frames = filter_frame_block
+        frame_iterable = range(len(frame_indices))
+    else:
+        filter_frames = filter_frame_blocks
+        frame_iterable = np.arange(len(frame_indices))
+    for count_only in (True, False):
+        if not count_only:
+            hit_offsets[1:] = np.cumsum(hit_counts)
+            result = np.empty(hit_offsets[-1], dtype=np.int64)
+        filter_frames(
+            frame_iterable,
+            frame_indices,
+            scan_slices,
+            precursor_slices,
+            tof_slices,
+            quad_slices,
+            intensity_slices,
+            scan_max_index,
+            push_indptr,
+            precursor_indices,
+            quad_mz_values,
+            quad_indptr,
+            tof_indices,
+            intensities,
+            push_tof_offsets,
+            tof_deltas,
+            tof_delta_overflow_indices,
+            tof_delta_overflow_values,
+            hit_counts,
+            hit_offsets,
+            result,
+        )
+    return result
+
+
+@alphatims.utils.pjit(include_progress_callback=False)
+def filter_frame_block(
+    index: int,
+    frame_indices: np.ndarray,
+    scan_slices: np.ndarray,
+    precursor_slices: np.ndarray,
+    tof_slices: np.ndarray,
+    quad_slices: np.ndarray,
+    intensity_slices: np.ndarray,
+    scan_max_index: int,
+    push_indptr: np.ndarray,
+    precursor_indices: np.ndarray,
+    quad_mz_values: np.ndarray,
+    quad_indptr: np.ndarray,
+    tof_indices: np.ndarray,
+    intensities: np.ndarray,
+    push_tof_offsets: np.ndarray,
+    tof_deltas: np.ndarray,
+    tof_delta_overflow_indices: np.ndarray,
+    tof_delta_overflow_values: np.ndarray,
+    hit_counts: np.ndarray,
+    hit_offsets: np.ndarray,
+    result: np.ndarray,
+) -> None:
+    """Count or store the raw indices of a single frame that satisfy slices.
 
     IMPORTANT NOTE: This function is decorated with alphatims.utils.pjit.
     The first argument is thus expected to be provided as an iterable
@@ -2297,505 +6575,823 @@ def filter_spectra_by_abundant_peaks(
     Parameters
     ----------
     index : int
-        The push index whose intensity_values and tof_indices will be
-        centroided.
-    spectrum_indptr : np.int64[:]
-        An index pointer array defining the (untrimmed) spectrum boundaries.
-    spectrum_counts : np. int64[:]
-        The original array defining how many distinct tof indices each
-        spectrum has.
-    spectrum_tof_indices : np.uint32[:]
-        The original array containing tof indices.
-    spectrum_intensity_values : np.float64[:]
-        The original array containing intensity values.
-    keep_n_most_abundant_peaks : int
-        Keep only this many abundant peaks.
+        The index of the frame in frame_indices.
+    frame_indices : np.int64[:]
+        The selected frames.
+    scan_slices, precursor_slices, tof_slices : np.int64[:, 3]
+        See alphatims.bruker.filter_indices.
+    quad_slices, intensity_slices : np.float64[:, 2]
+        See alphatims.bruker.filter_indices.
+    scan_max_index : int
+        The maximum scan index of a TimsTOF object.
+    push_indptr, precursor_indices, quad_mz_values, quad_indptr : np.ndarray
+        See alphatims.bruker.filter_indices.
+    tof_indices, intensities : np.ndarray
+        See alphatims.bruker.filter_indices.
+    push_tof_offsets, tof_deltas : np.ndarray, None
+        See alphatims.bruker.filter_indices.
+    tof_delta_overflow_indices, tof_delta_overflow_values : np.ndarray, None
+        See alphatims.bruker.filter_indices.
+    hit_counts : np.int64[:]
+        A buffer to store the number of hits of each frame.
+    hit_offsets : np.int64[:]
+        The offset of each frame in result.
+    result : np.int64[:]
+        A buffer to store the raw indices of all frames.
+        If empty, hits are only counted.
     """
-    start = spectrum_indptr[index]
-    end = start + spectrum_counts[index]
-    if end - start <= keep_n_most_abundant_peaks:
-        return
-    mzs = spectrum_tof_indices[start: end]
-    ints = spectrum_intensity_values[start: end]
-    selected_indices = np.sort(
-        np.argsort(ints)[-keep_n_most_abundant_peaks:]
+    hit_counts[index] = filter_frame_indices(
+        frame_indices[index],
+        scan_slices,
+        precursor_slices,
+        tof_slices,
+        quad_slices,
+        intensity_slices,
+        scan_max_index,
+        push_indptr,
+        precursor_indices,
+        quad_mz_values,
+        quad_indptr,
+        tof_indices,
+        intensities,
+        push_tof_offsets,
+        tof_deltas,
+        tof_delta_overflow_indices,
+        tof_delta_overflow_values,
+        result,
+        hit_offsets[index],
     )
-    count = len(selected_indices)
-    spectrum_tof_indices[start: start + count] = mzs[selected_indices]
-    spectrum_intensity_values[start: start + count] = ints[selected_indices]
-    spectrum_counts[index] = count
 
 
-@alphatims.utils.pjit
-def trim_spectra(
-    index: int,
-    spectrum_tof_indices: np.ndarray,
-    spectrum_intensity_values: np.ndarray,
-    spectrum_indptr: np.ndarray,
-    trimmed_spectrum_tof_indices: np.ndarray,
-    trimmed_spectrum_intensity_values: np.ndarray,
-    new_spectrum_indptr: np.ndarray,
+@alphatims.utils.njit(nogil=True)
+def filter_frame_blocks(
+    indices: np.ndarray,
+    frame_indices: np.ndarray,
+    scan_slices: np.ndarray,
+    precursor_slices: np.ndarray,
+    tof_slices: np.ndarray,
+    quad_slices: np.ndarray,
+    intensity_slices: np.ndarray,
+    scan_max_index: int,
+    push_indptr: np.ndarray,
+    precursor_indices: np.ndarray,
+    quad_mz_values: np.ndarray,
+    quad_indptr: np.ndarray,
+    tof_indices: np.ndarray,
+    intensities: np.ndarray,
+    push_tof_offsets: np.ndarray,
+    tof_deltas: np.ndarray,
+    tof_delta_overflow_indices: np.ndarray,
+    tof_delta_overflow_values: np.ndarray,
+    hit_counts: np.ndarray,
+    hit_offsets: np.ndarray,
+    result: np.ndarray,
 ) -> None:
-    """Trim remaining bytes after merging of multiple pushes.
+    """Count or store the raw indices of frames that satisfy slices.
 
-    IMPORTANT NOTE: This function is decorated with alphatims.utils.pjit.
-    The first argument is thus expected to be provided as an iterable
-    containing ints instead of a single int.
+    This is the single-threaded equivalent of
+    alphatims.bruker.filter_frame_block.
 
     Parameters
     ----------
-    index : int
-        The push index whose intensity_values and tof_indices will be trimmed.
-    spectrum_tof_indices : np.uint32[:]
-        The original array containing tof indices.
-    spectrum_intensity_values : np.float64[:]
-        The original array containing intensity values.
-    spectrum_indptr : np.int64[:]
-        An index pointer array defining the original spectrum boundaries.
-    trimmed_spectrum_tof_indices : np.uint32[:]
-        A buffer array to store new tof indices.
-    trimmed_spectrum_intensity_values : np.float64[:]
-        A buffer array to store new intensity values.
-    new_spectrum_indptr : np.int64[:]
-        An index pointer array defining the trimmed spectrum boundaries.
+    indices : np.int64[:]
+        The indices of the frames in frame_indices.
+    frame_indices : np.int64[:]
+        The selected frames.
+    scan_slices, precursor_slices, tof_slices : np.int64[:, 3]
+        See alphatims.bruker.filter_indices.
+    quad_slices, intensity_slices : np.float64[:, 2]
+        See alphatims.bruker.filter_indices.
+    scan_max_index : int
+        The maximum scan index of a TimsTOF object.
+    push_indptr, precursor_indices, quad_mz_values, quad_indptr : np.ndarray
+        See alphatims.bruker.filter_indices.
+    tof_indices, intensities : np.ndarray
+        See alphatims.bruker.filter_indices.
+    push_tof_offsets, tof_deltas : np.ndarray, None
+        See alphatims.bruker.filter_indices.
+    tof_delta_overflow_indices, tof_delta_overflow_values : np.ndarray, None
+        See alphatims.bruker.filter_indices.
+    hit_counts : np.int64[:]
+        A buffer to store the number of hits of each frame.
+    hit_offsets : np.int64[:]
+        The offset of each frame in result.
+    result : np.int64[:]
+        A buffer to store the raw indices of all frames.
+        If empty, hits are only counted.
     """
-    start = spectrum_indptr[index]
-    new_start = new_spectrum_indptr[index]
-    new_end = new_spectrum_indptr[index + 1]
-    trimmed_spectrum_tof_indices[new_start: new_end] = spectrum_tof_indices[
-        start: start + new_end - new_start
-    ]
-    trimmed_spectrum_intensity_values[
-        new_start: new_end
-    ] = spectrum_intensity_values[
-        start: start + new_end - new_start
-    ]
-
+    for index in indices:
+        hit_counts[index] = filter_frame_indices(
+            frame_indices[index],
+            scan_slices,
+            precursor_slices,
+            tof_slices,
+            quad_slices,
+            intensity_slices,
+            scan_max_index,
+            push_indptr,
+            precursor_indices,
+            quad_mz_values,
+            quad_indptr,
+            tof_indices,
+            intensities,
+            push_tof_offsets,
+            tof_deltas,
+            tof_delta_overflow_indices,
+            tof_delta_overflow_values,
+            result,
+            hit_offsets[index],
+        )
 
-def parse_keys(data: TimsTOF, keys) -> dict:
-    """Convert different keys to a key dict with defined types.
 
-    NOTE: Negative slicing is not supported and all indiviudal keys
-    are assumed to be sorted, disjunct and strictly increasing
+@alphatims.utils.njit(nogil=True)
+def filter_push_tof_indices(
+    push_index: int,
+    sparse_start: int,
+    sparse_end: int,
+    tof_slices: np.ndarray,
+    tof_stops: np.ndarray,
+    intensity_slices: np.ndarray,
+    intensities: np.ndarray,
+    push_tof_offsets: np.ndarray,
+    tof_deltas: np.ndarray,
+    tof_delta_overflow_indices: np.ndarray,
+    tof_delta_overflow_values: np.ndarray,
+    push_tof_indices: np.ndarray,
+    result: np.ndarray,
+    hit_offset: int,
+) -> int:
+    """Count or store the raw indices of a single push that satisfy slices.
 
     Parameters
     ----------
-    data : alphatims.bruker.TimsTOF
-        The TimsTOF objext for which to get slices.
-    keys : tuple
-        A tuple of at most 5 elemens, containing
-        slices, ints, floats, Nones, and/or iterables.
-        See `alphatims.bruker.convert_slice_key_to_int_array` and
-        `alphatims.bruker.convert_slice_key_to_float_array` for more details.
+    push_index : int
+        The push to filter.
+    sparse_start : int
+        The first raw index of the push.
+    sparse_end : int
+        The last raw index (excluded) of the push.
+    tof_slices : np.int64[:, 3]
+        See alphatims.bruker.filter_indices.
+    tof_stops : np.int64[:]
+        The stops of the tof_slices.
+    intensity_slices : np.float64[:, 2]
+        See alphatims.bruker.filter_indices.
+    intensities : np.ndarray
+        See alphatims.bruker.filter_indices.
+    push_tof_offsets, tof_deltas : np.ndarray, None
+        See alphatims.bruker.filter_indices.
+    tof_delta_overflow_indices, tof_delta_overflow_values : np.ndarray, None
+        See alphatims.bruker.filter_indices.
+    push_tof_indices : np.uint32[:]
+        The tof_indices of a TimsTOF object, or a buffer that is large
+        enough to decode the push if push_tof_offsets is not None.
+    result : np.int64[:]
+        A buffer to store the raw indices.
+        If empty, hits are only counted.
+    hit_offset : int
+        The offset in result where to store the first hit of this push.
 
     Returns
     -------
-    : dict
-        The resulting dict always has the following items:
-            - "frame_indices": np.int64[:, 3]
-            - "scan_indices": np.int64[:, 3]
-            - "tof_indices": np.int64[:, 3]
-            - "precursor_indices": np.int64[:, 3]
-            - "quad_values": np.float64[:, 2]
-            - "intensity_values": np.float64[:, 2]
+    : int
+        The number of hits in this push.
     """
-    dimensions = [
-        "frame_indices",
-        "scan_indices",
-        "precursor_indices",
-        "tof_indices",
-    ]
-    dimension_slices = {}
-    if len(keys) > (len(dimensions) + 1):
-        raise KeyError(
-            "LC-IMS-MSMS data can be sliced in maximum 5 dimensions. "
-            "Integers are assumed to be indices, while "
-            "floats are assumed as values. Intensity is always casted "
-            "to integer values, regardless of input type."
+    store_hits = len(result) > 0
+    hit_count = 0
+    if push_tof_offsets is not None:
+        push_end = decode_push_tof_deltas(
+            sparse_start,
+            sparse_end,
+            push_tof_offsets[push_index],
+            tof_deltas,
+            tof_delta_overflow_indices,
+            tof_delta_overflow_values,
+            push_tof_indices,
+            tof_slices[-1, 1],
         )
-    if isinstance(keys[0], dict):
-        new_keys = []
-        dimension_translations = {
-            "frame_indices": "rt_values",
-            "scan_indices": "mobility_values",
-            "precursor_indices": "quad_mz_values",
-            "tof_indices": "mz_values",
-        }
-        for indices, values in dimension_translations.items():
-            if indices in keys[0]:
-                new_keys.append(keys[0][indices])
-            elif values in keys[0]:
-                new_keys.append(keys[0][values])
-            else:
-                new_keys.append(slice(None))
-        if "intensity_values" in keys[0]:
-            new_keys.append(keys[0]["intensity_values"])
-        keys = new_keys
-    for i, dimension in enumerate(dimensions):
-        try:
-            dimension_slices[
-                dimension
-            ] = convert_slice_key_to_int_array(
-                data,
-                keys[i] if (i < len(keys)) else slice(None),
-                dimension
+        offset = sparse_start
+    else:
+        offset = 0
+        push_end = sparse_end
+    # NOTE: merge-join the sorted tof_indices of this push with the
+    # sorted tof_slices, galloping over whichever side lags behind.
+    idx = sparse_start - offset
+    tof_slice_index = 0
+    while (idx < push_end) and (tof_slice_index < len(tof_slices)):
+        tof_value = np.int64(push_tof_indices[idx])
+        tof_start = tof_slices[tof_slice_index, 0]
+        if tof_value < tof_start:
+            idx = gallop_search(
+                push_tof_indices,
+                tof_start,
+                idx + 1,
+                push_end,
             )
-        except PrecursorFloatError:
-            dimension_slices[
-                "precursor_indices"
-            ] = convert_slice_key_to_int_array(
-                data,
-                slice(None),
-                "precursor_indices"
+            continue
+        tof_stop = tof_slices[tof_slice_index, 1]
+        if tof_value >= tof_stop:
+            tof_slice_index = gallop_search(
+                tof_stops,
+                tof_value + 1,
+                tof_slice_index + 1,
+                len(tof_slices),
             )
-            dimension_slices[
-                "quad_values"
-            ] = convert_slice_key_to_float_array(keys[i])
-    dimension_slices[
-        "intensity_values"
-    ] = convert_slice_key_to_float_array(
-        keys[-1] if (len(keys) > len(dimensions)) else slice(None)
-    )
-    if "quad_values" not in dimension_slices:
-        dimension_slices["quad_values"] = np.array(
-            [[-np.inf, np.inf]],
-            dtype=np.float64
-        )
-    return dimension_slices
-
+            continue
+        tof_step = tof_slices[tof_slice_index, 2]
+        if (tof_value - tof_start) % tof_step == 0:
+            intensity = intensities[idx + offset]
+            for (
+                low_intensity,
+                high_intensity
+            ) in intensity_slices:
+                if (low_intensity <= intensity):
+                    if (intensity <= high_intensity):
+                        if store_hits:
+                            result[hit_offset + hit_count] = (
+                                idx + offset
+                            )
+                        hit_count += 1
+                        break
+        idx += 1
+    return hit_count
 
-def convert_slice_key_to_float_array(key):
-    """Convert a key to a slice float array.
 
-    NOTE: This function should only be used for QUAD or DETECTOR dimensions.
+@alphatims.utils.njit(nogil=True)
+def filter_quad_segments(
+    segment_start: int,
+    segment_end: int,
+    quad_slices: np.ndarray,
+    precursor_slices: np.ndarray,
+    quad_mz_values: np.ndarray,
+    precursor_indices: np.ndarray,
+) -> np.ndarray:
+    """Find the quad segments that satisfy quad and precursor slices.
 
     Parameters
     ----------
-    key : slice, int, float, None, iterable
-        The key that needs to be converted.
+    segment_start : int
+        The first quad segment to check.
+    segment_end : int
+        The last quad segment (excluded) to check.
+    quad_slices : np.float64[:, 2]
+        See alphatims.bruker.filter_indices.
+    precursor_slices : np.int64[:, 3]
+        See alphatims.bruker.filter_indices.
+    quad_mz_values, precursor_indices : np.ndarray
+        The self.quad_mz_values and self.precursor_indices arrays of a
+        TimsTOF object.
 
     Returns
     -------
-    : np.float64[:, 2]
-        Each row represent a a (start, stop) slice.
-
-    Raises
-    ------
-    ValueError
-        When the key is an np.ndarray with more than 2 columns.
+    : np.int64[:]
+        The indices of the valid quad segments.
     """
-    try:
-        iter(key)
-    except TypeError:
-        if key is None:
-            key = slice(None)
-        if isinstance(key, slice):
-            start = key.start
-            if start is None:
-                start = -np.inf
-            stop = key.stop
-            if stop is None:
-                stop = np.inf
-        else:
-            start = key
-            stop = key
-        return np.array([[start, stop]], dtype=np.float64)
-    else:
-        if not isinstance(key, np.ndarray):
-            key = np.array(key, dtype=np.float64)
-        key = key.astype(np.float64)
-        if len(key.shape) == 1:
-            return np.array([key, key]).T
-        elif len(key.shape) == 2:
-            if key.shape[1] != 2:
-                raise ValueError
-            return key
-        else:
-            raise ValueError
-
+    valid_segments = np.empty(segment_end - segment_start, dtype=np.int64)
+    valid_count = 0
+    for segment_index in range(segment_start, segment_end):
+        if not valid_quad_mz_values(
+            quad_mz_values[segment_index, 0],
+            quad_mz_values[segment_index, 1],
+            quad_slices
+        ):
+            continue
+        if not valid_precursor_index(
+            precursor_indices[segment_index],
+            precursor_slices,
+        ):
+            continue
+        valid_segments[valid_count] = segment_index
+        valid_count += 1
+    return valid_segments[:valid_count]
 
-def convert_slice_key_to_int_array(data: TimsTOF, key, dimension: str):
-    """Convert a key of a data dimension to a slice integer array.
 
-    Parameters
-    ----------
-    data : alphatims.bruker.TimsTOF
-        The TimsTOF objext for which to get slices.
-    key : slice, int, float, None, iterable
-        The key that needs to be converted.
-    dimension : str
-        The dimension for which the key needs to be retrieved
+@alphatims.utils.njit(nogil=True)
+def filter_quad_segment_indices(
+    segment_indices: np.ndarray,
+    frame_slices: np.ndarray,
+    scan_slices: np.ndarray,
+    tof_slices: np.ndarray,
+    intensity_slices: np.ndarray,
+    scan_max_index: int,
+    raw_quad_indptr: np.ndarray,
+    push_indptr: np.ndarray,
+    tof_indices: np.ndarray,
+    intensities: np.ndarray,
+    push_tof_offsets: np.ndarray = None,
+    tof_deltas: np.ndarray = None,
+    tof_delta_overflow_indices: np.ndarray = None,
+    tof_delta_overflow_values: np.ndarray = None,
+) -> np.ndarray:
+    """Filter raw indices by only visiting pushes of valid quad segments.
+
+    Parameters
+    ----------
+    segment_indices : np.int64[:]
+        The sorted quad segments that satisfy the quad and precursor slices
+        (see alphatims.bruker.filter_quad_segments).
+    frame_slices, scan_slices, tof_slices : np.int64[:, 3]
+        See alphatims.bruker.filter_indices.
+        Starts of frame and scan slices are assumed to be non-negative.
+    intensity_slices : np.float64[:, 2]
+        See alphatims.bruker.filter_indices.
+    scan_max_index : int
+        The maximum scan index of a TimsTOF object.
+    raw_quad_indptr : np.int64[:]
+        The self.raw_quad_indptr array of a TimsTOF object,
+        with the push indices where each quad segment starts and ends.
+    push_indptr, tof_indices, intensities : np.ndarray
+        See alphatims.bruker.filter_indices.
+    push_tof_offsets, tof_deltas : np.ndarray, None
+        See alphatims.bruker.filter_indices.
+    tof_delta_overflow_indices, tof_delta_overflow_values : np.ndarray, None
+        See alphatims.bruker.filter_indices.
 
     Returns
     -------
-    : np.int64[:, 3]
-        Each row represent a a (start, stop, step) slice.
-
-    Raises
-    ------
-    ValueError
-        When the key contains elements other than int or float.
-    PrecursorFloatError
-        When trying to convert a quad float to precursor index.
+    : np.int64[:]
+        The sorted raw indices that satisfy all slices.
     """
-    result = np.empty((0, 3), dtype=np.int64)
-    inverse_of_scans = False
-    try:
-        iter(key)
-    except TypeError:
-        if key is None:
-            key = slice(None)
-        if isinstance(key, slice):
-            if dimension == "scan_indices":
-                if isinstance(key.start, (np.inexact, float)) or isinstance(key.stop, (np.inexact, float)):
-                    key = slice(key.stop, key.start, key.step)
-            start = key.start
-            if not isinstance(start, (np.integer, int)):
-                if start is None:
-                    if dimension == "scan_indices":
-                        start = np.inf
-                    else:
-                        start = -np.inf
-                if not isinstance(start, (np.inexact, float)):
-                    raise ValueError
-                start = data.convert_to_indices(
-                    start,
-                    return_type=dimension
-                )
-            stop = key.stop
-            if not isinstance(stop, (np.integer, int)):
-                if stop is None:
-                    if dimension == "scan_indices":
-                        stop = -np.inf
-                    else:
-                        stop = np.inf
-                if not isinstance(stop, (np.inexact, float)):
-                    raise ValueError
-                stop = data.convert_to_indices(
-                    stop,
-                    return_type=dimension,
-                )
-            step = key.step
-            if not isinstance(step, (np.integer, int)):
-                if step is not None:
-                    raise ValueError
-                step = 1
-            result = np.array([[start, stop, step]])
-        elif isinstance(key, (np.integer, int)):
-            result = np.array([[key, key + 1, 1]])
-        elif isinstance(key, (np.inexact, float)):
-            key = data.convert_to_indices(key, return_type=dimension)
-            if dimension == "scan_indices":
-                result = np.array([[key - 1, key, 1]])
-            else:
-                result = np.array([[key, key + 1, 1]])
-        else:
-            raise ValueError
-    else:
-        if not isinstance(key, np.ndarray):
-            key = np.array(key)
-        step = 1
-        if not isinstance(key.ravel()[0], np.integer):
-            key = data.convert_to_indices(key, return_type=dimension)
-            if dimension == "scan_indices":
-                key -= 1
-        if len(key.shape) == 1:
-            result = np.array([key, key + 1, np.repeat(step, key.size)]).T
-        elif len(key.shape) == 2:
-            if key.shape[1] != 3:
-                raise ValueError
-            result = key
-        else:
-            raise ValueError
-    if inverse_of_scans:
-        return result[:, [1, 0, 2]]
+    tof_stops = tof_slices[:, 1]
+    if push_tof_offsets is not None:
+        push_tof_indices = np.empty(0, dtype=np.uint32)
     else:
-        return result
+        push_tof_indices = tof_indices
+    result = np.empty(0, dtype=np.int64)
+    hit_count = 0
+    for store_hits in (False, True):
+        if store_hits:
+            if hit_count == 0:
+                break
+            result = np.empty(hit_count, dtype=np.int64)
+            hit_count = 0
+        for segment_index in segment_indices:
+            push_start = raw_quad_indptr[segment_index]
+            push_end = raw_quad_indptr[segment_index + 1]
+            if push_start >= push_end:
+                continue
+            for frame_index in range(
+                push_start // scan_max_index,
+                (push_end - 1) // scan_max_index + 1
+            ):
+                if not valid_precursor_index(frame_index, frame_slices):
+                    continue
+                push_offset = frame_index * scan_max_index
+                scan_low = max(push_start - push_offset, 0)
+                scan_high = min(push_end - push_offset, scan_max_index)
+                for scan_start, scan_stop, scan_step in scan_slices:
+                    if scan_start < scan_low:
+                        scan_start += -(
+                            (scan_start - scan_low) // scan_step
+                        ) * scan_step
+                    for scan_index in range(
+                        scan_start,
+                        min(scan_stop, scan_high),
+                        scan_step
+                    ):
+                        push_index = push_offset + scan_index
+                        sparse_start = push_indptr[push_index]
+                        sparse_end = push_indptr[push_index + 1]
+                        if sparse_start == sparse_end:
+                            continue
+                        if push_tof_offsets is not None:
+                            if sparse_end - sparse_start >= len(
+                                push_tof_indices
+                            ):
+                                push_tof_indices = np.empty(
+                                    2 * (sparse_end - sparse_start) + 1,
+                                    dtype=np.uint32
+                                )
+                        hit_count += filter_push_tof_indices(
+                            push_index,
+                            sparse_start,
+                            sparse_end,
+                            tof_slices,
+                            tof_stops,
+                            intensity_slices,
+                            intensities,
+                            push_tof_offsets,
+                            tof_deltas,
+                            tof_delta_overflow_indices,
+                            tof_delta_overflow_values,
+                            push_tof_indices,
+                            result,
+                            hit_count,
+                        )
+    return result
 
 
-@alphatims.utils.njit
-def calculate_dia_cycle_mask(
-    dia_mz_cycle: np.ndarray,
+@alphatims.utils.njit(nogil=True)
+def filter_frame_indices(
+    frame_index: int,
+    scan_slices: np.ndarray,
+    precursor_slices: np.ndarray,
+    tof_slices: np.ndarray,
     quad_slices: np.ndarray,
-    dia_precursor_cycle: np.ndarray = None,
-    precursor_slices: np.ndarray = None,
-):
-    """Calculate a boolean mask for cyclic push indices satisfying queries.
+    intensity_slices: np.ndarray,
+    scan_max_index: int,
+    push_indptr: np.ndarray,
+    precursor_indices: np.ndarray,
+    quad_mz_values: np.ndarray,
+    quad_indptr: np.ndarray,
+    tof_indices: np.ndarray,
+    intensities: np.ndarray,
+    push_tof_offsets: np.ndarray,
+    tof_deltas: np.ndarray,
+    tof_delta_overflow_indices: np.ndarray,
+    tof_delta_overflow_values: np.ndarray,
+    result: np.ndarray,
+    hit_offset: int,
+) -> int:
+    """Count or store the raw indices of a single frame that satisfy slices.
 
     Parameters
     ----------
-    dia_mz_cycle : np.float64[:, 2]
-        An array with (upper, lower) mz values of a DIA cycle (per push).
-    quad_slices : np.float64[:, 2]
-        Each row of the array is assumed to be (lower_mz, upper_mz) tuple.
-        This array is assumed to be sorted, disjunct and strictly increasing
-        (i.e. np.all(np.diff(quad_slices.ravel()) >= 0) = True).
-    dia_precursor_cycle : np.int64[:]
-        An array with precursor indices of a DIA cycle (per push).
-    precursor_slices : np.int64[:, 3]
-        Each row of the array is assumed to be a (start, stop, step) tuple.
-        This array is assumed to be sorted, disjunct and strictly increasing
-        (i.e. np.all(np.diff(precursor_slices[:, :2].ravel()) >= 0) = True).
+    frame_index : int
+        The frame to filter.
+    scan_slices, precursor_slices, tof_slices : np.int64[:, 3]
+        See alphatims.bruker.filter_indices.
+    quad_slices, intensity_slices : np.float64[:, 2]
+        See alphatims.bruker.filter_indices.
+    scan_max_index : int
+        The maximum scan index of a TimsTOF object.
+    push_indptr, precursor_indices, quad_mz_values, quad_indptr : np.ndarray
+        See alphatims.bruker.filter_indices.
+    tof_indices, intensities : np.ndarray
+        See alphatims.bruker.filter_indices.
+    push_tof_offsets, tof_deltas : np.ndarray, None
+        See alphatims.bruker.filter_indices.
+    tof_delta_overflow_indices, tof_delta_overflow_values : np.ndarray, None
+        See alphatims.bruker.filter_indices.
+    result : np.int64[:]
+        A buffer to store the raw indices.
+        If empty, hits are only counted.
+    hit_offset : int
+        The offset in result where to store the first hit of this frame.
 
     Returns
     -------
-    : np.bool_[:]
-        A mask that determines if a cyclic push index is valid given the
-        requested slices.
+    : int
+        The number of hits in this frame.
     """
-    mz_mask = np.zeros(len(dia_mz_cycle), dtype=np.bool_)
-    for i, (mz_start, mz_stop) in enumerate(dia_mz_cycle):
-        for quad_mz_start, quad_mz_stop in quad_slices:
-            if (quad_mz_start <= mz_stop) and (quad_mz_stop >= mz_start):
-                mz_mask[i] = True
-                break
-    if precursor_slices is not None:
-        precursor_mask = np.zeros(len(dia_mz_cycle), dtype=np.bool_)
-        for i, precursor_index in enumerate(dia_precursor_cycle):
-            for (start, stop, step) in precursor_slices:
-                if precursor_index in range(start, stop, step):
-                    precursor_mask[i] = True
-                    break
-        return mz_mask & precursor_mask
+    push_offset = frame_index * scan_max_index
+    hit_count = 0
+    tof_stops = tof_slices[:, 1]
+    if push_tof_offsets is not None:
+        push_tof_indices = np.empty(
+            np.max(
+                push_indptr[push_offset + 1: push_offset + scan_max_index + 1]
+                - push_indptr[push_offset: push_offset + scan_max_index]
+            ) + 1,
+            dtype=np.uint32
+        )
     else:
-        return mz_mask
+        push_tof_indices = tof_indices
+    quad_index = -1
+    new_quad_index = np.searchsorted(
+        quad_indptr,
+        push_indptr[push_offset],
+        "right"
+    ) - 2
+    quad_end = quad_indptr[new_quad_index + 1]
+    is_valid_quad_index = True
+    for scan_start, scan_stop, scan_step in scan_slices:
+        for scan_index in range(
+            max(scan_start, 0),
+            min(scan_stop, scan_max_index),
+            scan_step
+        ):
+            push_index = push_offset + scan_index
+            sparse_start = push_indptr[push_index]
+            sparse_end = push_indptr[push_index + 1]
+            if (sparse_start == sparse_end):
+                continue
+            while quad_end < sparse_end:
+                new_quad_index += 1
+                quad_end = quad_indptr[new_quad_index + 1]
+            if quad_index != new_quad_index:
+                quad_index = new_quad_index
+                if not valid_quad_mz_values(
+                    quad_mz_values[quad_index, 0],
+                    quad_mz_values[quad_index, 1],
+                    quad_slices
+                ):
+                    is_valid_quad_index = False
+                elif not valid_precursor_index(
+                    precursor_indices[quad_index],
+                    precursor_slices,
+                ):
+                    is_valid_quad_index = False
+                else:
+                    is_valid_quad_index = True
+            if not is_valid_quad_index:
+                continue
+            hit_count += filter_push_tof_indices(
+                push_index,
+                sparse_start,
+                sparse_end,
+                tof_slices,
+                tof_stops,
+                intensity_slices,
+                intensities,
+                push_tof_offsets,
+                tof_deltas,
+                tof_delta_overflow_indices,
+                tof_delta_overflow_values,
+                push_tof_indices,
+                result,
+                hit_offset + hit_count,
+            )
+    return hit_count
 
 
-@alphatims.utils.njit
-def valid_quad_mz_values(
-    low_mz_value: float,
-    high_mz_value: float,
+@alphatims.utils.pjit(include_progress_callback=False)
+def extract_query_intensities(
+    query_index: int,
+    query_order: np.ndarray,
+    frame_slices: np.ndarray,
+    scan_slices: np.ndarray,
+    tof_slices: np.ndarray,
     quad_slices: np.ndarray,
-) -> bool:
-    """Check if the low and high quad mz values are included in the slices.
+    scan_max_index: int,
+    push_indptr: np.ndarray,
+    quad_mz_values: np.ndarray,
+    quad_indptr: np.ndarray,
+    tof_indices: np.ndarray,
+    intensities: np.ndarray,
+    push_tof_offsets: np.ndarray,
+    tof_deltas: np.ndarray,
+    tof_delta_overflow_indices: np.ndarray,
+    tof_delta_overflow_values: np.ndarray,
+    max_push_count: int,
+    xics: np.ndarray,
+) -> None:
+    """Sum the intensities of a single query box per frame.
 
-    NOTE: Just a part of the quad range needs to overlap with a part
-    of a single slice.
+    IMPORTANT NOTE: This function is decorated with alphatims.utils.pjit.
+    The first argument is thus expected to be provided as an iterable
+    containing ints instead of a single int.
 
     Parameters
     ----------
-    low_mz_value : float
-        The lower mz value of the current quad selection.
-    high_mz_value : float
-        The upper mz value of the current quad selection.
+    query_index : int
+        The index of the query in query_order.
+    query_order : np.int64[:]
+        The order in which queries are processed.
+    frame_slices : np.int64[:, 2]
+        The (start, stop) frame indices of each query.
+    scan_slices : np.int64[:, 2]
+        The (start, stop) scan indices of each query.
+    tof_slices : np.int64[:, 2]
+        The (start, stop) tof indices of each query.
     quad_slices : np.float64[:, 2]
-        Each row of the array is assumed to be (lower_mz, upper_mz) tuple.
-        This array is assumed to be sorted, disjunct and strictly increasing
-        (i.e. np.all(np.diff(quad_slices.ravel()) >= 0) = True).
+        The (lower_mz, upper_mz) quad values of each query.
+    scan_max_index : int
+        The maximum scan index of a TimsTOF object.
+    push_indptr, quad_mz_values, quad_indptr : np.ndarray
+        See alphatims.bruker.filter_indices.
+    tof_indices, intensities : np.ndarray
+        See alphatims.bruker.filter_indices.
+    push_tof_offsets, tof_deltas : np.ndarray, None
+        See alphatims.bruker.filter_indices.
+    tof_delta_overflow_indices, tof_delta_overflow_values : np.ndarray, None
+        See alphatims.bruker.filter_indices.
+    max_push_count : int
+        The maximum number of detector events in a single push.
+    xics : np.float64[:, :]
+        A buffer with a row per query and a column per frame,
+        to which the summed intensities are written.
+    """
+    query = query_order[query_index]
+    if push_tof_offsets is not None:
+        push_tof_indices = np.empty(max_push_count + 1, dtype=np.uint32)
+    else:
+        push_tof_indices = tof_indices
+    tof_start = tof_slices[query, 0]
+    tof_stop = tof_slices[query, 1]
+    for frame_index in range(frame_slices[query, 0], frame_slices[query, 1]):
+        push_offset = frame_index * scan_max_index
+        quad_index = -1
+        new_quad_index = np.searchsorted(
+            quad_indptr,
+            push_indptr[push_offset],
+            "right"
+        ) - 2
+        quad_end = quad_indptr[new_quad_index + 1]
+        is_valid_quad_index = True
+        summed_intensity = 0.
+        for scan_index in range(scan_slices[query, 0], scan_slices[query, 1]):
+            push_index = push_offset + scan_index
+            sparse_start = push_indptr[push_index]
+            sparse_end = push_indptr[push_index + 1]
+            if (sparse_start == sparse_end):
+                continue
+            while quad_end < sparse_end:
+                new_quad_index += 1
+                quad_end = quad_indptr[new_quad_index + 1]
+            if quad_index != new_quad_index:
+                quad_index = new_quad_index
+                is_valid_quad_index = valid_quad_mz_values(
+                    quad_mz_values[quad_index, 0],
+                    quad_mz_values[quad_index, 1],
+                    quad_slices[query: query + 1],
+                )
+            if not is_valid_quad_index:
+                continue
+            if push_tof_offsets is not None:
+                push_end = decode_push_tof_deltas(
+                    sparse_start,
+                    sparse_end,
+                    push_tof_offsets[push_index],
+                    tof_deltas,
+                    tof_delta_overflow_indices,
+                    tof_delta_overflow_values,
+                    push_tof_indices,
+                    tof_stop,
+                )
+                offset = sparse_start
+            else:
+                offset = 0
+                push_end = sparse_end
+            idx = gallop_search(
+                push_tof_indices,
+                tof_start,
+                sparse_start - offset,
+                push_end,
+            )
+            while (idx < push_end) and (push_tof_indices[idx] < tof_stop):
+                summed_intensity += intensities[idx + offset]
+                idx += 1
+        xics[query, frame_index] = summed_intensity
 
-    Returns
-    -------
-    : bool
-        True if some part of the quad overlaps with some part of some slice.
-        False if there is no overlap in the range.
+
+@alphatims.utils.pjit(include_progress_callback=False)
+def count_tof_index_chunk(
+    chunk_index: int,
+    chunk_indptr: np.ndarray,
+    tof_indices: np.ndarray,
+    chunk_counts: np.ndarray,
+) -> None:
+    """Count the tof_indices of a chunk of raw indices.
+
+    IMPORTANT NOTE: This function is decorated with alphatims.utils.pjit.
+    The first argument is thus expected to be provided as an iterable
+    containing ints instead of a single int.
+
+    Parameters
+    ----------
+    chunk_index : int
+        The chunk to count.
+    chunk_indptr : np.int64[:]
+        The raw indices where each chunk starts and ends.
+    tof_indices : np.uint32[:]
+        The self.tof_indices array of a TimsTOF object.
+    chunk_counts : np.int64[:, :]
+        A buffer with a row per chunk and a column per tof index.
     """
-    slice_index = np.searchsorted(
-        quad_slices[:, 0].ravel(),
-        high_mz_value,
-        "right"
-    )
-    if slice_index == 0:
-        return False
-    if low_mz_value <= quad_slices[slice_index - 1, 1]:
-        return True
-    return False
+    for raw_index in range(
+        chunk_indptr[chunk_index],
+        chunk_indptr[chunk_index + 1]
+    ):
+        chunk_counts[chunk_index, tof_indices[raw_index]] += 1
 
 
-@alphatims.utils.njit
-def valid_precursor_index(
-    precursor_index: int,
-    precursor_slices: np.ndarray
-) -> bool:
-    """Check if a precursor index is included in the slices.
+@alphatims.utils.pjit(include_progress_callback=False)
+def fill_tof_index_chunk(
+    chunk_index: int,
+    chunk_indptr: np.ndarray,
+    tof_indices: np.ndarray,
+    chunk_offsets: np.ndarray,
+    tof_index_raw_indices: np.ndarray,
+) -> None:
+    """Store the raw indices of a chunk at their tof index position.
+
+    IMPORTANT NOTE: This function is decorated with alphatims.utils.pjit.
+    The first argument is thus expected to be provided as an iterable
+    containing ints instead of a single int.
 
     Parameters
     ----------
-    precursor_index : int
-        The precursor index to validate.
-    precursor_slices : np.int64[:, 3]
-        Each row of the array is assumed to be a (start, stop, step) tuple.
-        This array is assumed to be sorted, disjunct and strictly increasing
-        (i.e. np.all(np.diff(precursor_slices[:, :2].ravel()) >= 0) = True).
+    chunk_index : int
+        The chunk to store.
+    chunk_indptr : np.int64[:]
+        The raw indices where each chunk starts and ends.
+    tof_indices : np.uint32[:]
+        The self.tof_indices array of a TimsTOF object.
+    chunk_offsets : np.int64[:, :]
+        The position in tof_index_raw_indices where the next raw index of
+        each chunk and tof index needs to be stored.
+    tof_index_raw_indices : np.ndarray
+        A buffer for the raw indices, sorted by tof index.
+    """
+    for raw_index in range(
+        chunk_indptr[chunk_index],
+        chunk_indptr[chunk_index + 1]
+    ):
+        tof_index = tof_indices[raw_index]
+        tof_index_raw_indices[chunk_offsets[chunk_index, tof_index]] = (
+            raw_index
+        )
+        chunk_offsets[chunk_index, tof_index] += 1
+
+
+@alphatims.utils.pjit(include_progress_callback=False)
+def fill_intensity_pyramid_chunk(
+    chunk_index: int,
+    chunk_indptr: np.ndarray,
+    scan_max_index: int,
+    push_indptr: np.ndarray,
+    tof_indices: np.ndarray,
+    intensities: np.ndarray,
+    tof_bin_size: int,
+    frame_scan: np.ndarray,
+    frame_tof: np.ndarray,
+    scan_tof_chunks: np.ndarray,
+) -> None:
+    """Sum the intensities of a chunk of frames in the intensity pyramids.
 
-    Returns
-    -------
-    : bool
-        True if the precursor index is present in any of the slices.
-        False otherwise.
+    IMPORTANT NOTE: This function is decorated with alphatims.utils.pjit.
+    The first argument is thus expected to be provided as an iterable
+    containing ints instead of a single int.
+
+    Parameters
+    ----------
+    chunk_index : int
+        The chunk to sum.
+    chunk_indptr : np.int64[:]
+        The frame indices where each chunk starts and ends.
+    scan_max_index : int
+        The maximum scan index of a TimsTOF object.
+    push_indptr : np.int64[:]
+        The self.push_indptr array of a TimsTOF object.
+    tof_indices : np.uint32[:]
+        The self.tof_indices array of a TimsTOF object.
+    intensities : np.uint16[:]
+        The self.intensity_values array of a TimsTOF object.
+    tof_bin_size : int
+        The number of consecutive tof indices in a single tof bin.
+    frame_scan : np.float64[:, :]
+        A buffer with summed intensities per frame and scan.
+    frame_tof : np.float64[:, :]
+        A buffer with summed intensities per frame and tof bin.
+    scan_tof_chunks : np.float64[:, :, :]
+        A buffer with summed intensities per chunk, scan and tof bin.
     """
-    slice_index = np.searchsorted(
-        precursor_slices[:, 0].ravel(),
-        precursor_index,
-        side="right"
-    )
-    if slice_index == 0:
-        return False
-    return precursor_index in range(
-        precursor_slices[slice_index - 1, 0],
-        precursor_slices[slice_index - 1, 1],
-        precursor_slices[slice_index - 1, 2],
-    )
+    for frame_index in range(
+        chunk_indptr[chunk_index],
+        chunk_indptr[chunk_index + 1]
+    ):
+        for scan_index in range(scan_max_index):
+            push_index = frame_index * scan_max_index + scan_index
+            for raw_index in range(
+                push_indptr[push_index],
+                push_indptr[push_index + 1]
+            ):
+                intensity = intensities[raw_index]
+                tof_bin = np.int64(tof_indices[raw_index]) // tof_bin_size
+                frame_scan[frame_index, scan_index] += intensity
+                frame_tof[frame_index, tof_bin] += intensity
+                scan_tof_chunks[chunk_index, scan_index, tof_bin] += intensity
 
 
-@alphatims.utils.njit
-def filter_indices(
+@alphatims.utils.njit(nogil=True)
+def filter_tof_index(
     frame_slices: np.ndarray,
     scan_slices: np.ndarray,
     precursor_slices: np.ndarray,
     tof_slices: np.ndarray,
     quad_slices: np.ndarray,
     intensity_slices: np.ndarray,
-    frame_max_index: int,
     scan_max_index: int,
     push_indptr: np.ndarray,
     precursor_indices: np.ndarray,
     quad_mz_values: np.ndarray,
     quad_indptr: np.ndarray,
-    tof_indices: np.ndarray,
+    tof_index_indptr: np.ndarray,
+    tof_index_raw_indices: np.ndarray,
     intensities: np.ndarray,
-):
-    """Filter raw indices by slices from all dimensions.
+) -> np.ndarray:
+    """Filter raw indices by slices, starting from an inverted tof index.
+
+    This is equivalent to alphatims.bruker.filter_indices,
+    but only detector events within the tof slices are visited.
 
     Parameters
     ----------
-    frame_slices : np.int64[:, 3]
-        Each row of the array is assumed to be a (start, stop, step) tuple.
-        This array is assumed to be sorted, disjunct and strictly increasing
-        (i.e. np.all(np.diff(frame_slices[:, :2].ravel()) >= 0) = True).
-    scan_slices : np.int64[:, 3]
-        Each row of the array is assumed to be a (start, stop, step) tuple.
-        This array is assumed to be sorted, disjunct and strictly increasing
-        (i.e. np.all(np.diff(scan_slices[:, :2].ravel()) >= 0) = True).
-    precursor_slices : np.int64[:, 3]
-        Each row of the array is assumed to be a (start, stop, step) tuple.
-        This array is assumed to be sorted, disjunct and strictly increasing
-        (i.e. np.all(np.diff(precursor_slices[:, :2].ravel()) >= 0) = True).
+    frame_slices, scan_slices, precursor_slices : np.int64[:, 3]
+        See alphatims.bruker.filter_indices.
     tof_slices : np.int64[:, 3]
-        Each row of the array is assumed to be a (start, stop, step) tuple.
-        This array is assumed to be sorted, disjunct and strictly increasing
-        (i.e. np.all(np.diff(tof_slices[:, :2].ravel()) >= 0) = True).
-    quad_slices : np.float64[:, 2]
-        Each row of the array is assumed to be (lower_mz, upper_mz) tuple.
-        This array is assumed to be sorted, disjunct and strictly increasing
-        (i.e. np.all(np.diff(quad_slices.ravel()) >= 0) = True).
-    intensity_slices : np.float64[:, 2]
-        Each row of the array is assumed to be (lower_mz, upper_mz) tuple.
-        This array is assumed to be sorted, disjunct and strictly increasing
-        (i.e. np.all(np.diff(intensity_slices.ravel()) >= 0) = True).
-    frame_max_index : int
-        The maximum frame index of a TimsTOF object.
+        See alphatims.bruker.filter_indices.
+    quad_slices, intensity_slices : np.float64[:, 2]
+        See alphatims.bruker.filter_indices.
     scan_max_index : int
         The maximum scan index of a TimsTOF object.
-    push_indptr : np.int64[:]
-        The self.push_indptr array of a TimsTOF object.
-    precursor_indices : np.int64[:]
-        The self.precursor_indices array of a TimsTOF object.
-    quad_mz_values : np.float64[:, 2]
-        The self.quad_mz_values array of a TimsTOF object.
-    quad_indptr : np.int64[:]
-        The self.quad_indptr array of a TimsTOF object.
-    tof_indices : np.uint32[:]
-        The self.tof_indices array of a TimsTOF object.
+    push_indptr, precursor_indices, quad_mz_values, quad_indptr : np.ndarray
+        See alphatims.bruker.filter_indices.
+    tof_index_indptr : np.int64[:]
+        The start of each tof index in tof_index_raw_indices.
+    tof_index_raw_indices : np.ndarray
+        All raw indices, sorted by tof index.
     intensities : np.uint16[:]
         The self.intensity_values array of a TimsTOF object.
 
@@ -2804,76 +7400,105 @@ def filter_indices(
     : np.int64[:]
         The raw indices that satisfy all the slices.
     """
-    result = []
-    quad_index = -1
-    new_quad_index = -1
-    quad_end = -1
-    is_valid_quad_index = True
-    starts = push_indptr[:-1].reshape(
-        frame_max_index,
-        scan_max_index
-    )
-    ends = push_indptr[1:].reshape(
-        frame_max_index,
-        scan_max_index
-    )
-    for frame_start, frame_stop, frame_step in frame_slices:
-        for frame_start_slice, frame_end_slice in zip(
-            starts[slice(frame_start, frame_stop, frame_step)],
-            ends[slice(frame_start, frame_stop, frame_step)]
+    tof_max_index = len(tof_index_indptr) - 1
+    candidate_count = 0
+    for tof_start, tof_stop, tof_step in tof_slices:
+        for tof_index in range(
+            max(tof_start, 0),
+            min(tof_stop, tof_max_index),
+            tof_step
         ):
-            for scan_start, scan_stop, scan_step in scan_slices:
-                for sparse_start, sparse_end in zip(
-                    frame_start_slice[slice(scan_start, scan_stop, scan_step)],
-                    frame_end_slice[slice(scan_start, scan_stop, scan_step)]
-                ):
-                    if (sparse_start == sparse_end):
-                        continue
-                    while quad_end < sparse_end:
-                        new_quad_index += 1
-                        quad_end = quad_indptr[new_quad_index + 1]
-                    if quad_index != new_quad_index:
-                        quad_index = new_quad_index
-                        if not valid_quad_mz_values(
-                            quad_mz_values[quad_index, 0],
-                            quad_mz_values[quad_index, 1],
-                            quad_slices
-                        ):
-                            is_valid_quad_index = False
-                        elif not valid_precursor_index(
-                            precursor_indices[quad_index],
-                            precursor_slices,
-                        ):
-                            is_valid_quad_index = False
-                        else:
-                            is_valid_quad_index = True
-                    if not is_valid_quad_index:
-                        continue
-                    idx = sparse_start
-                    for tof_start, tof_stop, tof_step in tof_slices:
-                        idx += np.searchsorted(
-                            tof_indices[idx: sparse_end],
-                            tof_start
-                        )
-                        tof_value = tof_indices[idx]
-                        while (tof_value < tof_stop) and (idx < sparse_end):
-                            if tof_value in range(
-                                tof_start,
-                                tof_stop,
-                                tof_step
-                            ):
-                                intensity = intensities[idx]
-                                for (
-                                    low_intensity,
-                                    high_intensity
-                                ) in intensity_slices:
-                                    if (low_intensity <= intensity):
-                                        if (intensity <= high_intensity):
-                                            result.append(idx)
-                                            break
-                            idx += 1
-                            tof_value = tof_indices[idx]
-    return np.array(result)
+            candidate_count += (
+                tof_index_indptr[tof_index + 1] - tof_index_indptr[tof_index]
+            )
+    candidates = np.empty(candidate_count, dtype=np.int64)
+    candidate_count = 0
+    for tof_start, tof_stop, tof_step in tof_slices:
+        for tof_index in range(
+            max(tof_start, 0),
+            min(tof_stop, tof_max_index),
+            tof_step
+        ):
+            for raw_index in tof_index_raw_indices[
+                tof_index_indptr[tof_index]: tof_index_indptr[tof_index + 1]
+            ]:
+                candidates[candidate_count] = raw_index
+                candidate_count += 1
+    candidates.sort()
+    push_indices = indptr_lookup(push_indptr, candidates)
+    quad_indices = indptr_lookup(quad_indptr, candidates)
+    result = np.empty(len(candidates), dtype=np.int64)
+    hit_count = 0
+    for raw_index, push_index, quad_index in zip(
+        candidates,
+        push_indices,
+        quad_indices
+    ):
+        # NOTE: valid_precursor_index works for any np.int64[:, 3] slices
+        if not valid_precursor_index(
+            push_index // scan_max_index,
+            frame_slices
+        ):
+            continue
+        if not valid_precursor_index(push_index % scan_max_index, scan_slices):
+            continue
+        if not valid_quad_mz_values(
+            quad_mz_values[quad_index, 0],
+            quad_mz_values[quad_index, 1],
+            quad_slices
+        ):
+            continue
+        if not valid_precursor_index(
+            precursor_indices[quad_index],
+            precursor_slices,
+        ):
+            continue
+        intensity = intensities[raw_index]
+        for low_intensity, high_intensity in intensity_slices:
+            if (low_intensity <= intensity) and (intensity <= high_intensity):
+                result[hit_count] = raw_index
+                hit_count += 1
+                break
+    return result[:hit_count]
+
+
+@alphatims.utils.njit(nogil=True)
+def gallop_search(
+    array: np.ndarray,
+    value: int,
+    start: int,
+    end: int,
+) -> int:
+    """Find the first index of a value in a sorted part of an array.
+
+    The search gallops (i.e. doubles its step size) from the start,
+    before a binary search is performed.
+    This is fast both when the value is near the start and when it is far.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        A sorted array.
+    value : int
+        The value to search for.
+    start : int
+        The first index of the part of the array to search in.
+    end : int
+        The last index (excluded) of the part of the array to search in.
+
+    Returns
+    -------
+    : int
+        The first index in range(start, end) with array[index] >= value,
+        or end if no such index exists.
+    """
+    low = start
+    bound = 1
+    while (start + bound - 1 < end) and (array[start + bound - 1] < value):
+        low = start + bound
+        bound *= 2
+    high = min(start + bound - 1, end)
+    return low + np.searchsorted(array[low: high], value)
 
 
 # Overhead of using more than 1 threads is actually slower
@@ -2913,6 +7538,257 @@ def add_intensity_to_bin(
         ] += intensity
 
 
+@alphatims.utils.njit(nogil=True)
+def advance_indptr_index(
+    indptr: np.ndarray,
+    value: int,
+    index: int,
+    max_linear_steps: int = 16,
+) -> int:
+    """Find the last index of an indptr that is at most a value.
+
+    The indptr is first traversed linearly from the index,
+    as the next value is often near,
+    before gallop_search is used to skip large gaps.
+
+    Parameters
+    ----------
+    indptr : np.int64[:]
+        A sorted array of index pointers.
+    value : int
+        The value to look up.
+    index : int
+        An index with indptr[index] <= value.
+    max_linear_steps : int
+        The number of linear steps before galloping.
+        Default is 16.
+
+    Returns
+    -------
+    : int
+        The same as np.searchsorted(indptr, value, "right") - 1.
+    """
+    for step in range(max_linear_steps):
+        if value < indptr[index + 1]:
+            return index
+        index += 1
+    return gallop_search(indptr, value + 1, index + 1, len(indptr)) - 1
+
+
+@alphatims.utils.njit(nogil=True)
+def convert_raw_index_range(
+    start: int,
+    end: int,
+    raw_indices: np.ndarray,
+    raw_indices_sorted: bool,
+    scan_max_index: int,
+    push_indptr: np.ndarray,
+    quad_indptr: np.ndarray,
+    tof_indices: np.ndarray,
+    push_tof_offsets: np.ndarray,
+    tof_deltas: np.ndarray,
+    tof_delta_overflow_indices: np.ndarray,
+    tof_delta_overflow_values: np.ndarray,
+    intensities: np.ndarray,
+    precursor_indices: np.ndarray,
+    rt_values: np.ndarray,
+    mobility_values: np.ndarray,
+    mz_values: np.ndarray,
+    quad_mz_values: np.ndarray,
+    push_buffer: np.ndarray,
+    frame_buffer: np.ndarray,
+    scan_buffer: np.ndarray,
+    quad_buffer: np.ndarray,
+    precursor_buffer: np.ndarray,
+    tof_buffer: np.ndarray,
+    rt_buffer: np.ndarray,
+    rt_min_buffer: np.ndarray,
+    mobility_buffer: np.ndarray,
+    quad_low_buffer: np.ndarray,
+    quad_high_buffer: np.ndarray,
+    mz_buffer: np.ndarray,
+    intensity_buffer: np.ndarray,
+) -> None:
+    """Fill all requested coordinates of raw indices in a single pass.
+
+    Parameters
+    ----------
+    start : int
+        The first position in raw_indices to convert.
+    end : int
+        The last position (excluded) in raw_indices to convert.
+    raw_indices : np.int64[:]
+        The raw indices to convert.
+    raw_indices_sorted : bool
+        If True, raw_indices are assumed to be sorted and push and quad
+        indices are found by galloping from the previous raw index.
+    scan_max_index : int
+        The maximum scan index of a TimsTOF object.
+    push_indptr, quad_indptr, intensities : np.ndarray
+        The self.push_indptr, self.quad_indptr and self.intensity_values
+        arrays of a TimsTOF object.
+    tof_indices : np.uint32[:]
+        The self.tof_indices array of a TimsTOF object.
+        This array is ignored if push_tof_offsets is not None.
+    push_tof_offsets, tof_deltas : np.ndarray
+        If not None, the compact tof arrays of a TimsTOF object.
+    tof_delta_overflow_indices, tof_delta_overflow_values : np.ndarray
+        If not None, the compact tof overflow arrays of a TimsTOF object.
+    precursor_indices, rt_values, mobility_values : np.ndarray
+        The self.precursor_indices, self.rt_values and self.mobility_values
+        arrays of a TimsTOF object.
+    mz_values, quad_mz_values : np.ndarray
+        The self.mz_values and self.quad_mz_values arrays of a TimsTOF
+        object.
+    *_buffer : np.ndarray
+        Buffers with the length of raw_indices for each requested column.
+        Buffers of columns that are not requested have length 0.
+    """
+    fill_push = len(push_buffer) > 0
+    fill_frame = len(frame_buffer) > 0
+    fill_scan = len(scan_buffer) > 0
+    fill_rt = len(rt_buffer) > 0
+    fill_rt_min = len(rt_min_buffer) > 0
+    fill_mobility = len(mobility_buffer) > 0
+    fill_quad = len(quad_buffer) > 0
+    fill_precursor = len(precursor_buffer) > 0
+    fill_quad_low = len(quad_low_buffer) > 0
+    fill_quad_high = len(quad_high_buffer) > 0
+    fill_tof = len(tof_buffer) > 0
+    fill_mz = len(mz_buffer) > 0
+    fill_intensity = len(intensity_buffer) > 0
+    requires_push = fill_push or fill_frame or fill_scan or fill_rt or (
+        fill_rt_min or fill_mobility
+    )
+    requires_quad = fill_quad or fill_precursor or fill_quad_low or (
+        fill_quad_high
+    )
+    requires_tof = fill_tof or fill_mz
+    push_index = -1
+    quad_index = -1
+    previous_raw_index = -1
+    coordinate_push_index = -1
+    frame_index = 0
+    scan_index = 0
+    decoded_push_index = -1
+    decoded_index = -1
+    tof_index = np.int64(0)
+    for i in range(start, end):
+        raw_index = np.int64(raw_indices[i])
+        unsorted = (not raw_indices_sorted) or (raw_index < previous_raw_index)
+        previous_raw_index = raw_index
+        if requires_push or (
+            requires_tof and (push_tof_offsets is not None)
+        ):
+            if unsorted or (push_index < 0):
+                push_index = np.searchsorted(
+                    push_indptr,
+                    raw_index,
+                    "right"
+                ) - 1
+            elif raw_index >= push_indptr[push_index + 1]:
+                push_index = advance_indptr_index(
+                    push_indptr,
+                    raw_index,
+                    push_index + 1,
+                )
+            if push_index != coordinate_push_index:
+                coordinate_push_index = push_index
+                frame_index = push_index // scan_max_index
+                scan_index = push_index - frame_index * scan_max_index
+            if fill_push:
+                push_buffer[i] = push_index
+            if fill_frame:
+                frame_buffer[i] = frame_index
+            if fill_scan:
+                scan_buffer[i] = scan_index
+            if fill_rt:
+                rt_buffer[i] = rt_values[frame_index]
+            if fill_rt_min:
+                rt_min_buffer[i] = rt_values[frame_index] / 60
+            if fill_mobility:
+                mobility_buffer[i] = mobility_values[scan_index]
+        if requires_quad:
+            if unsorted or (quad_index < 0):
+                quad_index = np.searchsorted(
+                    quad_indptr,
+                    raw_index,
+                    "right"
+                ) - 1
+            elif raw_index >= quad_indptr[quad_index + 1]:
+                quad_index = advance_indptr_index(
+                    quad_indptr,
+                    raw_index,
+                    quad_index + 1,
+                )
+            if fill_quad:
+                quad_buffer[i] = quad_index
+            if fill_precursor:
+                precursor_buffer[i] = precursor_indices[quad_index]
+            if fill_quad_low:
+                quad_low_buffer[i] = quad_mz_values[quad_index, 0]
+            if fill_quad_high:
+                quad_high_buffer[i] = quad_mz_values[quad_index, 1]
+        if requires_tof:
+            if push_tof_offsets is not None:
+                if (push_index != decoded_push_index) or (
+                    decoded_index > raw_index
+                ):
+                    decoded_push_index = push_index
+                    decoded_index = np.int64(push_indptr[push_index])
+                    tof_index = np.int64(push_tof_offsets[push_index])
+                while decoded_index <= raw_index:
+                    delta = tof_deltas[decoded_index]
+                    if delta == MAX_TOF_DELTA:
+                        tof_index += np.int64(
+                            tof_delta_overflow_values[
+                                np.searchsorted(
+                                    tof_delta_overflow_indices,
+                                    decoded_index
+                                )
+                            ]
+                        )
+                    else:
+                        tof_index += np.int64(delta)
+                    decoded_index += 1
+            else:
+                tof_index = np.int64(tof_indices[raw_index])
+            if fill_tof:
+                tof_buffer[i] = tof_index
+            if fill_mz:
+                mz_buffer[i] = mz_values[tof_index]
+        if fill_intensity:
+            intensity_buffer[i] = intensities[raw_index]
+
+
+@alphatims.utils.pjit(include_progress_callback=False)
+def convert_raw_index_chunk(
+    chunk_index: int,
+    chunk_indptr: np.ndarray,
+    *args,
+) -> None:
+    """Convert a chunk of raw indices.
+
+    IMPORTANT NOTE: This function is decorated with alphatims.utils.pjit.
+    The first argument is thus expected to be provided as an iterable
+    containing ints instead of a single int.
+
+    Parameters
+    ----------
+    chunk_index : int
+        The chunk to convert.
+    chunk_indptr : np.int64[:]
+        The positions in raw_indices where each chunk starts and ends.
+    *args
+        See alphatims.bruker.convert_raw_index_range.
+    """
+    convert_raw_index_range(
+        chunk_indptr[chunk_index],
+        chunk_indptr[chunk_index + 1],
+        *args
+    )
+
+
 @alphatims.utils.njit(nogil=True)
 def indptr_lookup(
     targets: np.ndarray,
@@ -2944,9 +7820,50 @@ def indptr_lookup(
         The indices of queries in targets.
     """
     hits = np.empty_like(queries)
-    target_index = 0
+    fill_indptr_hits(
+        targets,
+        queries,
+        hits,
+        0,
+        len(queries),
+        0,
+        momentum_amplifier,
+    )
+    return hits
+
+
+@alphatims.utils.njit(nogil=True)
+def fill_indptr_hits(
+    targets: np.ndarray,
+    queries: np.ndarray,
+    hits: np.ndarray,
+    start: int,
+    end: int,
+    target_index: int,
+    momentum_amplifier: int,
+) -> None:
+    """Find the indices of a range of queries in targets.
+
+    Parameters
+    ----------
+    targets : np.int64[:]
+        A sorted list of index pointers where queries needs to be looked up.
+    queries : np.int64[:]
+        A sorted list of queries whose index pointers needs to be looked up.
+    hits : np.int64[:]
+        A buffer in which the indices of queries in targets are stored.
+    start : int
+        The first query to look up.
+    end : int
+        The last query (excluded) to look up.
+    target_index : int
+        An index in targets that is at most the hit of the first query.
+    momentum_amplifier : int
+        See alphatims.bruker.indptr_lookup.
+    """
     no_target_overflow = True
-    for i, query_index in enumerate(queries):
+    for i in range(start, end):
+        query_index = queries[i]
         while no_target_overflow:
             momentum = 1
             while targets[target_index] <= query_index:
@@ -2965,6 +7882,101 @@ def indptr_lookup(
             else:
                 target_index -= momentum
         hits[i] = target_index - 1
+
+
+@alphatims.utils.pjit(include_progress_callback=False)
+def fill_indptr_hit_chunk(
+    chunk_index: int,
+    chunk_indptr: np.ndarray,
+    chunk_target_indices: np.ndarray,
+    targets: np.ndarray,
+    queries: np.ndarray,
+    hits: np.ndarray,
+    momentum_amplifier: int,
+) -> None:
+    """Find the indices of a chunk of queries in targets.
+
+    IMPORTANT NOTE: This function is decorated with alphatims.utils.pjit.
+    The first argument is thus expected to be provided as an iterable
+    containing ints instead of a single int.
+
+    Parameters
+    ----------
+    chunk_index : int
+        The chunk to look up.
+    chunk_indptr : np.int64[:]
+        The positions in queries where each chunk starts and ends.
+    chunk_target_indices : np.int64[:]
+        The index in targets of the first query of each chunk.
+    targets, queries, hits : np.int64[:]
+        See alphatims.bruker.fill_indptr_hits.
+    momentum_amplifier : int
+        See alphatims.bruker.indptr_lookup.
+    """
+    fill_indptr_hits(
+        targets,
+        queries,
+        hits,
+        chunk_indptr[chunk_index],
+        chunk_indptr[chunk_index + 1],
+        chunk_target_indices[chunk_index],
+        momentum_amplifier,
+    )
+
+
+def parallel_indptr_lookup(
+    targets: np.ndarray,
+    queries: np.ndarray,
+    momentum_amplifier: int = 2
+) -> np.ndarray:
+    """Find the indices of queries in targets with multiple threads.
+
+    Queries are split into a chunk per thread (see
+    alphatims.utils.MAX_THREADS) and a single np.searchsorted determines
+    where each chunk starts in the targets, after which all chunks are
+    looked up in parallel as with alphatims.bruker.indptr_lookup.
+    Fewer queries than alphatims.bruker.MIN_PARALLEL_RAW_INDEX_COUNT are
+    looked up with a single thread.
+
+    Parameters
+    ----------
+    targets : np.int64[:]
+        A sorted list of index pointers where queries needs to be looked up.
+    queries : np.int64[:]
+        A sorted list of queries whose index pointers needs to be looked up.
+    momentum_amplifier : int
+        See alphatims.bruker.indptr_lookup.
+        Default is 2.
+
+    Returns
+    -------
+    : np.int64[:]
+        The indices of queries in targets.
+    """
+    if (alphatims.utils.MAX_THREADS == 1) or (
+        len(queries) < MIN_PARALLEL_RAW_INDEX_COUNT
+    ):
+        return indptr_lookup(targets, queries, momentum_amplifier)
+    chunk_count = alphatims.utils.MAX_THREADS
+    chunk_indptr = np.linspace(
+        0,
+        len(queries),
+        chunk_count + 1
+    ).astype(np.int64)
+    chunk_target_indices = np.maximum(
+        np.searchsorted(targets, queries[chunk_indptr[:-1]], "right") - 1,
+        0
+    ).astype(np.int64)
+    hits = np.empty_like(queries)
+    fill_indptr_hit_chunk(
+        range(chunk_count),
+        chunk_indptr,
+        chunk_target_indices,
+        targets,
+        queries,
+        hits,
+        momentum_amplifier,
+    )
     return hits
 
 
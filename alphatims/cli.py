@@ -256,6 +256,7 @@ def detect(**kwargs):
 @cli_option("bruker_raw_data", as_argument=True)
 @cli_option("disable_overwrite")
 @cli_option("enable_compression")
+@cli_option("compression_codec")
 @cli_option("output_folder")
 @cli_option("log_file")
 @cli_option("threads")
@@ -275,6 +276,7 @@ def export_hdf(**kwargs):
             directory=directory,
             file_name=f"{data.sample_name}.hdf",
             compress=parameters["enable_compression"],
+            codec=parameters["compression_codec"],
         )
 
 
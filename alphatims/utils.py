@@ -30,6 +30,7 @@ LATEST_GITHUB_INIT_FILE = (
     "master/alphatims/__init__.py"
 )
 PROGRESS_CALLBACK = True
+HDF_CHUNK_SIZE = 2**22
 DEMO_SAMPLE = "20201207_tims03_Evo03_PS_SA_HeLa_200ng_EvoSep_prot_DDA_21min_8cm_S1-C10_1_22476.d"
 DEMO_FILE_NAME = os.path.join(
     BASE_PATH,
@@ -665,7 +666,9 @@ def create_hdf_group_from_dict(
     overwrite: bool = False,
     compress: bool = False,
     recursed: bool = False,
-    chunked: bool = False
+    chunked: bool = False,
+    codec: str = "lzf",
+    chunk_size: int = HDF_CHUNK_SIZE,
 ) -> None:
     """Save a dict to an open hdf group.
 
@@ -679,7 +682,9 @@ def create_hdf_group_from_dict(
 
             - subdicts -> subgroups.
             - np.array -> array
-            - pd.dataframes -> subdicts with "is_pd_dataframe: True" attribute.
+            - pd.dataframes -> subdicts with "is_pd_dataframe: True" attribute
+              and a "pd_dataframe_columns" attribute with the (json encoded)
+              column order.
             - bool, int, float and str -> attrs.
             - None values are skipped and not stored explicitly.
 
@@ -689,8 +694,8 @@ def create_hdf_group_from_dict(
         If False, the existing value in HDF remains unchanged.
         Default is False.
     compress : bool
-        If True, all arrays are compressed with binary shuffle and "lzf"
-        compression.
+        If True, all arrays are compressed with binary shuffle and
+        the codec.
         If False, arrays are saved as provided.
         On average, compression halves file sizes,
         at the cost of 2-10 time longer accession times.
@@ -705,6 +710,16 @@ def create_hdf_group_from_dict(
         If True, all arrays are chunked.
         If False, arrays are saved as provided.
         Default is False.
+    codec : str
+        The compression codec, ignored if compress is False.
+        If "lzf", arrays are compressed by HDF itself with a single thread.
+        If "gzip" or "zstd", numerical arrays are compressed in parallel
+        (see alphatims.utils.create_compressed_hdf_dataset).
+        Default is "lzf".
+    chunk_size : int
+        The size of a chunk in bytes for arrays that are compressed in
+        parallel.
+        Default is alphatims.utils.HDF_CHUNK_SIZE.
 
     Raises
     ------
@@ -727,6 +742,9 @@ def create_hdf_group_from_dict(
         if isinstance(value, pd.core.frame.DataFrame):
             new_dict = {key: dict(value)}
             new_dict[key]["is_pd_dataframe"] = True
+            new_dict[key]["pd_dataframe_columns"] = json.dumps(
+                [str(column) for column in value.columns]
+            )
             create_hdf_group_from_dict(
                 hdf_group,
                 new_dict,
@@ -734,6 +752,8 @@ def create_hdf_group_from_dict(
                 recursed=True,
                 compress=compress,
                 chunked=chunked,
+                codec=codec,
+                chunk_size=chunk_size,
             )
         elif isinstance(value, (np.ndarray, pd.core.series.Series)):
             if isinstance(value, (pd.core.series.Series)):
@@ -743,7 +763,17 @@ def create_hdf_group_from_dict(
             if key not in hdf_group:
                 if value.dtype.type == np.str_:
                     value = value.astype(np.dtype('O'))
-                if value.dtype == np.dtype('O'):
+                if compress and (codec != "lzf") and (
+                    value.dtype.kind in "biuf"
+                ) and (value.size > 0):
+                    create_compressed_hdf_dataset(
+                        hdf_group,
+                        key,
+                        value,
+                        codec=codec,
+                        chunk_size=chunk_size,
+                    )
+                elif value.dtype == np.dtype('O'):
                     hdf_group.create_dataset(
                         key,
                         data=value,
@@ -770,6 +800,8 @@ def create_hdf_group_from_dict(
                 overwrite=overwrite,
                 recursed=True,
                 compress=compress,
+                codec=codec,
+                chunk_size=chunk_size,
             )
         elif value is None:
             continue
@@ -780,13 +812,182 @@ def create_hdf_group_from_dict(
             )
 
 
-def create_dict_from_hdf_group(hdf_group) -> dict:
+def check_hdf_codec(codec: str) -> None:
+    """Check that HDF files compressed with a codec can be read again.
+
+    Parameters
+    ----------
+    codec : str
+        The compression codec.
+
+    Raises
+    ------
+    ImportError
+        When the codec is "zstd" and the optional hdf5plugin package,
+        which registers the zstd filter for reading, is not installed.
+    """
+    if codec != "zstd":
+        return
+    try:
+        import hdf5plugin  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            "Reading zstd compressed HDF files requires the hdf5plugin "
+            "package, install it with pip install \"alphatims[zstd]\"."
+        )
+
+
+def create_compressed_hdf_dataset(
+    hdf_group,
+    key: str,
+    array,
+    *,
+    codec: str = "gzip",
+    chunk_size: int = HDF_CHUNK_SIZE,
+) -> None:
+    """Create a chunked HDF dataset whose chunks are compressed in parallel.
+
+    Chunks are byte-shuffled and compressed with multiple threads
+    (see alphatims.utils.set_threads) and written directly to the HDF file,
+    bypassing the single-threaded compression of HDF itself.
+
+    Parameters
+    ----------
+    hdf_group : h5py.File.group
+        An open and writable HDF group.
+    key : str
+        The name of the dataset.
+    array : np.ndarray
+        A numerical array with at least one element.
+    codec : str
+        The compression codec.
+        If "gzip", the dataset can be read by any HDF library.
+        If "zstd", reading the dataset requires the hdf5plugin package
+        (see alphatims.utils.check_hdf_codec).
+        Default is "gzip".
+    chunk_size : int
+        The (approximate) size of a chunk in bytes.
+        Chunks are always split along the first dimension.
+        Default is alphatims.utils.HDF_CHUNK_SIZE.
+
+    Raises
+    ------
+    ValueError
+        When the codec is not "gzip" or "zstd".
+    ImportError
+        When the codec is "zstd" and hdf5plugin is not installed.
+    """
+    if codec == "gzip":
+        compression = "gzip"
+        compression_opts = 4
+    elif codec == "zstd":
+        check_hdf_codec(codec)
+        # NOTE: Registered HDF filter id of zstd (as used by hdf5plugin)
+        compression = 32015
+        compression_opts = None
+    else:
+        raise ValueError(f"Codec {codec} is not supported.")
+    row_size = array[:1].nbytes
+    chunk_length = min(len(array), max(1, chunk_size // row_size))
+    chunk_shape = (chunk_length,) + array.shape[1:]
+    dataset = hdf_group.create_dataset(
+        key,
+        shape=array.shape,
+        dtype=array.dtype,
+        chunks=chunk_shape,
+        compression=compression,
+        compression_opts=compression_opts,
+        shuffle=array.dtype.itemsize > 1,
+        allow_unknown_filter=True,
+    )
+    write_compressed_hdf_chunk(
+        range(0, len(array), chunk_length),
+        dataset,
+        array,
+        chunk_shape,
+        codec,
+    )
+
+
+@threadpool(include_progress_callback=False)
+def write_compressed_hdf_chunk(
+    chunk_start: int,
+    dataset,
+    array,
+    chunk_shape: tuple,
+    codec: str,
+) -> None:
+    """Shuffle, compress and write a single chunk of an HDF dataset.
+
+    IMPORTANT NOTE: This function is decorated with alphatims.utils.threadpool.
+
+    Parameters
+    ----------
+    chunk_start : int
+        The index of the first row of this chunk.
+    dataset : h5py.Dataset
+        A chunked dataset created with
+        alphatims.utils.create_compressed_hdf_dataset.
+    array : np.ndarray
+        The full array that needs to be written.
+    chunk_shape : tuple
+        The chunk shape of the dataset.
+    codec : str
+        The compression codec, either "gzip" or "zstd".
+    """
+    import numpy as np
+    chunk = array[chunk_start: chunk_start + chunk_shape[0]]
+    if len(chunk) < chunk_shape[0]:
+        # NOTE: HDF always stores full chunks
+        padded_chunk = np.zeros(chunk_shape, dtype=array.dtype)
+        padded_chunk[:len(chunk)] = chunk
+        chunk = padded_chunk
+    chunk = np.ascontiguousarray(chunk).reshape(-1)
+    if array.dtype.itemsize > 1:
+        chunk_bytes = chunk.view(np.uint8).reshape(
+            -1,
+            array.dtype.itemsize
+        ).T.tobytes()
+    else:
+        chunk_bytes = chunk.tobytes()
+    if codec == "gzip":
+        import zlib
+        compressed_bytes = zlib.compress(chunk_bytes, 4)
+    else:
+        import pyzstd
+        compressed_bytes = pyzstd.compress(chunk_bytes)
+    dataset.id.write_direct_chunk(
+        (chunk_start,) + (0,) * (array.ndim - 1),
+        compressed_bytes
+    )
+
+
+def create_dict_from_hdf_group(
+    hdf_group,
+    mmap_arrays: list = None,
+    lazy_arrays: list = None,
+) -> dict:
     """Convert the contents of an HDF group and return as normal Python dict.
 
     Parameters
     ----------
     hdf_group : h5py.File.group
         An open and readable HDF group.
+    mmap_arrays : list, None
+        The full names (e.g. "/raw/_tof_indices") of arrays that are not
+        read in memory, but memory-mapped from the HDF file instead.
+        This is only possible for uncompressed and unchunked arrays.
+        Memory-mapped arrays are copy-on-write, i.e. modifications are
+        never written back to the HDF file.
+        If None, all arrays are read in memory.
+        Default is None.
+    lazy_arrays : list, None
+        The full names (e.g. "/raw/_tof_indices") of arrays that are not
+        read at all, but returned as h5py.Dataset instead.
+        These can be sliced to only read parts of an array,
+        as long as the HDF file remains open.
+        If None, all arrays are read in memory.
+        Default is None.
 
     Returns
     -------
@@ -797,15 +998,23 @@ def create_dict_from_hdf_group(hdf_group) -> dict:
         Subgroups are converted to subdicts.
         If a subgroup has an "is_pd_dataframe=True" attr,
         it is automatically converted to a pd.dataFrame.
+        Its columns are ordered as they were saved if the subgroup has a
+        "pd_dataframe_columns" attr, or alphabetically otherwise.
 
     Raises
     ------
     ValueError
         When an attr value in the HDF group is not an int, float, str or bool.
+    IOError
+        When an array that needs to be memory-mapped is compressed or chunked.
     """
     import h5py
     import pandas as pd
     import numpy as np
+    if mmap_arrays is None:
+        mmap_arrays = []
+    if lazy_arrays is None:
+        lazy_arrays = []
     result = {}
     for key in hdf_group.attrs:
         value = hdf_group.attrs[key]
@@ -823,21 +1032,184 @@ def create_dict_from_hdf_group(hdf_group) -> dict:
     for key in hdf_group:
         subgroup = hdf_group[key]
         if isinstance(subgroup, h5py.Dataset):
-            result[key] = subgroup[:]
+            if subgroup.name in lazy_arrays:
+                result[key] = subgroup
+            elif subgroup.name in mmap_arrays:
+                offset = subgroup.id.get_offset()
+                if offset is None:
+                    raise IOError(
+                        f"Array {subgroup.name} is compressed or chunked "
+                        "and cannot be memory-mapped."
+                    )
+                if subgroup.size == 0:
+                    result[key] = subgroup[:]
+                else:
+                    result[key] = np.memmap(
+                        subgroup.file.filename,
+                        dtype=subgroup.dtype,
+                        mode="c",
+                        offset=offset,
+                        shape=subgroup.shape,
+                    )
+            else:
+                result[key] = subgroup[:]
         else:
             if "is_pd_dataframe" in subgroup.attrs:
+                if "pd_dataframe_columns" in subgroup.attrs:
+                    columns = json.loads(
+                        subgroup.attrs["pd_dataframe_columns"]
+                    )
+                else:
+                    columns = sorted(subgroup)
                 result[key] = pd.DataFrame(
                     {
-                        column: subgroup[column][:] for column in sorted(
-                            subgroup
-                        )
+                        column: subgroup[column][:] for column in columns
                     }
                 )
             else:
-                result[key] = create_dict_from_hdf_group(hdf_group[key])
+                result[key] = create_dict_from_hdf_group(
+                    hdf_group[key],
+                    mmap_arrays,
+                    lazy_arrays,
+                )
     return result
 
 
+def empty_mmap(
+    shape,
+    dtype,
+    *,
+    directory: str = None,
+):
+    """Create an empty array that is backed by a temporary file on disk.
+
+    The array behaves as a normal np.ndarray, but the OS pages its content
+    in and out of memory as needed.
+    On POSIX systems, the temporary file is unlinked immediately and its
+    disk space is freed once the array is garbage collected.
+    On other systems, the temporary file is removed when Python exits.
+
+    Parameters
+    ----------
+    shape : int, tuple
+        The shape of the array.
+    dtype : type
+        The dtype of the array.
+    directory : str, None
+        The directory where the temporary file is created.
+        If None, the default temporary directory of the OS is used.
+        Default is None.
+
+    Returns
+    -------
+    : np.memmap
+        A writable array whose values are not initialized.
+    """
+    import tempfile
+    import atexit
+    import numpy as np
+    if np.prod(shape) == 0:
+        return np.empty(shape, dtype=dtype)
+    file_handle, file_name = tempfile.mkstemp(
+        suffix=".mmap",
+        prefix="alphatims_",
+        dir=directory,
+    )
+    os.close(file_handle)
+    array = np.memmap(file_name, dtype=dtype, mode="w+", shape=shape)
+    if os.name == "posix":
+        # NOTE: the mapping stays valid after unlinking and the OS
+        # reclaims the disk space as soon as the array is released
+        _remove_file(file_name)
+    else:
+        atexit.register(_remove_file, file_name)
+    return array
+
+
+def _remove_file(file_name: str) -> None:
+    with contextlib.suppress(OSError):
+        os.remove(file_name)
+
+
+def append_to_array(
+    array,
+    values,
+    growth_factor: float = 1.5,
+):
+    """Append values to a 1D array with amortized growth.
+
+    If the array is the most recent result of this function, the values
+    are written into the spare capacity of its buffer.
+    Otherwise, a new buffer is allocated that is growth_factor times larger
+    than needed.
+    This guarantees that the content of other arrays or views is never
+    overwritten.
+    Memory-mapped arrays are grown into a new temporary memory-mapped file
+    (see alphatims.utils.empty_mmap).
+
+    Parameters
+    ----------
+    array : np.ndarray
+        A 1D array.
+    values : np.ndarray
+        The values to append.
+    growth_factor : float
+        The relative size of a newly allocated buffer.
+        Default is 1.5.
+
+    Returns
+    -------
+    : np.ndarray
+        A view of len(array) + len(values) elements on a (possibly new)
+        buffer, starting with the original array followed by the values.
+    """
+    import numpy as np
+    size = len(array)
+    new_size = size + len(values)
+    buffer = array.base
+    if not (
+        _owns_append_buffer(buffer, size)
+        and (buffer.dtype == array.dtype)
+        and array.flags.c_contiguous
+        and (buffer.ctypes.data == array.ctypes.data)
+        and (len(buffer) >= new_size)
+    ):
+        capacity = max(new_size, int(new_size * growth_factor))
+        if isinstance(array, np.memmap):
+            buffer = empty_mmap(capacity, array.dtype)
+        else:
+            buffer = np.empty(capacity, dtype=array.dtype)
+        buffer[:size] = array
+    buffer[size: new_size] = values
+    _register_append_buffer(buffer, new_size)
+    return buffer[:new_size]
+
+
+# NOTE: maps id(buffer) to a weak reference of buffers allocated by
+# append_to_array and the number of elements that are in use
+_APPEND_BUFFERS = {}
+
+
+def _register_append_buffer(buffer, size: int) -> None:
+    import weakref
+    buffer_id = id(buffer)
+    _APPEND_BUFFERS[buffer_id] = (
+        weakref.ref(
+            buffer,
+            lambda reference: _APPEND_BUFFERS.pop(buffer_id, None)
+        ),
+        size,
+    )
+
+
+def _owns_append_buffer(buffer, size: int) -> bool:
+    entry = _APPEND_BUFFERS.get(id(buffer))
+    if entry is None:
+        return False
+    reference, used_size = entry
+    return (reference() is buffer) and (used_size == size)
+
+
 class Option_Stack(object):
     """A stack with the option to redo and undo."""
 
@@ -15,6 +15,40 @@ import alphatims.bruker
 alphatims.utils.set_progress_callback(None)
 
 
+def create_random_pushes(
+    rng: np.random.Generator,
+    push_count: int,
+    tof_max_index: int = 400000,
+) -> tuple:
+    """Create random pushes with sorted and unique tof indices per push.
+
+    Parameters
+    ----------
+    rng : np.random.Generator
+        The random generator to use.
+    push_count : int
+        The number of pushes.
+    tof_max_index : int
+        The maximum tof index (excluded).
+        Default is 400000.
+
+    Returns
+    -------
+    : tuple (np.int64[:], np.uint32[:]).
+        The push_indptr and tof_indices.
+    """
+    peak_counts = rng.poisson(20, push_count)
+    push_indptr = np.zeros(len(peak_counts) + 1, dtype=np.int64)
+    push_indptr[1:] = np.cumsum(peak_counts)
+    tof_indices = np.concatenate(
+        [
+            np.sort(rng.choice(tof_max_index, peak_count, replace=False))
+            for peak_count in peak_counts
+        ]
+    ).astype(np.uint32)
+    return push_indptr, tof_indices
+
+
 class TestSlicing(unittest.TestCase):
 
     @classmethod
@@ -298,6 +332,746 @@ class TestSlicing(unittest.TestCase):
         assert np.min(df.rt_values) < 100.
         # TEST
 
+    def test_frame_only_slicing(self):
+        for key in [
+            (slice(100, 200),),
+            (slice(100, 200, 3),),
+            ({"rt_values": slice(100., 200.)},),
+        ]:
+            parsed_keys = alphatims.bruker.parse_keys(self.data, key)
+            assert self.data._is_frame_only_query(parsed_keys)
+            expected_raw_indices = alphatims.bruker.filter_indices(
+                frame_slices=parsed_keys["frame_indices"],
+                scan_slices=parsed_keys["scan_indices"],
+                precursor_slices=parsed_keys["precursor_indices"],
+                tof_slices=parsed_keys["tof_indices"],
+                quad_slices=parsed_keys["quad_values"],
+                intensity_slices=parsed_keys["intensity_values"],
+                frame_max_index=self.data.frame_max_index,
+                scan_max_index=self.data.scan_max_index,
+                push_indptr=self.data.push_indptr,
+                precursor_indices=self.data.precursor_indices,
+                quad_mz_values=self.data.quad_mz_values,
+                quad_indptr=self.data.quad_indptr,
+                tof_indices=self.data.tof_indices,
+                intensities=self.data.intensity_values,
+            )
+            assert np.array_equal(
+                self.data[key + ("raw",)],
+                expected_raw_indices
+            )
+
+    def test_parallel_slicing(self):
+        key = (slice(None), slice(None), slice(None), slice(500., 600.), "raw")
+        thread_count = alphatims.utils.MAX_THREADS
+        try:
+            alphatims.utils.set_threads(1)
+            expected_raw_indices = self.data[key]
+            alphatims.utils.set_threads(4)
+            assert np.array_equal(self.data[key], expected_raw_indices)
+        finally:
+            alphatims.utils.set_threads(thread_count)
+
+    def test_range_slicing(self):
+        for key in [
+            (slice(100, 200),),
+            (slice(None), slice(None), 1),
+            (slice(100, 120), slice(None), slice(None), slice(500., 600.)),
+        ]:
+            raw_ranges = self.data[key + ("ranges",)]
+            raw_indices = self.data[key + ("raw",)]
+            assert np.array_equal(
+                alphatims.bruker.expand_raw_ranges(raw_ranges),
+                raw_indices
+            )
+            assert self.data.as_dataframe(raw_ranges).equals(
+                self.data.as_dataframe(raw_indices)
+            )
+            assert np.array_equal(
+                self.data.bin_intensities(raw_ranges, ("rt_values",)),
+                self.data.bin_intensities(raw_indices, ("rt_values",))
+            )
+
+    def test_extract_batch(self):
+        rng = np.random.default_rng(0)
+        query_count = 100
+        queries = np.zeros(
+            query_count,
+            dtype=[
+                (name, np.float64) for name in [
+                    "rt_low",
+                    "rt_high",
+                    "mobility_low",
+                    "mobility_high",
+                    "mz_low",
+                    "mz_high",
+                    "quad_low",
+                    "quad_high",
+                ]
+            ]
+        )
+        queries["rt_low"] = rng.uniform(100, 500, query_count)
+        queries["rt_high"] = queries["rt_low"] + 20
+        queries["mobility_low"] = rng.uniform(0.7, 1.2, query_count)
+        queries["mobility_high"] = queries["mobility_low"] + 0.05
+        queries["mz_low"] = rng.uniform(400, 1000, query_count)
+        queries["mz_high"] = queries["mz_low"] + 0.02
+        queries["quad_low"] = -1
+        queries["quad_high"] = -1
+        xics = self.data.extract_batch(queries)
+        for query, xic in zip(queries, xics):
+            df = self.data[
+                query["rt_low"]: query["rt_high"],
+                query["mobility_low"]: query["mobility_high"],
+                query["quad_low"]: query["quad_high"],
+                query["mz_low"]: query["mz_high"],
+                "df"
+            ]
+            expected_xic = np.zeros(self.data.frame_max_index)
+            np.add.at(
+                expected_xic,
+                df["frame_indices"].values,
+                df["intensity_values"].values
+            )
+            assert np.array_equal(xic, expected_xic)
+
+    def test_tof_index(self):
+        indexed_data = alphatims.bruker.TimsTOF(
+            alphatims.utils.DEMO_FILE_NAME
+        )
+        indexed_data.build_tof_index()
+        for key in [
+            (slice(None), slice(None), slice(None), slice(500., 500.01)),
+            (slice(None), slice(None), 0, slice(621.9, 622.)),
+        ]:
+            assert indexed_data.explain(key)["strategy"] == "tof_index"
+            assert np.array_equal(
+                indexed_data[key + ("raw",)],
+                self.data[key + ("raw",)]
+            )
+        del indexed_data
+
+    def test_intensity_pyramids(self):
+        pyramid_data = alphatims.bruker.TimsTOF(
+            alphatims.utils.DEMO_FILE_NAME
+        )
+        raw_ranges = self.data[100:200, "ranges"]
+        expected = {
+            axis: self.data.bin_intensities(raw_ranges, axis, 2**12)
+            for axis in [
+                ("rt_values",),
+                ("mobility_values", "rt_values"),
+                ("rt_values", "mz_values"),
+            ]
+        }
+        pyramid_data.build_intensity_pyramids()
+        for axis, binned_intensities in expected.items():
+            assert pyramid_data._bin_intensities_from_pyramids(
+                raw_ranges,
+                axis,
+                2**12
+            ) is not None
+            assert np.allclose(
+                pyramid_data.bin_intensities(raw_ranges, axis, 2**12),
+                binned_intensities
+            )
+        del pyramid_data
+
+    def test_lazy_dataframe(self):
+        raw_ranges = self.data[100:110, :, 0, "ranges"]
+        expected = self.data.as_dataframe(raw_ranges)
+        lazy_dataframe = self.data.as_dataframe(raw_ranges, lazy=True)
+        assert lazy_dataframe.shape == expected.shape
+        assert np.array_equal(
+            lazy_dataframe["rt_values"],
+            expected["rt_values"]
+        )
+        assert "mz_values" not in lazy_dataframe._cache
+        assert expected[["mz_values", "intensity_values"]].equals(
+            self.data.as_dataframe(
+                raw_ranges,
+                columns=["mz_values", "intensity_values"],
+            )
+        )
+
+    def test_result_cache(self):
+        self.data.set_max_cached_result_bytes(2**24)
+        try:
+            first_result = self.data[100:110, :, 0, "raw"]
+            second_result = self.data[100:110, :, 0, "raw"]
+            assert first_result is second_result
+            assert not second_result.flags.writeable
+            assert np.array_equal(
+                alphatims.bruker.expand_raw_ranges(
+                    self.data[100:110, :, 0, "ranges"]
+                ),
+                first_result
+            )
+            statistics = self.data.result_cache_statistics
+            assert statistics["hits"] >= 1
+            assert statistics["cached_bytes"] <= 2**24
+            with self.assertRaises(ValueError):
+                self.data.set_max_cached_result_bytes(-1)
+        finally:
+            self.data.set_max_cached_result_bytes(0)
+
+    def test_explain(self):
+        key = (
+            slice(100, 200),
+            slice(None),
+            slice(600., 610.),
+            slice(400., 500.)
+        )
+        plan = self.data.explain(key)
+        assert plan["strategy"] in plan["costs"]
+        assert 0 < plan["quad_fraction"] < 1
+        push_plan = self.data.explain((slice(100, 200), slice(None), 0))
+        assert push_plan["strategy"] == "push_ranges"
+        assert 0 < push_plan["quad_fraction"] < 1
+        parsed_keys = alphatims.bruker.parse_keys(self.data, key)
+        assert np.array_equal(
+            self.data[key + ("raw",)],
+            alphatims.bruker.filter_indices(
+                frame_slices=parsed_keys["frame_indices"],
+                scan_slices=parsed_keys["scan_indices"],
+                precursor_slices=parsed_keys["precursor_indices"],
+                tof_slices=parsed_keys["tof_indices"],
+                quad_slices=parsed_keys["quad_values"],
+                intensity_slices=parsed_keys["intensity_values"],
+                frame_max_index=self.data.frame_max_index,
+                scan_max_index=self.data.scan_max_index,
+                push_indptr=self.data.push_indptr,
+                precursor_indices=self.data.precursor_indices,
+                quad_mz_values=self.data.quad_mz_values,
+                quad_indptr=self.data.quad_indptr,
+                tof_indices=self.data.tof_indices,
+                intensities=self.data.intensity_values,
+            )
+        )
+
+    def test_mmap_detector_events(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as temp_dir_name:
+            hdf_file_name = self.data.save_as_hdf(
+                directory=temp_dir_name,
+                file_name="mmap_test.hdf",
+                overwrite=True,
+            )
+            mmap_data = alphatims.bruker.TimsTOF(
+                hdf_file_name,
+                mmap_detector_events=True,
+            )
+            assert isinstance(mmap_data.tof_indices, np.memmap)
+            assert np.array_equal(
+                mmap_data.tof_indices,
+                self.data.tof_indices
+            )
+            assert np.array_equal(
+                mmap_data[1, :700, 0, "raw"],
+                self.data[1, :700, 0, "raw"]
+            )
+            del mmap_data
+
+    def test_lazy_slicing(self):
+        lazy_data = alphatims.bruker.LazyTimsTOF(
+            alphatims.utils.DEMO_FILE_NAME,
+            max_cached_frames=10,
+        )
+        assert len(lazy_data) == len(self.data)
+        for key in [
+            (1, slice(None, 700), 0),
+            (slice(100, 120), slice(None), slice(None), slice(500., 600.)),
+            (slice(200, 300, 7),),
+            ([1, 500],),
+            (
+                np.array([[200, 250, 3], [210, 230, 1]]),
+                slice(None),
+                slice(None),
+                slice(500., 600.),
+            ),
+        ]:
+            assert lazy_data.explain(key) == self.data.explain(key)
+            raw_indices = lazy_data[key + ("raw",)]
+            assert np.array_equal(raw_indices, self.data[key + ("raw",)])
+            assert lazy_data.as_dataframe(raw_indices).equals(
+                self.data.as_dataframe(raw_indices)
+            )
+        assert lazy_data.cached_frame_count <= 10
+
+    def test_cache(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as cache_directory:
+            alphatims.bruker.set_cache(cache_directory)
+            try:
+                alphatims.bruker.TimsTOF(alphatims.utils.DEMO_FILE_NAME)
+                assert len(os.listdir(cache_directory)) == 1
+                cached_data = alphatims.bruker.TimsTOF(
+                    alphatims.utils.DEMO_FILE_NAME
+                )
+                assert isinstance(cached_data.tof_indices, np.memmap)
+                assert np.array_equal(
+                    cached_data.tof_indices,
+                    self.data.tof_indices
+                )
+                key = (slice(100, 200), slice(None), slice(None), 500.)
+                assert np.array_equal(
+                    cached_data[key + ("raw",)],
+                    self.data[key + ("raw",)]
+                )
+                assert cached_data.frames.equals(self.data.frames)
+                assert cached_data.fragment_frames.equals(
+                    self.data.fragment_frames
+                )
+                if self.data.precursors is None:
+                    assert cached_data.precursors is None
+                else:
+                    assert cached_data.precursors.equals(
+                        self.data.precursors
+                    )
+                del cached_data
+            finally:
+                alphatims.bruker.set_cache(None)
+
+    def test_lazy_hdf_slicing(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as temp_dir_name:
+            hdf_file_name = self.data.save_as_hdf(
+                temp_dir_name,
+                "demo.hdf",
+            )
+            lazy_data = alphatims.bruker.LazyTimsTOF(hdf_file_name)
+            assert np.array_equal(lazy_data.push_indptr, self.data.push_indptr)
+            for key in [
+                (slice(100, 120), slice(None), slice(None), slice(500., 600.)),
+                (slice(200, 300, 7),),
+            ]:
+                raw_indices = lazy_data[key + ("raw",)]
+                assert np.array_equal(raw_indices, self.data[key + ("raw",)])
+                assert lazy_data.as_dataframe(raw_indices).equals(
+                    self.data.as_dataframe(raw_indices)
+                )
+            del lazy_data
+
+    def test_arrow_export(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as temp_dir_name:
+            for file_name in [
+                self.data.save_as_parquet(temp_dir_name, "demo.parquet"),
+                self.data.save_as_arrow(temp_dir_name, "demo.arrow"),
+            ]:
+                arrow_data = alphatims.bruker.TimsTOF(file_name)
+                assert np.array_equal(
+                    arrow_data.push_indptr,
+                    self.data.push_indptr
+                )
+                assert np.array_equal(
+                    arrow_data.quad_indptr,
+                    self.data.quad_indptr
+                )
+                key = (slice(100, 200), slice(None), slice(None), 500.)
+                assert np.array_equal(
+                    arrow_data[key + ("raw",)],
+                    self.data[key + ("raw",)]
+                )
+                del arrow_data
+            compact_data = alphatims.bruker.TimsTOF(
+                alphatims.utils.DEMO_FILE_NAME,
+                compact_tof_indices=True,
+            )
+            arrow_data = alphatims.bruker.TimsTOF(
+                compact_data.save_as_arrow(temp_dir_name, "compact.arrow")
+            )
+            assert not arrow_data.is_compact
+            assert np.array_equal(
+                arrow_data.tof_indices,
+                self.data.tof_indices
+            )
+            del arrow_data
+            del compact_data
+
+    def test_compact_tof_indices(self):
+        compact_data = alphatims.bruker.TimsTOF(
+            alphatims.utils.DEMO_FILE_NAME,
+            compact_tof_indices=True,
+        )
+        assert compact_data.is_compact
+        assert np.array_equal(
+            compact_data.tof_indices,
+            self.data.tof_indices
+        )
+        for key in [
+            (slice(100, 120), slice(None), slice(None), slice(500., 600.)),
+            (slice(200, 300, 7),),
+        ]:
+            raw_indices = compact_data[key + ("raw",)]
+            assert np.array_equal(raw_indices, self.data[key + ("raw",)])
+            assert compact_data.as_dataframe(raw_indices).equals(
+                self.data.as_dataframe(raw_indices)
+            )
+
+    def test_iter_frames(self):
+        scan_max_index = self.data.scan_max_index
+        frame_count = 0
+        for frame_ids, scan_indptr, tof_indices, intensities in (
+            alphatims.bruker.iter_frames(
+                alphatims.utils.DEMO_FILE_NAME,
+                slice(100, 200),
+                batch_size=16,
+            )
+        ):
+            assert len(frame_ids) <= 16
+            for i, frame_id in enumerate(frame_ids):
+                frame_start = frame_id * scan_max_index
+                push_indptr = self.data.push_indptr[
+                    frame_start: frame_start + scan_max_index + 1
+                ]
+                batch_indptr = scan_indptr[
+                    i * scan_max_index: (i + 1) * scan_max_index + 1
+                ]
+                assert np.array_equal(
+                    np.diff(push_indptr),
+                    np.diff(batch_indptr)
+                )
+                assert np.array_equal(
+                    self.data.tof_indices[push_indptr[0]: push_indptr[-1]],
+                    tof_indices[batch_indptr[0]: batch_indptr[-1]]
+                )
+                frame_count += 1
+        assert frame_count == 100
+
+
+class TestBrukerBinary(unittest.TestCase):
+
+    def test_lzf_decompress(self):
+        compressed_bytes = np.array(
+            [2, ord("a"), ord("b"), ord("c"), 4 << 5, 2],
+            dtype=np.uint8
+        )
+        decompressed_bytes = np.zeros(16, dtype=np.uint8)
+        size = alphatims.bruker.lzf_decompress(
+            compressed_bytes,
+            decompressed_bytes
+        )
+        assert decompressed_bytes[:size].tobytes() == b"abcabcabc"
+        with self.assertRaises(ValueError):
+            alphatims.bruker.lzf_decompress(
+                compressed_bytes,
+                np.zeros(4, dtype=np.uint8)
+            )
+
+    def test_parse_decompressed_bruker_binary_type2(self):
+
+        @alphatims.utils.njit(nogil=True)
+        def reference_parse(decompressed_bytes):
+            temp = np.frombuffer(decompressed_bytes, dtype=np.uint8)
+            buffer = np.frombuffer(
+                temp.reshape(4, -1).T.flatten(),
+                dtype=np.uint32
+            )
+            scan_count = buffer[0]
+            scan_indices = buffer[:scan_count].copy() // 2
+            scan_indices[0] = 0
+            tof_indices = buffer[scan_count::2].copy()
+            index = 0
+            for size in scan_indices:
+                current_sum = 0
+                for i in range(size):
+                    current_sum += tof_indices[index]
+                    tof_indices[index] = current_sum
+                    index += 1
+            intensities = buffer[scan_count + 1::2]
+            last_scan = len(intensities) - np.sum(scan_indices[1:])
+            scan_indices[:-1] = scan_indices[1:]
+            scan_indices[-1] = last_scan
+            return scan_indices, tof_indices, intensities
+
+        rng = np.random.default_rng(0)
+        scan_count = 1000
+        peak_counts = rng.integers(0, 50, scan_count)
+        peak_count = np.sum(peak_counts)
+        values = np.empty(scan_count + 2 * peak_count, dtype=np.uint32)
+        values[0] = scan_count
+        values[1:scan_count] = 2 * peak_counts[:-1]
+        values[scan_count::2] = rng.integers(1, 100, peak_count)
+        values[scan_count + 1::2] = rng.integers(1, 2**16, peak_count)
+        decompressed_bytes = values.view(np.uint8).reshape(-1, 4).T.tobytes()
+        scan_indices = np.empty(scan_count, dtype=np.int64)
+        tof_indices = np.empty(peak_count, dtype=np.uint32)
+        intensities = np.empty(peak_count, dtype=np.uint16)
+        alphatims.bruker.parse_decompressed_bruker_binary_type2(
+            decompressed_bytes,
+            scan_indices,
+            tof_indices,
+            intensities,
+        )
+        expected_scans, expected_tofs, expected_intensities = reference_parse(
+            decompressed_bytes
+        )
+        assert np.array_equal(scan_indices, expected_scans)
+        assert np.array_equal(tof_indices, expected_tofs)
+        assert np.array_equal(intensities, expected_intensities)
+        assert np.array_equal(scan_indices, peak_counts)
+
+    def test_tof_deltas(self):
+        rng = np.random.default_rng(0)
+        frame_max_index = 100
+        scan_max_index = 500
+        push_indptr, tof_indices = create_random_pushes(
+            rng,
+            frame_max_index * scan_max_index
+        )
+        intensities = rng.integers(1, 1000, len(tof_indices)).astype(
+            np.uint16
+        )
+        (
+            push_tof_offsets,
+            tof_deltas,
+            tof_delta_overflow_indices,
+            tof_delta_overflow_values,
+        ) = alphatims.bruker.encode_tof_deltas(push_indptr, tof_indices)
+        assert len(tof_delta_overflow_indices) > 0
+        assert np.array_equal(
+            alphatims.bruker.decode_tof_deltas(
+                push_indptr,
+                push_tof_offsets,
+                tof_deltas,
+                tof_delta_overflow_indices,
+                tof_delta_overflow_values,
+            ),
+            tof_indices
+        )
+        raw_indices = rng.choice(len(tof_indices), 1000)
+        assert np.array_equal(
+            alphatims.bruker.decode_tof_deltas_at(
+                raw_indices,
+                push_indptr,
+                push_tof_offsets,
+                tof_deltas,
+                tof_delta_overflow_indices,
+                tof_delta_overflow_values,
+            ),
+            tof_indices[raw_indices]
+        )
+        kwargs = {
+            "frame_slices": np.array([[0, frame_max_index, 1]]),
+            "scan_slices": np.array([[0, scan_max_index, 1]]),
+            "precursor_slices": np.array([[0, 1, 1]]),
+            "tof_slices": np.array([[100000, 101000, 1]]),
+            "quad_slices": np.array([[-1., -1.]]),
+            "intensity_slices": np.array([[0., np.inf]]),
+            "frame_max_index": frame_max_index,
+            "scan_max_index": scan_max_index,
+            "push_indptr": push_indptr,
+            "precursor_indices": np.array([0]),
+            "quad_mz_values": np.array([[-1., -1.]]),
+            "quad_indptr": np.array([0, push_indptr[-1]]),
+            "intensities": intensities,
+        }
+        results = [
+            alphatims.bruker.filter_indices(**kwargs, **tof_arrays)
+            for tof_arrays in [
+                {"tof_indices": tof_indices},
+                {
+                    "tof_indices": np.empty(0, dtype=np.uint32),
+                    "push_tof_offsets": push_tof_offsets,
+                    "tof_deltas": tof_deltas,
+                    "tof_delta_overflow_indices": tof_delta_overflow_indices,
+                    "tof_delta_overflow_values": tof_delta_overflow_values,
+                },
+            ]
+        ]
+        assert np.array_equal(results[0], results[1])
+
+
+class TestFilterIndices(unittest.TestCase):
+
+    def test_gallop_search(self):
+        array = np.array([1, 3, 3, 5, 8, 13, 21, 34, 55], dtype=np.uint32)
+        for value in range(60):
+            for start in range(len(array)):
+                assert alphatims.bruker.gallop_search(
+                    array,
+                    value,
+                    start,
+                    len(array)
+                ) == start + np.searchsorted(array[start:], value)
+
+    def test_many_tof_slices(self):
+        rng = np.random.default_rng(0)
+        frame_max_index = 100
+        scan_max_index = 500
+        push_indptr, tof_indices = create_random_pushes(
+            rng,
+            frame_max_index * scan_max_index
+        )
+        for slice_count in [1, 100, 10000]:
+            tof_starts = np.sort(
+                rng.choice(np.arange(0, 400000, 40), slice_count, False)
+            )
+            tof_slices = np.stack(
+                [
+                    tof_starts,
+                    tof_starts + 20,
+                    np.full(slice_count, 2),
+                ],
+                axis=1
+            )
+            raw_indices = alphatims.bruker.filter_indices(
+                frame_slices=np.array([[0, frame_max_index, 1]]),
+                scan_slices=np.array([[0, scan_max_index, 1]]),
+                precursor_slices=np.array([[0, 1, 1]]),
+                tof_slices=tof_slices,
+                quad_slices=np.array([[-1., -1.]]),
+                intensity_slices=np.array([[0., np.inf]]),
+                frame_max_index=frame_max_index,
+                scan_max_index=scan_max_index,
+                push_indptr=push_indptr,
+                precursor_indices=np.array([0]),
+                quad_mz_values=np.array([[-1., -1.]]),
+                quad_indptr=np.array([0, push_indptr[-1]]),
+                tof_indices=tof_indices,
+                intensities=np.ones(len(tof_indices), dtype=np.uint16),
+            )
+            tof_mask = np.zeros(400000, dtype=np.bool_)
+            for tof_start, tof_stop, tof_step in tof_slices:
+                tof_mask[tof_start: tof_stop: tof_step] = True
+            assert np.array_equal(
+                raw_indices,
+                np.flatnonzero(tof_mask[tof_indices])
+            )
+
+
+class TestConvertIndices(unittest.TestCase):
+
+    def test_convert_raw_index_range(self):
+        rng = np.random.default_rng(0)
+        scan_max_index = 500
+        push_indptr, tof_indices = create_random_pushes(
+            rng,
+            100 * scan_max_index,
+            tof_max_index=1000,
+        )
+        intensities = rng.integers(1, 1000, len(tof_indices)).astype(
+            np.uint16
+        )
+        quad_indptr = np.linspace(0, push_indptr[-1], 11).astype(np.int64)
+        precursor_indices = np.arange(10)
+        rt_values = np.arange(100, dtype=np.float64)
+        mobility_values = np.arange(scan_max_index, dtype=np.float64)
+        mz_values = np.arange(1000, dtype=np.float64)
+        quad_mz_values = rng.random((10, 2))
+        raw_indices = np.sort(
+            rng.choice(len(tof_indices), len(tof_indices) // 2, replace=False)
+        )
+        push_indices = np.searchsorted(push_indptr, raw_indices, "right") - 1
+        quad_indices = np.searchsorted(quad_indptr, raw_indices, "right") - 1
+        expected = [
+            push_indices,
+            push_indices // scan_max_index,
+            push_indices % scan_max_index,
+            quad_indices,
+            precursor_indices[quad_indices],
+            tof_indices[raw_indices],
+            rt_values[push_indices // scan_max_index],
+            rt_values[push_indices // scan_max_index] / 60,
+            mobility_values[push_indices % scan_max_index],
+            quad_mz_values[quad_indices, 0],
+            quad_mz_values[quad_indices, 1],
+            mz_values[tof_indices[raw_indices]],
+            intensities[raw_indices],
+        ]
+        for column_count in range(len(expected) + 1):
+            buffers = [
+                np.empty(
+                    len(raw_indices) if i < column_count else 0,
+                    dtype=column.dtype,
+                ) for i, column in enumerate(expected)
+            ]
+            alphatims.bruker.convert_raw_index_range(
+                0,
+                len(raw_indices),
+                raw_indices,
+                True,
+                scan_max_index,
+                push_indptr,
+                quad_indptr,
+                tof_indices,
+                None,
+                None,
+                None,
+                None,
+                intensities,
+                precursor_indices,
+                rt_values,
+                mobility_values,
+                mz_values,
+                quad_mz_values,
+                *buffers,
+            )
+            for buffer, column in zip(buffers[:column_count], expected):
+                assert np.array_equal(buffer, column)
+
+    def test_parallel_indptr_lookup(self):
+        rng = np.random.default_rng(0)
+        targets = np.zeros(10001, dtype=np.int64)
+        targets[1:] = np.cumsum(rng.poisson(0.5, 10000))
+        min_parallel_raw_index_count = (
+            alphatims.bruker.MIN_PARALLEL_RAW_INDEX_COUNT
+        )
+        thread_count = alphatims.utils.MAX_THREADS
+        alphatims.bruker.MIN_PARALLEL_RAW_INDEX_COUNT = 1
+        alphatims.utils.set_threads(4)
+        try:
+            for query_count in [0, 1, 7, 1000]:
+                queries = np.sort(
+                    rng.integers(0, targets[-1], query_count)
+                )
+                assert np.array_equal(
+                    alphatims.bruker.parallel_indptr_lookup(
+                        targets,
+                        queries
+                    ),
+                    np.searchsorted(targets, queries, "right") - 1
+                )
+        finally:
+            alphatims.bruker.MIN_PARALLEL_RAW_INDEX_COUNT = (
+                min_parallel_raw_index_count
+            )
+            alphatims.utils.set_threads(thread_count)
+
+
+class TestBrukerSql(unittest.TestCase):
+
+    def test_read_sql_table(self):
+        import sqlite3
+        with sqlite3.connect(":memory:") as sql_database_connection:
+            sql_database_connection.execute(
+                "CREATE TABLE Test (Id INTEGER, Mz REAL, Charge INTEGER, "
+                "Polarity TEXT, Precursor INTEGER)"
+            )
+            sql_database_connection.executemany(
+                "INSERT INTO Test VALUES (?, ?, ?, ?, ?)",
+                [(1, 100.5, 2, "+", None), (2, None, None, "-", None)]
+            )
+            table = alphatims.bruker.read_sql_table(
+                sql_database_connection,
+                "Test"
+            )
+        assert table["Id"].dtype == np.int64
+        assert np.array_equal(table["Mz"], [100.5, np.nan], equal_nan=True)
+        assert np.array_equal(table["Charge"], [2, np.nan], equal_nan=True)
+        assert list(table["Polarity"]) == ["+", "-"]
+        assert table["Precursor"][0] is None
+
+    def test_merge_sql_tables(self):
+        table = alphatims.bruker.merge_sql_tables(
+            {"Frame": np.array([1, 2, 3]), "Group": np.array([2, 1, 2])},
+            {"Group": np.array([1, 2, 2]), "Mz": np.array([10., 20., 30.])},
+            "Group",
+        )
+        assert np.array_equal(table["Frame"], [1, 1, 2, 3, 3])
+        assert np.array_equal(table["Mz"], [20., 30., 10., 20., 30.])
+
 
 if __name__ == "__main__":
     unittest.main()
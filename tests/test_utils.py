@@ -4,6 +4,9 @@
 # builtin
 import unittest
 
+# external
+import numpy as np
+
 # local
 import alphatims.utils
 alphatims.utils.set_progress_callback(None)
@@ -108,5 +111,69 @@ class TestStacks(unittest.TestCase):
         )
 
 
+class TestArrays(unittest.TestCase):
+
+    def test_append_to_array(self):
+        array = np.arange(4)
+        array = alphatims.utils.append_to_array(array, np.arange(4, 6))
+        assert np.array_equal(array, np.arange(6))
+        buffer = array.base
+        assert len(buffer) > len(array)
+        array = alphatims.utils.append_to_array(array, [6])
+        assert array.base is buffer
+        assert np.array_equal(array, np.arange(7))
+        array = alphatims.utils.append_to_array(array, np.arange(7, 100))
+        assert array.base is not buffer
+        assert np.array_equal(array, np.arange(100))
+        original = np.arange(10)
+        alphatims.utils.append_to_array(original[:5], [99])
+        assert np.array_equal(original, np.arange(10))
+        first = alphatims.utils.append_to_array(array, [100])
+        second = alphatims.utils.append_to_array(array, [-1])
+        assert first[-1] == 100
+        assert second[-1] == -1
+
+
+class TestHdf(unittest.TestCase):
+
+    def test_create_compressed_hdf_dataset(self):
+        import h5py
+        import io
+        arrays = {
+            "tof_indices": np.arange(1000, dtype=np.uint32) % 77,
+            "quad_mz_values": np.arange(300, dtype=np.float64).reshape(-1, 2),
+            "flags": np.arange(5) % 2 == 0,
+        }
+        with h5py.File(io.BytesIO(), "w") as hdf_root:
+            for key, array in arrays.items():
+                alphatims.utils.create_compressed_hdf_dataset(
+                    hdf_root,
+                    key,
+                    array,
+                    codec="gzip",
+                    chunk_size=256,
+                )
+            for key, array in arrays.items():
+                assert np.array_equal(hdf_root[key][:], array)
+            assert hdf_root["tof_indices"].chunks == (64,)
+            with self.assertRaises(ValueError):
+                alphatims.utils.create_compressed_hdf_dataset(
+                    hdf_root,
+                    "invalid",
+                    arrays["tof_indices"],
+                    codec="invalid",
+                )
+
+    def test_check_hdf_codec(self):
+        alphatims.utils.check_hdf_codec("gzip")
+        try:
+            import hdf5plugin  # noqa: F401
+        except ImportError:
+            with self.assertRaises(ImportError):
+                alphatims.utils.check_hdf_codec("zstd")
+        else:
+            alphatims.utils.check_hdf_codec("zstd")
+
+
 if __name__ == "__main__":
     unittest.main()